@@ -1,24 +1,17 @@
-import streamlit as st
+import html
+import json
 import os
+import streamlit as st
 import plotly.graph_objects as go
-import plotly.express as px
-from utils import (
-    enhanced_pdf_extraction, 
-    advanced_text_cleaning,
-    extract_skills_by_category, 
-    calculate_match_score,
-    semantic_skill_matching,
-    calculate_weighted_score,
-    generate_optimization_suggestions,
-    check_ats_compatibility,
-    extract_experience_info,
-    generate_visualization_data,
-    ai_rewrite_bullet_points,
-    generate_interview_questions,
-    identify_weak_bullets,
-    extract_experience_entries
-)
-from skills_data import skills_data
+from pipeline import CORE_STAGES, StageExecutor, build_analysis_pipeline
+from utils import chunk_vectors, embed_passages, semantic_match_curve
+from taxonomy import DEFAULT_TAXONOMY, get_taxonomy, normalize_term, taxonomy_registry
+from snapshots import analysis_id, load_snapshot, save_snapshot, snapshot_path
+from skill_index import skill_index
+from vector_store import vector_store
+from dedup import context_key, duplicate_index, minhash_signature
+from cohort import cohort_aggregator, cohort_event
+from keywords import idf_table
 
 # Set page configuration
 st.set_page_config(
@@ -238,6 +231,23 @@ st.markdown("""
         color: #666;
         margin-top: 0.5rem;
     }
+    
+    .resume-preview {
+        background: #fafafa;
+        padding: 1rem;
+        border-radius: 10px;
+        font-size: 0.9rem;
+        white-space: pre-wrap;
+        max-height: 500px;
+        overflow-y: auto;
+    }
+    
+    .skill-highlight {
+        background: #e8f5e8;
+        color: #2e7d32;
+        border-radius: 4px;
+        padding: 0 0.15rem;
+    }
 </style>
 """, unsafe_allow_html=True)
 
@@ -314,7 +324,7 @@ def display_overview_tab(basic_score, weighted_score, experience_info, ats_resul
         """, unsafe_allow_html=True)
     
     with col3:
-        positions = len(experience_info.get('positions', []))
+        positions = len(experience_info.get('experience_entries', []))
         st.markdown(f"""
         <div class="metric-card">
             <div class="metric-value">{positions}</div>
@@ -347,8 +357,16 @@ def display_overview_tab(basic_score, weighted_score, experience_info, ats_resul
             for rec in ats_results['recommendations']:
                 st.markdown(f"• {rec}")
 
-def display_skills_tab(viz_data, semantic_matches, details, enable_visualizations, enable_semantic):
+def display_skills_tab(viz_data, semantic_matches, details, enable_visualizations, enable_semantic, resume_matches=None,
+                       skill_similarity=None, semantic_threshold=0.7, resume_text=None, skill_highlights=None,
+                       keyword_coverage=None):
     """Display Skills Analysis tab"""
+    # Alias that fired for each matched resume skill, e.g. "git" for Version Control
+    matched_aliases = {}
+    for category, matches in (resume_matches or {}).items():
+        for match in matches:
+            if match['alias'] != normalize_term(match['skill']):
+                matched_aliases[(category, match['skill'])] = match['alias']
     
     # Interactive Visualizations
     if enable_visualizations and viz_data:
@@ -375,6 +393,11 @@ def display_skills_tab(viz_data, semantic_matches, details, enable_visualization
         st.markdown("---")
     
     # AI Semantic Matches
+    if enable_semantic and skill_similarity is not None and len(skill_similarity['jd_entries']):
+        st.markdown("### 🎚️ Matches vs. Similarity Threshold")
+        thresholds, counts = semantic_match_curve(skill_similarity)
+        st.plotly_chart(create_threshold_curve(thresholds, counts, semantic_threshold), use_container_width=True)
+    
     if enable_semantic and semantic_matches:
         st.markdown("## 🧠 AI Semantic Skill Matches")
         st.markdown("*Skills matched using AI understanding (not just exact words)*")
@@ -414,7 +437,9 @@ def display_skills_tab(viz_data, semantic_matches, details, enable_visualization
                     st.markdown("**Matched:**")
                     if data['matched']:
                         for skill in data['matched']:
-                            st.markdown(f'<span class="skill-tag matched">{skill}</span>', unsafe_allow_html=True)
+                            alias = matched_aliases.get((category, skill))
+                            label = f'{skill} <small>(via "{alias}")</small>' if alias else skill
+                            st.markdown(f'<span class="skill-tag matched">{label}</span>', unsafe_allow_html=True)
                     else:
                         st.warning("None")
                 
@@ -430,6 +455,50 @@ def display_skills_tab(viz_data, semantic_matches, details, enable_visualization
                 match_percent = data.get('match_percentage', 0)
                 st.progress(match_percent / 100)
                 st.markdown(f"**Category Score: {match_percent}%**")
+    
+    # Distinctive job description terms that are not catalog skills
+    if keyword_coverage:
+        st.markdown("## 🔑 Other Job Description Keywords")
+        st.markdown("*Distinctive terms from the job description that the skill catalog does not cover*")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("**Found in Resume:**")
+            found = [keyword['term'] for keyword in keyword_coverage if keyword['found']]
+            for term in found:
+                st.markdown(f'<span class="skill-tag matched">{html.escape(term)}</span>', unsafe_allow_html=True)
+            if not found:
+                st.warning("None")
+        with col2:
+            st.markdown("**Missing:**")
+            missing = [keyword['term'] for keyword in keyword_coverage if not keyword['found']]
+            for term in missing:
+                st.markdown(f'<span class="skill-tag missing">{html.escape(term)}</span>', unsafe_allow_html=True)
+            if not missing:
+                st.success("None")
+    
+    # Skills highlighted in the original resume text
+    if resume_text and skill_highlights:
+        st.markdown("## 📍 Where Your Skills Appear")
+        with st.expander("Show resume with detected skills highlighted"):
+            st.markdown(
+                f'<div class="resume-preview">{highlight_resume_text(resume_text, skill_highlights)}</div>',
+                unsafe_allow_html=True
+            )
+
+def highlight_resume_text(resume_text, skill_highlights):
+    """Return HTML of the resume text with skill spans wrapped in highlight marks"""
+    parts = []
+    pos = 0
+    for start, end, skill, alias in skill_highlights:
+        if start < pos:
+            continue  # Overlaps a span that is already highlighted
+        parts.append(html.escape(resume_text[pos:start]))
+        parts.append(
+            f'<mark class="skill-highlight" title="{html.escape(skill)}">{html.escape(resume_text[start:end])}</mark>'
+        )
+        pos = end
+    parts.append(html.escape(resume_text[pos:]))
+    return "".join(parts)
 
 def display_optimizer_tab(rewritten_bullets, suggestions, enable_rewriter, enable_suggestions):
     """Display Resume Optimizer tab"""
@@ -437,10 +506,13 @@ def display_optimizer_tab(rewritten_bullets, suggestions, enable_rewriter, enabl
     # AI Resume Rewriter
     if enable_rewriter and rewritten_bullets:
         st.markdown("## ✨ AI Resume Rewriter")
-        st.markdown("*AI-enhanced bullet points with stronger impact*")
+        st.markdown("*Your weakest bullet points, rewritten with stronger impact*")
         
         for idx, bullet in enumerate(rewritten_bullets):
-            with st.expander(f"📝 Bullet Point {idx + 1} - Impact Score: {bullet['impact_score']}/10", expanded=(idx < 2)):
+            score = f"{bullet['impact_score']}/10"
+            if 'original_score' in bullet:
+                score = f"{bullet['original_score']} → {score}"
+            with st.expander(f"📝 Bullet Point {idx + 1} - Impact Score: {score}", expanded=(idx < 2)):
                 st.markdown('<div class="rewrite-box">', unsafe_allow_html=True)
                 
                 # Original
@@ -574,7 +646,7 @@ def display_interview_question(question_data, idx, q_type):
             for tip in question_data['tips']:
                 st.markdown(f"• {tip}")
 
-def display_detailed_report_tab(details, resume_skills, jd_skills, basic_score, weighted_score):
+def display_detailed_report_tab(details, resume_skills, jd_skills, basic_score, weighted_score, skill_evidence=None):
     """Display Detailed Report tab"""
     st.markdown("## 📈 Comprehensive Analysis Report")
     
@@ -618,6 +690,27 @@ def display_detailed_report_tab(details, resume_skills, jd_skills, basic_score,
     
     st.markdown("---")
     
+    # Resume sentences backing up each required skill
+    if skill_evidence is not None:
+        st.markdown("### 🧾 Skill Evidence")
+        st.markdown("*The resume sentence that best supports each required skill*")
+        evidence_data = []
+        for category, data in details.items():
+            matched = set(data['matched'])
+            for skill in data['required']:
+                proof = skill_evidence.get(category, {}).get(skill)
+                evidence_data.append({
+                    'Category': category.upper(),
+                    'Skill': skill,
+                    'Status': "✅ Matched" if skill in matched else "❌ Missing",
+                    'Proof': proof[0]['text'] if proof else "—",
+                    'Similarity': proof[0]['similarity'] if proof else None
+                })
+        if evidence_data:
+            st.dataframe(pd.DataFrame(evidence_data), use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+    
     # Detailed Category Analysis
     st.markdown("### 🔍 Detailed Category Analysis")
     
@@ -638,6 +731,13 @@ def display_detailed_report_tab(details, resume_skills, jd_skills, basic_score,
                     st.markdown("**❌ Missing Skills:**")
                     st.write(", ".join(data['missing']))
 
+# Figures are cached by the hash of their input data, so reruns that do not
+# change a chart's data reuse the built figure
+FIGURE_CACHE_ENTRIES = 64
+PRIORITY_COLORS = {'High': '#f44336', 'Medium': '#ff9800', 'Low': '#4caf50'}
+BUBBLE_SIZE_MAX = 20
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
 def create_radar_chart(radar_data):
     """Create radar chart for skill comparison"""
     categories = list(radar_data.keys())
@@ -677,6 +777,7 @@ def create_radar_chart(radar_data):
     
     return fig
 
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
 def create_category_bar_chart(category_scores):
     """Create bar chart for category scores"""
     categories = list(category_scores.keys())
@@ -705,25 +806,387 @@ def create_category_bar_chart(category_scores):
     
     return fig
 
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def create_threshold_curve(thresholds, counts, current_threshold):
+    """Create line chart of semantic match count across similarity thresholds"""
+    fig = go.Figure(data=[
+        go.Scatter(
+            x=thresholds,
+            y=counts,
+            mode='lines',
+            line_shape='hv',
+            line_color='#667eea'
+        )
+    ])
+    
+    fig.add_vline(x=current_threshold, line_dash='dash', line_color='#764ba2')
+    
+    fig.update_layout(
+        xaxis_title="AI Similarity Threshold",
+        yaxis_title="Semantic Matches",
+        height=300
+    )
+    
+    return fig
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
+def create_blocking_skills_chart(blocking_skills, candidates):
+    """Create horizontal bar chart of the skills most candidates are missing"""
+    labels = [f"{item['skill']} ({item['category'].replace('_', ' ')})" for item in blocking_skills][::-1]
+    shares = [100 * item['candidates'] / candidates for item in blocking_skills][::-1]
+    fig = go.Figure(go.Bar(
+        x=shares,
+        y=labels,
+        orientation='h',
+        marker_color='#ef5350',
+        text=[f"{share:.0f}%" for share in shares],
+        textposition='auto'
+    ))
+    fig.update_layout(
+        xaxis_title="Candidates Missing the Skill (%)",
+        xaxis=dict(range=[0, 100]),
+        height=max(300, 28 * len(labels)),
+        margin=dict(l=10, r=10, t=10, b=10)
+    )
+    return fig
+
+@st.cache_data(max_entries=FIGURE_CACHE_ENTRIES, show_spinner=False)
 def create_bubble_chart(bubble_data):
     """Create bubble chart for skill gap analysis"""
-    import pandas as pd
-    
-    df = pd.DataFrame(bubble_data)
+    max_count = max((item['count'] for item in bubble_data), default=1) or 1
     
-    fig = px.scatter(df, 
-                     x='category', 
-                     y='importance',
-                     size='count',
-                     color='priority',
-                     hover_data=['skills'],
-                     color_discrete_map={'High': '#f44336', 'Medium': '#ff9800', 'Low': '#4caf50'},
-                     title="Skill Gaps by Priority")
+    fig = go.Figure()
     
-    fig.update_layout(height=400)
+    # One trace per priority so the legend works like a color key
+    for priority, color in PRIORITY_COLORS.items():
+        items = [item for item in bubble_data if item['priority'] == priority]
+        if not items:
+            continue
+        fig.add_trace(go.Scatter(
+            x=[item['category'] for item in items],
+            y=[item['importance'] for item in items],
+            mode='markers',
+            name=priority,
+            marker=dict(
+                size=[item['count'] for item in items],
+                sizemode='area',
+                sizeref=2.0 * max_count / BUBBLE_SIZE_MAX ** 2,
+                color=color
+            ),
+            customdata=[item['skills'] for item in items],
+            hovertemplate="%{x}<br>importance=%{y}<br>count=%{marker.size}<br>skills=%{customdata}<extra></extra>"
+        ))
+    
+    fig.update_layout(title="Skill Gaps by Priority", height=400, legend_title_text='priority')
     
     return fig
 
+STAGE_LABELS = {
+    'semantic_similarity': "AI semantic matching",
+    'semantic': "AI semantic matching",
+    'suggestions': "Optimization suggestions",
+    'jd_keywords': "Job description keywords",
+    'keyword_coverage': "Job description keywords",
+    'sentences': "Skill evidence retrieval",
+    'sentence_vectors': "Skill evidence retrieval",
+    'evidence': "Skill evidence retrieval",
+    'ats': "ATS check",
+    'experience': "Experience extraction",
+    'visualization': "Visualizations",
+    'missing_skills': "AI resume rewriter",
+    'rewriter': "AI resume rewriter",
+    'interview': "Interview question generator",
+    'chunks': "Resume search indexing",
+    'chunk_vectors': "Resume search indexing"
+}
+
+RESULT_VIEWS = {
+    'overview': "📊 Overview & Scores",
+    'skills': "🎯 Skills Analysis",
+    'optimizer': "✨ Resume Optimizer",
+    'interview': "🎤 Interview Preparation",
+    'report': "📈 Detailed Report"
+}
+
+CANDIDATE_RESULTS_SHOWN = 50
+PASSAGE_RESULTS_SHOWN = 10
+BLOCKING_SKILLS_SHOWN = 15
+
+# Values the success message needs whichever view is open
+SUMMARY_VALUES = ['basic_score', 'weighted_score']
+
+# Values stored for candidate search after every analysis; the chunks are
+# embedded in the background, once per analysis (index_resume_chunks)
+SEARCH_VALUES = ['resume_skills', 'resume_chunks']
+
+# Result sections: values needed before anything is shown, values shown once
+# available, and whether the section is redrawn as those arrive. Sections with
+# widgets are drawn once, when all of their values are in.
+RESULT_SECTIONS = [
+    ('overview', ['basic_score', 'weighted_score'], ['experience_info', 'ats_results'], True),
+    ('skills', ['details', 'resume_matches', 'resume_text', 'skill_highlights'],
+     ['viz_data', 'semantic_matches', 'skill_similarity', 'keyword_coverage'], False),
+    ('optimizer', [], ['rewritten_bullets', 'suggestions'], False),
+    ('interview', [], ['interview_questions'], False),
+    ('report', ['details', 'resume_skills', 'jd_skills', 'basic_score', 'weighted_score'], ['skill_evidence'], False)
+]
+
+VALUE_LABELS = {
+    'resume_text': "PDF extraction",
+    'resume_matches': "Skill extraction",
+    'skill_highlights': "Skill extraction",
+    'resume_skills': "Skill extraction",
+    'jd_skills': "Job description analysis",
+    'basic_score': "Match scoring",
+    'details': "Match scoring",
+    'weighted_score': "Smart scoring",
+    'experience_info': "Experience extraction",
+    'ats_results': "ATS check",
+    'viz_data': "Visualizations",
+    'semantic_matches': "AI semantic matching",
+    'skill_similarity': "AI semantic matching",
+    'rewritten_bullets': "AI resume rewriter",
+    'suggestions': "Optimization suggestions",
+    'keyword_coverage': "Job description keywords",
+    'skill_evidence': "Skill evidence retrieval",
+    'interview_questions': "Interview question generator"
+}
+
+def section_values(name):
+    """Every value a result section can show."""
+    for section_name, required, optional, _ in RESULT_SECTIONS:
+        if section_name == name:
+            return required + optional
+    return []
+
+def display_candidate_search(tenant):
+    """Skill and free-text search over every analyzed resume."""
+    with st.expander("🔎 Search Analyzed Candidates"):
+        query = st.text_input(
+            "Skill query",
+            placeholder='e.g., Python AND Kubernetes AND NOT Java',
+            help='Combine catalog skills with AND, OR, NOT and parentheses; quote names that contain operator words'
+        )
+        if query.strip():
+            index = skill_index(get_taxonomy(tenant))
+            try:
+                matches = index.search(query)
+            except ValueError as e:
+                st.warning(f"⚠️ {e}")
+            else:
+                st.caption(f"{len(matches)} of {len(index)} candidates match")
+                for key in matches[:CANDIDATE_RESULTS_SHOWN]:
+                    st.markdown(f"- [Analysis {key}](?analysis={key}&tenant={tenant})")
+        
+        experience_query = st.text_input(
+            "Experience search",
+            placeholder="e.g., built streaming data pipelines at scale",
+            help="Finds the candidates whose resume passages are closest in meaning"
+        )
+        if experience_query.strip():
+            results = vector_store().search(embed_passages([experience_query])[0], k=PASSAGE_RESULTS_SHOWN)
+            if not results:
+                st.info("No analyzed resumes to search yet.")
+            for result in results:
+                st.markdown(f"**[Analysis {result['key']}](?analysis={result['key']}&tenant={tenant})** "
+                            f"· similarity {result['score']:.2f}")
+                for chunk in result['chunks']:
+                    passage = html.escape(' '.join(chunk['text'].split()))
+                    st.markdown(f'<div class="resume-preview"><mark class="skill-highlight">{passage}</mark></div>',
+                                unsafe_allow_html=True)
+
+def display_cohort_dashboard():
+    """Skill gaps and score percentiles across every analysis of a job description."""
+    with st.expander("📈 Cohort Analytics"):
+        aggregator = cohort_aggregator()
+        cohorts = aggregator.ranked_cohorts()
+        if not cohorts:
+            st.info("No analyses recorded yet.")
+            return
+        labels = {context: f"{cohort.label} ({cohort.candidates} candidates)" for context, cohort in cohorts}
+        context = st.selectbox("Job description", list(labels), format_func=labels.get)
+        report = aggregator.export(context, top_skills=BLOCKING_SKILLS_SHOWN)
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Candidates", report['candidates'])
+        col2.metric("Median Match", f"{report['basic_score']['p50']:.1f}%")
+        col3.metric("Top 10% Match", f"{report['basic_score']['p90']:.1f}%")
+        col4.metric("Median Smart Score", f"{report['weighted_score']['p50']:.1f}%")
+        
+        if report['blocking_skills']:
+            st.markdown("#### 🚧 Missing Skills Blocking Most Candidates")
+            st.plotly_chart(create_blocking_skills_chart(report['blocking_skills'], report['candidates']),
+                            use_container_width=True)
+        
+        st.markdown("#### 📂 By Category")
+        for category, stats in report['categories'].items():
+            st.markdown(f"**{category.replace('_', ' ').title()}**: {stats['blocked']} of {stats['candidates']} "
+                        f"candidates miss a required skill · median coverage {stats['median_coverage']:.0f}%")
+        
+        st.download_button(
+            "📥 Export Cohort (JSON)",
+            json.dumps(report, indent=2),
+            file_name=f"cohort_{context.replace(':', '_')}.json",
+            mime="application/json"
+        )
+
+def display_snapshot(snapshot_id):
+    """Redraw a saved analysis (?analysis=<id>) without running the pipeline."""
+    snapshot = load_snapshot(snapshot_id)
+    if snapshot is None:
+        st.error("❌ This analysis link is invalid or has expired. Run a new analysis above.")
+        return
+    values, settings = snapshot
+    
+    st.markdown("---")
+    st.markdown("## 📑 Saved Analysis")
+    st.caption(f"🔗 Analysis {snapshot_id}")
+    view = st.radio(
+        "Results view",
+        list(RESULT_VIEWS),
+        format_func=RESULT_VIEWS.get,
+        horizontal=True,
+        key="snapshot_view",
+        label_visibility="collapsed"
+    )
+    required = next(spec[1] for spec in RESULT_SECTIONS if spec[0] == view)
+    if all(value in values for value in required):
+        render_section(view, values, settings)
+    else:
+        st.info("ℹ️ This view could not be completed for this analysis. Re-run the analysis to see it.")
+
+def render_section(name, values, settings):
+    """Draw one result section from the values computed so far."""
+    if name == 'overview':
+        display_overview_tab(
+            values['basic_score'], 
+            values['weighted_score'], 
+            values.get('experience_info', {}), 
+            values.get('ats_results', {}), 
+            settings['enable_weighted'], 
+            settings['enable_ats']
+        )
+    elif name == 'skills':
+        display_skills_tab(
+            values.get('viz_data', {}), 
+            values.get('semantic_matches', {}), 
+            values['details'], 
+            settings['enable_visualizations'], 
+            settings['enable_semantic'],
+            values['resume_matches'],
+            values.get('skill_similarity'),
+            settings['semantic_threshold'],
+            values['resume_text'],
+            values.get('skill_highlights', []),
+            values.get('keyword_coverage', [])
+        )
+    elif name == 'optimizer':
+        display_optimizer_tab(
+            values.get('rewritten_bullets', []), 
+            values.get('suggestions', []), 
+            settings['enable_rewriter'], 
+            settings['enable_suggestions']
+        )
+    elif name == 'interview':
+        display_interview_tab(
+            values.get('interview_questions', {}), 
+            settings['enable_interview']
+        )
+    elif name == 'report':
+        display_detailed_report_tab(
+            values['details'], 
+            values['resume_skills'], 
+            values['jd_skills'], 
+            values['basic_score'], 
+            values['weighted_score'],
+            values.get('skill_evidence')
+        )
+
+class ResultStream:
+    """Fills result sections as the pipeline produces their values.
+
+    views is a list of (section name, container). Every section gets a status
+    line (what it is still waiting for, or what failed) above a placeholder for
+    its content; update() is the pipeline's on_stage hook.
+    """
+    
+    def __init__(self, views, pipeline, targets, settings):
+        self.pipeline = pipeline
+        self.settings = settings
+        self.sections = []
+        containers = dict(views)
+        for name, required, optional, progressive in RESULT_SECTIONS:
+            if name not in containers:
+                continue
+            with containers[name]:
+                status = st.empty()
+                body = st.empty()
+            status.info("⏳ Waiting for analysis to start...")
+            self.sections.append({
+                'name': name,
+                'required': required,
+                'expected': required + [value for value in optional if value in targets],
+                'progressive': progressive,
+                'status': status,
+                'body': body,
+                'done': False
+            })
+    
+    def failed(self, value, errors):
+        producer = self.pipeline.producers.get(value)
+        return producer is not None and producer.name in errors
+    
+    def update(self, stage, values, errors):
+        for section in self.sections:
+            if not section['done'] and any(value in stage.outputs for value in section['expected']):
+                self.refresh(section, values, errors)
+        # Sections that need no stage output at all
+        for section in self.sections:
+            if not section['done'] and not section['expected']:
+                self.refresh(section, values, errors)
+    
+    def refresh(self, section, values, errors):
+        failed = [value for value in section['expected'] if value not in values and self.failed(value, errors)]
+        pending = [value for value in section['expected'] if value not in values and value not in failed]
+        
+        if any(value in failed for value in section['required']):
+            section['status'].error("❌ This section could not be computed.")
+            section['done'] = True
+            return
+        
+        labels = sorted({VALUE_LABELS.get(value, value) for value in pending})
+        if pending:
+            section['status'].info(f"⏳ Still running: {', '.join(labels)}")
+            ready = all(value in values for value in section['required'])
+            if section['progressive'] and ready:
+                with section['body'].container():
+                    render_section(section['name'], values, self.settings)
+            return
+        
+        if failed:
+            failed_labels = sorted({VALUE_LABELS.get(value, value) for value in failed})
+            section['status'].warning(f"⚠️ Not available: {', '.join(failed_labels)}")
+        else:
+            section['status'].empty()
+        with section['body'].container():
+            render_section(section['name'], values, self.settings)
+        section['done'] = True
+
+@st.cache_resource
+def get_analysis_pipeline():
+    """Analysis DAG shared by all sessions; each session keeps its own memo."""
+    return build_analysis_pipeline()
+
+@st.cache_resource
+def get_stage_executor():
+    """Thread pools that run independent analysis stages concurrently."""
+    return StageExecutor(max_workers=4, model_workers=1)
+
+def index_resume_chunks(snapshot_id, chunks):
+    """Embed a saved analysis's resume passages and add them to the candidate search store."""
+    if chunks and snapshot_id not in vector_store().keys:
+        vector_store().add(snapshot_id, chunks, chunk_vectors(chunks))
+
 def main():
     # Main header
     st.markdown('<h1 class="main-header">🤖 AI-Powered Resume Analyzer & Optimizer</h1>', unsafe_allow_html=True)
@@ -732,6 +1195,23 @@ def main():
     with st.sidebar:
         st.markdown("## ⚙️ Analysis Settings")
         
+        # Skill catalog (per-tenant taxonomy), also selectable with ?tenant=<name>
+        registry = taxonomy_registry()
+        catalogs = registry.names()
+        tenant = st.query_params.get("tenant", DEFAULT_TAXONOMY)
+        if tenant not in catalogs:
+            tenant = DEFAULT_TAXONOMY
+        if len(catalogs) > 1:
+            tenant = st.selectbox(
+                "Skill Catalog",
+                catalogs,
+                index=catalogs.index(tenant),
+                help="Company-specific skill catalog and scoring weights"
+            )
+            get_taxonomy(tenant)
+            catalog_kb = registry.memory_report().get(tenant, 0) / 1024
+            st.caption(f"Catalog memory: {catalog_kb:.0f} KB")
+        
         # Job title input for weighted scoring
         job_title = st.text_input(
             "Job Title (Optional)", 
@@ -795,171 +1275,163 @@ def main():
         st.subheader("📊 Analysis Results")
         st.info("👈 Upload your resume and paste the job description, then click 'ANALYZE RESUME'")
     
-    # Process when submit button is clicked
+    # Keep the analysis live after the first click: later reruns (slider moves,
+    # job title edits) go through the memoized pipeline and only recompute the
+    # stages downstream of what changed.
     if submit_button:
+        st.session_state['analysis_requested'] = True
+    
+    if st.session_state.get('analysis_requested'):
         if uploaded_file is not None and job_description.strip():
-            with st.spinner("🔍 Analyzing your resume with AI..."):
-                try:
-                    # Create uploads directory if it doesn't exist
-                    os.makedirs("uploads", exist_ok=True)
-                    
-                    # Save uploaded file
-                    file_path = os.path.join("uploads", uploaded_file.name)
-                    with open(file_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    
-                    # Extract text from PDF using enhanced method
-                    resume_text = enhanced_pdf_extraction(file_path)
-                    
-                    # Advanced text cleaning
-                    resume_text_cleaned = advanced_text_cleaning(resume_text)
-                    jd_text_cleaned = advanced_text_cleaning(job_description)
-                    
-                    # Extract skills
-                    resume_skills = extract_skills_by_category(resume_text_cleaned, skills_data)
-                    jd_skills = extract_skills_by_category(jd_text_cleaned, skills_data)
-                    
-                    # Calculate basic match score
-                    basic_score, details = calculate_match_score(resume_skills, jd_skills)
-                    
-                    # Initialize variables for optional features
-                    semantic_matches = {}
-                    weighted_score = basic_score
-                    suggestions = []
-                    ats_results = {}
-                    experience_info = {}
-                    viz_data = {}
-                    rewritten_bullets = []
-                    interview_questions = {}
-                    
-                    # Semantic matching (if enabled)
-                    if enable_semantic and resume_skills and jd_skills:
-                        semantic_matches = semantic_skill_matching(
-                            resume_skills, jd_skills, threshold=semantic_threshold
-                        )
-                    
-                    # Weighted scoring (if enabled)
-                    if enable_weighted:
-                        weighted_score = calculate_weighted_score(details, job_title)
-                    
-                    # Generate suggestions (if enabled)
-                    if enable_suggestions:
-                        suggestions = generate_optimization_suggestions(
-                            details, weighted_score, resume_text
-                        )
-                    
-                    # ATS compatibility check (if enabled)
-                    if enable_ats:
-                        ats_results = check_ats_compatibility(resume_text, file_path)
-                    
-                    # Extract experience information
-                    experience_info = extract_experience_info(resume_text)
-                    
-                    # NEW FEATURES
-                    # Generate visualization data
-                    if enable_visualizations:
-                        viz_data = generate_visualization_data(resume_skills, jd_skills, details)
-                    
-                    # AI Resume Rewriter
-                    if enable_rewriter:
-                        missing_skills = []
-                        for cat in details.values():
-                            missing_skills.extend(cat['missing'][:3])  # Top 3 per category
-                        rewritten_bullets = ai_rewrite_bullet_points(resume_text, job_description, missing_skills[:5])
-                    
-                    # Interview Questions Generator
-                    if enable_interview:
-                        interview_questions = generate_interview_questions(
-                            resume_text, resume_skills, jd_skills, details, experience_info
-                        )
-                    
-                    # Clean up uploaded file
-                    os.remove(file_path)
-                    
-                    # Success message
-                    improvement_percentage = weighted_score - basic_score if enable_weighted else 0
-                    semantic_matches_count = sum(len(matches) for matches in semantic_matches.values()) if semantic_matches else 0
-                    
-                    success_message = f"✅ Analysis completed! "
-                    if semantic_matches_count > 0:
-                        success_message += f"Found {semantic_matches_count} AI matches. "
-                    if improvement_percentage > 0:
-                        success_message += f"Smart scoring improved by {improvement_percentage:.1f}%"
-                    
-                    st.success(success_message)
-                    
-                    # DISPLAY RESULTS IN TABS
-                    st.markdown("---")
-                    st.markdown("## 📑 Analysis Results")
-                    
-                    # Create main tabs
-                    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-                        "📊 Overview & Scores",
-                        "🎯 Skills Analysis", 
-                        "✨ Resume Optimizer",
-                        "🎤 Interview Preparation",
-                        "📈 Detailed Report"
-                    ])
-                    
-                    # Tab 1: Overview & Scores
-                    with tab1:
-                        display_overview_tab(
-                            basic_score, 
-                            weighted_score, 
-                            experience_info, 
-                            ats_results, 
-                            enable_weighted, 
-                            enable_ats
-                        )
-                    
-                    # Tab 2: Skills Analysis
-                    with tab2:
-                        display_skills_tab(
-                            viz_data, 
-                            semantic_matches, 
-                            details, 
-                            enable_visualizations, 
-                            enable_semantic
-                        )
-                    
-                    # Tab 3: Resume Optimizer
-                    with tab3:
-                        display_optimizer_tab(
-                            rewritten_bullets, 
-                            suggestions, 
-                            enable_rewriter, 
-                            enable_suggestions
-                        )
-                    
-                    # Tab 4: Interview Preparation
-                    with tab4:
-                        display_interview_tab(
-                            interview_questions, 
-                            enable_interview
-                        )
-                    
-                    # Tab 5: Detailed Report
-                    with tab5:
-                        display_detailed_report_tab(
-                            details, 
-                            resume_skills, 
-                            jd_skills, 
-                            basic_score, 
-                            weighted_score
-                        )
+            try:
+                taxonomy = get_taxonomy(tenant)
+                sources = {
+                    'pdf_bytes': uploaded_file.getvalue(),
+                    'job_description': job_description,
+                    'taxonomy': taxonomy,
+                    'job_title': job_title,
+                    'semantic_threshold': semantic_threshold,
+                    'enable_weighted': enable_weighted,
+                    'enable_semantic': enable_semantic
+                }
+                
+                # Skill evidence embeds resume sentences, so it follows the AI matching toggle;
+                # with it off, suggestions and interview questions run without evidence
+                targets = ['resume_text', 'resume_matches', 'skill_highlights', 'resume_skills', 'jd_skills',
+                           'basic_score', 'details', 'weighted_score', 'experience_info', 'keyword_coverage']
+                if enable_semantic:
+                    targets.extend(['skill_similarity', 'semantic_matches', 'skill_evidence'])
+                if enable_suggestions:
+                    targets.append('suggestions')
+                if enable_ats:
+                    targets.append('ats_results')
+                if enable_visualizations:
+                    targets.append('viz_data')
+                if enable_rewriter:
+                    targets.append('rewritten_bullets')
+                if enable_interview:
+                    targets.append('interview_questions')
+                
+                settings = {
+                    'enable_semantic': enable_semantic,
+                    'enable_weighted': enable_weighted,
+                    'enable_suggestions': enable_suggestions,
+                    'enable_ats': enable_ats,
+                    'enable_visualizations': enable_visualizations,
+                    'enable_rewriter': enable_rewriter,
+                    'enable_interview': enable_interview,
+                    'semantic_threshold': semantic_threshold,
+                    'tenant': tenant,
+                    'job_title': job_title
+                }
                 
-                except Exception as e:
-                    st.error(f"❌ Error processing your resume: {str(e)}")
-                    st.error("Please make sure your PDF is valid and try again.")
-                    # Optional: Show more detailed error for debugging
-                    if st.checkbox("Show detailed error (for debugging)"):
-                        st.exception(e)
+                progress = st.empty()
+                progress.info("🔍 Analyzing your resume with AI... results appear below as they are ready.")
+                
+                # DISPLAY RESULTS: only the open view is built, and only its stages run;
+                # switching views reuses the memoized stages and cached figures
+                st.markdown("---")
+                st.markdown("## 📑 Analysis Results")
+                view = st.radio(
+                    "Results view",
+                    list(RESULT_VIEWS),
+                    format_func=RESULT_VIEWS.get,
+                    horizontal=True,
+                    key="result_view",
+                    label_visibility="collapsed"
+                )
+                view_values = set(section_values(view))
+                view_targets = [value for value in targets if value in view_values or value in SUMMARY_VALUES]
+                view_targets.extend(SEARCH_VALUES)
+                
+                pipeline = get_analysis_pipeline()
+                memo = st.session_state.setdefault('pipeline_memo', {})
+                stream = ResultStream([(view, st.container())], pipeline, view_targets, settings)
+                
+                run = pipeline.run(
+                    sources,
+                    memo=memo,
+                    targets=view_targets,
+                    executor=get_stage_executor(),
+                    on_stage=stream.update
+                )
+                
+                # A failed optional stage only hides its own section
+                for stage_name in CORE_STAGES:
+                    if stage_name in run.errors:
+                        raise run.errors[stage_name]
+                for label in sorted({STAGE_LABELS[name] for name in run.errors if name in STAGE_LABELS}):
+                    st.warning(f"⚠️ {label} could not be completed for this resume.")
+                
+                # Success message
+                basic_score = run['basic_score']
+                weighted_score = run['weighted_score']
+                semantic_matches = run.get('semantic_matches', {})
+                improvement_percentage = weighted_score - basic_score if enable_weighted else 0
+                semantic_matches_count = sum(len(matches) for matches in semantic_matches.values()) if semantic_matches else 0
+                
+                success_message = f"✅ Analysis completed! "
+                if semantic_matches_count > 0:
+                    success_message += f"Found {semantic_matches_count} AI matches. "
+                if improvement_percentage > 0:
+                    success_message += f"Smart scoring improved by {improvement_percentage:.1f}%"
+                
+                progress.success(success_message)
+                
+                # Save a snapshot so ?analysis=<id> reopens every view of this analysis without
+                # re-running it; the views not opened yet are computed first, reusing the memo
+                snapshot_id = analysis_id(sources['pdf_bytes'], job_description, taxonomy, settings)
+                with st.spinner("🔗 Preparing every view for the shareable link..."):
+                    full_run = pipeline.run(
+                        sources,
+                        memo=memo,
+                        targets=targets + SEARCH_VALUES,
+                        executor=get_stage_executor()
+                    )
+                if run.recomputed or full_run.recomputed or st.query_params.get("analysis") != snapshot_id:
+                    try:
+                        first_analysis = not os.path.exists(snapshot_path(snapshot_id))
+                        save_snapshot(snapshot_id, full_run.values, settings)
+                        st.query_params["analysis"] = snapshot_id
+                        skill_index(taxonomy).add(snapshot_id, full_run['resume_skills'])
+                        if first_analysis:
+                            if 'resume_chunks' in full_run.values:
+                                get_stage_executor().submit_task(
+                                    'model', index_resume_chunks, snapshot_id, full_run['resume_chunks']
+                                )
+                            context = context_key(job_description, taxonomy, settings)
+                            duplicate_index().add(snapshot_id, minhash_signature(full_run['resume_text']), context)
+                            idf_table().add_document(job_description)
+                            cohort_aggregator().record(cohort_event(
+                                context,
+                                job_description,
+                                basic_score,
+                                weighted_score,
+                                full_run['details']
+                            ))
+                    except OSError:
+                        st.caption("⚠️ This analysis could not be saved for sharing.")
+                if st.query_params.get("analysis") == snapshot_id:
+                    st.caption(f"🔗 Share this page's link (analysis {snapshot_id}) to reopen these results.")
+            
+            except Exception as e:
+                st.error(f"❌ Error processing your resume: {str(e)}")
+                st.error("Please make sure your PDF is valid and try again.")
+                # Optional: Show more detailed error for debugging
+                if st.checkbox("Show detailed error (for debugging)"):
+                    st.exception(e)
         
         elif uploaded_file is None:
             st.warning("⚠️ Please upload a PDF file.")
         elif not job_description.strip():
             st.warning("⚠️ Please enter a job description.")
     
+    elif st.query_params.get("analysis"):
+        display_snapshot(st.query_params["analysis"])
+    
+    display_candidate_search(tenant)
+    display_cohort_dashboard()
+    
     # Footer with features
     st.markdown("---")
     col1, col2, col3, col4 = st.columns(4)
@@ -0,0 +1,152 @@
+import csv
+import os
+import sys
+
+from pipeline import CORE_STAGES, StageExecutor, build_analysis_pipeline
+from snapshots import analysis_id, load_snapshot, save_snapshot
+from dedup import context_key, duplicate_index, minhash_signature
+from cohort import cohort_aggregator, cohort_event
+from keywords import idf_table
+from results import AnalysisResult
+from skill_index import skill_index
+from vector_store import vector_store
+from taxonomy import DEFAULT_TAXONOMY, get_taxonomy
+
+#=================================================================================
+# Batch screening
+#
+# Each resume is extracted first; the expensive stages (skill matching, AI
+# matching, rewriting, interview questions) only run when the resume is not a
+# re-submission or near-duplicate of one already analysed for the same job
+# with the same job title and scoring settings. Duplicates reuse the earlier
+# analysis snapshot. Each row keeps its scores and skill results as a compact
+# AnalysisResult (results.py) for ranking.
+#=================================================================================
+BATCH_TARGETS = [
+    'resume_text', 'resume_matches', 'skill_highlights', 'resume_skills', 'jd_skills',
+    'basic_score', 'details', 'weighted_score', 'experience_info', 'skill_similarity',
+    'semantic_matches', 'suggestions', 'ats_results', 'viz_data', 'rewritten_bullets',
+    'interview_questions', 'keyword_coverage', 'skill_evidence', 'resume_chunks', 'chunk_vectors'
+]
+BATCH_SETTINGS = {
+    'enable_semantic': True,
+    'enable_weighted': True,
+    'enable_suggestions': True,
+    'enable_ats': True,
+    'enable_visualizations': True,
+    'enable_rewriter': True,
+    'enable_interview': True,
+    'semantic_threshold': 0.7
+}
+
+
+def screen_resume(pipeline, pdf_bytes, job_description, taxonomy, job_title="", executor=None):
+    """Analyse one resume, or reuse the analysis of a duplicate.
+
+    Returns (analysis id, result values, id of the analysis reused or None).
+    """
+    settings = dict(BATCH_SETTINGS, tenant=taxonomy.name, job_title=job_title)
+    snapshot_id = analysis_id(pdf_bytes, job_description, taxonomy, settings)
+    snapshot = load_snapshot(snapshot_id)
+    if snapshot is not None:
+        return snapshot_id, snapshot[0], snapshot_id
+
+    sources = {
+        'pdf_bytes': pdf_bytes,
+        'job_description': job_description,
+        'taxonomy': taxonomy,
+        'job_title': job_title,
+        'semantic_threshold': BATCH_SETTINGS['semantic_threshold'],
+        'enable_weighted': BATCH_SETTINGS['enable_weighted'],
+        'enable_semantic': BATCH_SETTINGS['enable_semantic']
+    }
+    memo = {}
+    extracted = pipeline.run(sources, memo=memo, targets=['resume_text'])
+    if 'extract' in extracted.errors:
+        raise extracted.errors['extract']
+
+    signature = minhash_signature(extracted['resume_text'])
+    context = context_key(job_description, taxonomy, settings)
+    duplicate = duplicate_index().find(signature, context)
+    if duplicate is not None:
+        snapshot = load_snapshot(duplicate[0])
+        if snapshot is not None:
+            return duplicate[0], snapshot[0], duplicate[0]
+
+    run = pipeline.run(sources, memo=memo, targets=BATCH_TARGETS, executor=executor)
+    for stage_name in CORE_STAGES:
+        if stage_name in run.errors:
+            raise run.errors[stage_name]
+
+    save_snapshot(snapshot_id, run.values, settings)
+    skill_index(taxonomy).add(snapshot_id, run['resume_skills'])
+    if 'chunk_vectors' in run.values:
+        vector_store().add(snapshot_id, run['resume_chunks'], run['chunk_vectors'])
+    duplicate_index().add(snapshot_id, signature, context)
+    cohort_aggregator().record(
+        cohort_event(context, job_description, run['basic_score'], run['weighted_score'], run['details'])
+    )
+    return snapshot_id, run.values, None
+
+
+def screen_batch(pdf_paths, job_description, tenant=DEFAULT_TAXONOMY, job_title=""):
+    """Screen resumes against one job description; yields one result row per file.
+
+    Rows hold the CSV fields plus 'result', the AnalysisResult (None on errors);
+    result.to_values(taxonomy) gives back the dicts the display functions take.
+    """
+    taxonomy = get_taxonomy(tenant)
+    idf_table().add_document(job_description)
+    pipeline = build_analysis_pipeline()
+    executor = StageExecutor()
+    try:
+        for path in pdf_paths:
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+            try:
+                snapshot_id, values, reused = screen_resume(
+                    pipeline, pdf_bytes, job_description, taxonomy, job_title, executor
+                )
+                # Raises ValueError for a reused analysis whose skills left a reloaded catalog
+                result = AnalysisResult.from_values(values, taxonomy)
+            except Exception as e:
+                yield {'file': path, 'analysis': '', 'basic_score': '', 'weighted_score': '',
+                       'duplicate_of': '', 'error': str(e), 'result': None}
+                continue
+            yield {
+                'file': path,
+                'analysis': snapshot_id,
+                'basic_score': values.get('basic_score', ''),
+                'weighted_score': values.get('weighted_score', ''),
+                'duplicate_of': reused or '',
+                'error': '',
+                'result': result
+            }
+    finally:
+        executor.shutdown()
+        cohort_aggregator().save()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Screen a batch of PDF resumes against a job description")
+    parser.add_argument("job_description", help="Text file with the job description")
+    parser.add_argument("resumes", nargs="+", help="PDF resumes")
+    parser.add_argument("--tenant", default=DEFAULT_TAXONOMY, help="Skill catalog to use")
+    parser.add_argument("--job-title", default="", help="Job title for smart scoring")
+    parser.add_argument("--rank", action="store_true", help="Sort rows by weighted score, best first")
+    args = parser.parse_args()
+
+    with open(args.job_description, encoding='utf-8') as f:
+        job_description = f.read()
+
+    fields = ['file', 'analysis', 'basic_score', 'weighted_score', 'duplicate_of', 'error']
+    writer = csv.DictWriter(sys.stdout, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    resumes = [path for path in args.resumes if os.path.isfile(path)]
+    rows = screen_batch(resumes, job_description, args.tenant, args.job_title)
+    if args.rank:
+        rows = sorted(rows, key=lambda row: row['result'].weighted_score if row['result'] else -1, reverse=True)
+    for row in rows:
+        writer.writerow(row)
@@ -0,0 +1,80 @@
+"""normalize_text against the six-pass cleaning it replaced, across resume sizes.
+
+    python benchmarks/normalize_text.py [--repeat 200]
+
+Inputs are synthetic resumes: section headings, bullets, dates, skills and
+contact details, with the blank lines and runs of spaces PDF extraction leaves.
+The "dense" input repeats contact lines (emails, phones, links) throughout.
+Times are the minimum over repeated runs.
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_features import normalize_text  # noqa: E402
+
+_WHITESPACE = re.compile(r'\s+')
+_EMAIL_TOKEN = re.compile(r'\S+@\S+')
+_PHONE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+_NON_SKILL_CHARS = re.compile(r'[^\w\s\+\#\.\-]')
+
+WORDS = ("developed implemented led managed designed built improved reduced increased data pipeline "
+         "service platform team customers latency revenue using Python SQL Docker Kubernetes AWS React "
+         "Node.js C++ C# machine learning dashboards APIs microservices for the and with across").split()
+
+
+def six_pass_cleaning(text):
+    """The cleaning normalize_text replaced (without an offset map)."""
+    text = text.lower()
+    text = _WHITESPACE.sub(' ', text)
+    text = text.strip()
+    text = _EMAIL_TOKEN.sub('[EMAIL]', text)
+    text = _PHONE.sub('[PHONE]', text)
+    return _NON_SKILL_CHARS.sub(' ', text)
+
+
+def contact_line(rng):
+    name = ''.join(rng.choice('abcdefghij') for _ in range(8))
+    return (f"{name.title()} | {name}@example.com | {rng.randint(200, 999)}-555-{rng.randint(1000, 9999)} | "
+            f"linkedin.com/in/{name}  |  github.com/{name}")
+
+
+def synthetic_resume(size, rng, dense=False):
+    lines = [contact_line(rng), ""]
+    sections = ["SUMMARY", "EXPERIENCE", "PROJECTS", "EDUCATION", "SKILLS"]
+    while sum(len(line) + 1 for line in lines) < size:
+        lines.extend(["", rng.choice(sections), ""])
+        lines.append(f"Senior Engineer, Company {rng.randint(1, 99)}    Jan {rng.randint(2010, 2020)} - Present")
+        for _ in range(rng.randint(3, 6)):
+            words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 22)))
+            lines.append(f"• {words.capitalize()}, by {rng.randint(5, 60)}% (${rng.randint(1, 900)}K).")
+        if dense:
+            lines.extend(contact_line(rng) for _ in range(3))
+    # PyMuPDF ends many lines with a space
+    return '\n'.join(line + ' ' * rng.randint(0, 1) for line in lines)[:size]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    inputs = [(f"{size // 1000} KB", synthetic_resume(size, rng)) for size in (1000, 3000, 5000, 12000, 30000)]
+    inputs.insert(3, ("5 KB dense", synthetic_resume(5000, rng, dense=True)))
+
+    print(f"{'input':<12}{'six-pass':>12}{'normalize_text':>16}")
+    for label, text in inputs:
+        assert normalize_text(text)[0] == six_pass_cleaning(text)
+        old = min(timeit.repeat(lambda: six_pass_cleaning(text), number=1, repeat=args.repeat))
+        new = min(timeit.repeat(lambda: normalize_text(text), number=1, repeat=args.repeat))
+        print(f"{label:<12}{old * 1e6:>10.0f}µs{new * 1e6:>14.0f}µs")
+
+
+if __name__ == "__main__":
+    main()
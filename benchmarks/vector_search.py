@@ -0,0 +1,103 @@
+"""Candidate search latency and recall on a synthetic chunk store.
+
+    python benchmarks/vector_search.py [--rows 1000000] [--dim 384] [--queries 20]
+
+Vectors are clustered, unit-normalized float16 (like chunk embeddings). Two
+kinds of query are timed: perturbed stored chunks (a resume's own wording) and
+cluster centres (a topic many chunks are close to). Recall compares the top-k
+candidates with those of an exact scan of the whole store, which is also timed.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vector_store import CHUNKS_PER_CANDIDATE, VectorStore  # noqa: E402
+
+
+def synthetic_vectors(rows, dim, rng, clusters=2000):
+    """(float16 vectors, cluster centres)."""
+    centers = rng.standard_normal((clusters, dim), dtype=np.float32)
+    vectors = np.empty((rows, dim), dtype=np.float16)
+    for start in range(0, rows, 100000):
+        count = min(100000, rows - start)
+        block = centers[rng.integers(clusters, size=count)] + rng.standard_normal((count, dim), dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        vectors[start:start + count] = block
+    return vectors, centers
+
+
+def exact_scan(vectors, query, block_rows=65536):
+    """Scores of every chunk, float16 blocks upcast one at a time."""
+    return np.concatenate([vectors[start:start + block_rows].astype(np.float32) @ query
+                           for start in range(0, len(vectors), block_rows)])
+
+
+def top_candidates(rows, scores, k):
+    order = np.argsort(scores)[::-1]
+    return list(dict.fromkeys(f"c{row // 10}" for row in np.asarray(rows)[order[:k * 50]]))[:k]
+
+
+def build_store(directory, vectors):
+    store = VectorStore(directory)
+    rows = len(vectors)
+    metadata = {'candidates': [f"c{index}" for index in range(rows // 10 + 1)],
+                'chunks': [[0, 0, ""]] * rows}
+    owners = (np.arange(rows) // 10).astype(np.int32)
+    store.dim = vectors.shape[1]
+    store.segments = [store._write_segment(vectors, owners, metadata)]
+    store.keys = set(metadata['candidates'])
+    store._write_manifest()
+    return VectorStore(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors, centers = synthetic_vectors(args.rows, args.dim, rng)
+    keep = args.k * CHUNKS_PER_CANDIDATE * 4
+    queries = {'chunk': [], 'topic': []}
+    for row in rng.integers(args.rows, size=args.queries):
+        queries['chunk'].append(vectors[row].astype(np.float32)
+                                + rng.standard_normal(args.dim, dtype=np.float32) / np.sqrt(args.dim))
+    for center in rng.integers(len(centers), size=args.queries):
+        queries['topic'].append(centers[center].copy())
+
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        store = build_store(directory, vectors)
+        print(f"Built {args.rows} x {args.dim} store in {time.perf_counter() - start:.1f}s")
+        store.search(queries['chunk'][0], args.k)  # page in the codes
+
+        scan_latencies = []
+        for kind, kind_queries in queries.items():
+            latencies, recalls = [], []
+            for query in kind_queries:
+                query /= np.linalg.norm(query)
+                start = time.perf_counter()
+                hits = store._search(query, args.k, keep)
+                latencies.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                exact = exact_scan(vectors, query)
+                scan_latencies.append(time.perf_counter() - start)
+                expected = top_candidates(np.arange(args.rows), exact, args.k)
+                recalls.append(len({hit['key'] for hit in hits} & set(expected)) / len(expected))
+            latencies = np.array(latencies) * 1000
+            print(f"{kind} queries: median {np.median(latencies):.1f} ms, max {latencies.max():.1f} ms, "
+                  f"top-{args.k} candidate recall {np.mean(recalls):.3f}")
+    print(f"Exact float16 block scan: median {np.median(scan_latencies) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import re
+
+import numpy as np
+
+from document import SENTENCE_SPLIT_PATTERN, as_document
+
+#=================================================================================
+# Bullet analysis
+#
+# Every bullet in the resume is scored for impact in one pass: the bullets are
+# joined into one string, a single precompiled pattern finds every metric,
+# currency amount, number and strong action verb, and matches are assigned to
+# their bullet by offset. Scores are then combined as arrays, so ranking a long
+# resume costs one regex scan and a few vector operations.
+#=================================================================================
+MIN_BULLET_WORDS = 5
+WEAK_BULLETS_REWRITTEN = 5
+BASE_IMPACT_SCORE = 5
+MAX_IMPACT_SCORE = 10
+IDEAL_BULLET_WORDS = (10, 25)
+
+STRONG_VERBS = ('achieved', 'developed', 'implemented', 'led', 'managed', 'created',
+                'improved', 'increased', 'reduced', 'optimized', 'designed', 'built')
+
+# Points per feature; a bullet with a percentage or amount also counts as having a number
+FEATURE_POINTS = {'percent': 2, 'currency': 2, 'number': 1, 'verb': 1, 'length': 1}
+
+_BULLET_FEATURES = re.compile(
+    r'(?P<percent>\d+%)'
+    r'|(?P<currency>\$\d+)'
+    r'|(?P<number>\d+)'
+    r'|(?P<verb>\b(?:' + '|'.join(STRONG_VERBS) + r')\b)',
+    re.IGNORECASE
+)
+
+
+def extract_bullets(resume_text):
+    """Every bullet of at least MIN_BULLET_WORDS words, in document order.
+
+    Resumes without bullet markers fall back to the sentences of the
+    experience section.
+    """
+    document = as_document(resume_text)
+    bullets = [bullet for bullet in document.bullets if len(bullet.split()) >= MIN_BULLET_WORDS]
+    if not bullets:
+        exp_section = document.section_text('experience', 'education')
+        if exp_section:
+            sentences = SENTENCE_SPLIT_PATTERN.split(exp_section)
+            bullets = [s.strip() for s in sentences if len(s.split()) >= MIN_BULLET_WORDS]
+    return bullets
+
+
+def bullet_features(bullets):
+    """Boolean feature arrays (percent, currency, number, verb, length) for a list of bullets."""
+    count = len(bullets)
+    features = {name: np.zeros(count, dtype=bool) for name in FEATURE_POINTS}
+    if not count:
+        return features
+
+    text = '\n'.join(bullets)
+    starts = np.cumsum([0] + [len(bullet) + 1 for bullet in bullets[:-1]])
+    hits = {name: [] for name in FEATURE_POINTS}
+    for match in _BULLET_FEATURES.finditer(text):
+        hits[match.lastgroup].append(match.start())
+    for name, positions in hits.items():
+        if positions:
+            features[name][np.searchsorted(starts, positions, side='right') - 1] = True
+    features['number'] |= features['percent'] | features['currency']
+
+    word_counts = np.array([len(bullet.split()) for bullet in bullets])
+    features['length'] = (word_counts >= IDEAL_BULLET_WORDS[0]) & (word_counts <= IDEAL_BULLET_WORDS[1])
+    return features
+
+
+def score_bullets(bullets):
+    """Impact score (0-10) of every bullet, as an int array."""
+    features = bullet_features(bullets)
+    scores = np.full(len(bullets), BASE_IMPACT_SCORE, dtype=np.int64)
+    for name, points in FEATURE_POINTS.items():
+        scores += points * features[name]
+    return np.minimum(scores, MAX_IMPACT_SCORE)
+
+
+def weakest_bullets(resume_text, limit=WEAK_BULLETS_REWRITTEN):
+    """(bullet, impact score) of the lowest-scoring bullets, weakest first.
+
+    Ties keep document order.
+    """
+    bullets = extract_bullets(resume_text)
+    scores = score_bullets(bullets)
+    order = np.argsort(scores, kind='stable')
+    if limit is not None:
+        order = order[:limit]
+    return [(bullets[index], int(scores[index])) for index in order]
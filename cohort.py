@@ -0,0 +1,335 @@
+import json
+import os
+import threading
+
+#=================================================================================
+# Cohort analytics
+#
+# Every finished analysis becomes one compact event (scores plus the missing
+# skills per category) appended to a log. A streaming aggregator folds events
+# into per-job-description cohorts: how many candidates each missing skill
+# blocks, and fixed-bin histograms of the scores from which percentiles are
+# read. A cohort's size is bounded by the skill catalog, not by how many
+# candidates it holds, and only the most recently active cohorts are kept, so
+# the aggregate stays the same size however long the history is.
+#
+# The log is the source of truth and the app and batch runs append to the same
+# one. Each process replays the lines it has not seen yet, so the aggregate
+# only depends on the log order. The aggregate is saved with the log offset it
+# covers every SAVE_EVERY events, and loading replays the rest of the log.
+#=================================================================================
+COHORT_FORMAT_VERSION = 2  # 2: the saved aggregate records the log offset it covers
+COHORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses")
+COHORT_STATE_PATH = os.path.join(COHORT_DIR, "cohorts.json")
+COHORT_LOG_PATH = os.path.join(COHORT_DIR, "cohort_events.jsonl")
+SCORE_BINS_PER_POINT = 2  # percentiles are exact to half a point
+SCORE_BINS = 100 * SCORE_BINS_PER_POINT + 1
+MAX_COHORTS = 500
+SAVE_EVERY = 50  # events folded in between saves of the aggregate
+COHORT_LABEL_CHARS = 80
+
+
+def cohort_label(job_description):
+    """Short human-readable name for a job description's cohort."""
+    for line in job_description.splitlines():
+        line = ' '.join(line.split())
+        if line:
+            return line[:COHORT_LABEL_CHARS]
+    return "Untitled job description"
+
+
+def cohort_event(context, job_description, basic_score, weighted_score, details):
+    """Compact record of one analysis for the cohort log."""
+    return {
+        'context': context,
+        'label': cohort_label(job_description),
+        'basic_score': float(basic_score),
+        'weighted_score': float(weighted_score),
+        'categories': {
+            category: {'required': len(result['required']), 'missing': sorted(result['missing'])}
+            for category, result in details.items() if result['required']
+        }
+    }
+
+
+class ScoreSketch:
+    """Fixed-size histogram of 0-100 scores with percentile lookup."""
+
+    __slots__ = ('counts', 'total')
+
+    def __init__(self, counts=None):
+        self.counts = counts or [0] * SCORE_BINS
+        self.total = sum(self.counts)
+
+    def add(self, score):
+        score = min(max(score, 0.0), 100.0)
+        self.counts[int(round(score * SCORE_BINS_PER_POINT))] += 1
+        self.total += 1
+
+    def percentile(self, q):
+        """Score below which q percent of the cohort falls, or None if empty."""
+        if not self.total:
+            return None
+        rank = max(1, -(-self.total * q // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return index / SCORE_BINS_PER_POINT
+        return 100.0
+
+    def to_dict(self):
+        # Sparse: a cohort's scores usually cover few bins
+        return {str(index): count for index, count in enumerate(self.counts) if count}
+
+    @classmethod
+    def from_dict(cls, data):
+        counts = [0] * SCORE_BINS
+        for index, count in data.items():
+            counts[int(index)] = count
+        return cls(counts)
+
+
+class Cohort:
+    """Aggregate of every analysis run against one job description."""
+
+    __slots__ = ('label', 'candidates', 'basic', 'weighted', 'categories', 'last_event')
+
+    def __init__(self, label):
+        self.label = label
+        self.candidates = 0
+        self.basic = ScoreSketch()
+        self.weighted = ScoreSketch()
+        self.categories = {}  # category -> {'candidates', 'blocked', 'missing': {skill: count}, 'coverage'}
+        self.last_event = 0
+
+    def add(self, event, sequence):
+        self.label = event['label']
+        self.candidates += 1
+        self.basic.add(event['basic_score'])
+        self.weighted.add(event['weighted_score'])
+        self.last_event = sequence
+        for category, result in event['categories'].items():
+            stats = self.categories.get(category)
+            if stats is None:
+                stats = self.categories[category] = {
+                    'candidates': 0, 'blocked': 0, 'missing': {}, 'coverage': ScoreSketch()
+                }
+            missing = result['missing']
+            stats['candidates'] += 1
+            stats['blocked'] += 1 if missing else 0
+            for skill in missing:
+                stats['missing'][skill] = stats['missing'].get(skill, 0) + 1
+            stats['coverage'].add(100.0 * (result['required'] - len(missing)) / result['required'])
+
+    def blocking_skills(self, limit=None):
+        """(category, skill, candidates missing it) for the most often missing skills."""
+        counts = [(category, skill, count)
+                  for category, stats in self.categories.items()
+                  for skill, count in stats['missing'].items()]
+        counts.sort(key=lambda item: (-item[2], item[0], item[1]))
+        return counts[:limit] if limit else counts
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'candidates': self.candidates,
+            'basic': self.basic.to_dict(),
+            'weighted': self.weighted.to_dict(),
+            'last_event': self.last_event,
+            'categories': {
+                category: dict(stats, coverage=stats['coverage'].to_dict())
+                for category, stats in self.categories.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        cohort = cls(data['label'])
+        cohort.candidates = data['candidates']
+        cohort.basic = ScoreSketch.from_dict(data['basic'])
+        cohort.weighted = ScoreSketch.from_dict(data['weighted'])
+        cohort.last_event = data['last_event']
+        cohort.categories = {
+            category: dict(stats, coverage=ScoreSketch.from_dict(stats['coverage']))
+            for category, stats in data['categories'].items()
+        }
+        return cohort
+
+    def summary(self, top_skills=None):
+        """JSON-ready report of the cohort."""
+        percentiles = (25, 50, 75, 90)
+        return {
+            'label': self.label,
+            'candidates': self.candidates,
+            'basic_score': {f"p{q}": self.basic.percentile(q) for q in percentiles},
+            'weighted_score': {f"p{q}": self.weighted.percentile(q) for q in percentiles},
+            'categories': {
+                category: {
+                    'candidates': stats['candidates'],
+                    'blocked': stats['blocked'],
+                    'median_coverage': stats['coverage'].percentile(50)
+                }
+                for category, stats in sorted(self.categories.items())
+            },
+            'blocking_skills': [
+                {'category': category, 'skill': skill, 'candidates': count}
+                for category, skill, count in self.blocking_skills(top_skills)
+            ]
+        }
+
+
+class CohortAggregator:
+    """Streaming per-job-description aggregate of analysis results."""
+
+    def __init__(self, state_path=COHORT_STATE_PATH, log_path=COHORT_LOG_PATH, max_cohorts=MAX_COHORTS):
+        self.state_path = state_path
+        self.log_path = log_path
+        self.max_cohorts = max_cohorts
+        self.cohorts = {}  # context key -> Cohort
+        self.events = 0
+        self._log_offset = 0  # bytes of the log folded in
+        self._unsaved = 0  # events folded in since the aggregate was saved
+        self._lock = threading.Lock()
+        self._load()
+        self._catch_up()
+
+    def _load(self):
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('format_version') != COHORT_FORMAT_VERSION:
+            return
+        self.events = state['events']
+        self.cohorts = {context: Cohort.from_dict(data) for context, data in state['cohorts'].items()}
+        self._log_offset = state['log_offset']
+
+    def _reset(self):
+        self.cohorts = {}
+        self.events = 0
+        self._log_offset = 0
+
+    def _catch_up(self):
+        """Fold in the complete log lines appended since the last read, by any process."""
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            return
+        if size < self._log_offset:
+            # The log was replaced: start over from its first line
+            self._reset()
+        if size == self._log_offset:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self.consume(event)
+            self._unsaved += 1
+        self._log_offset += complete
+
+    def consume(self, event):
+        """Fold one analysis event into the aggregate."""
+        self.events += 1
+        cohort = self.cohorts.get(event['context'])
+        if cohort is None:
+            if len(self.cohorts) >= self.max_cohorts:
+                stale = min(self.cohorts, key=lambda context: self.cohorts[context].last_event)
+                del self.cohorts[stale]
+            cohort = self.cohorts[event['context']] = Cohort(event['label'])
+        cohort.add(event, self.events)
+
+    def record(self, event):
+        """Append an analysis event to the log and fold in everything logged up to it."""
+        line = json.dumps(event, separators=(',', ':')) + '\n'
+        with self._lock:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            # One write per line, so concurrent appends from other processes do not interleave
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+            self._catch_up()
+            if self._unsaved >= SAVE_EVERY:
+                self._save()
+
+    def save(self):
+        """Save the aggregate now instead of after SAVE_EVERY events."""
+        with self._lock:
+            self._catch_up()
+            self._save()
+
+    def _save(self):
+        state = {
+            'format_version': COHORT_FORMAT_VERSION,
+            'events': self.events,
+            'log_offset': self._log_offset,
+            'cohorts': {context: cohort.to_dict() for context, cohort in self.cohorts.items()}
+        }
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp{os.getpid()}"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_path)
+        self._unsaved = 0
+
+    def rebuild(self):
+        """Recompute the aggregate by streaming the event log; returns the number of events."""
+        with self._lock:
+            self._reset()
+            self._catch_up()
+            self._save()
+            return self.events
+
+    def ranked_cohorts(self):
+        """(context, cohort) pairs, most recently active first."""
+        with self._lock:
+            self._catch_up()
+            return sorted(self.cohorts.items(), key=lambda item: -item[1].last_event)
+
+    def export(self, context=None, top_skills=None):
+        """JSON-ready report of one cohort, or of all of them."""
+        with self._lock:
+            self._catch_up()
+            if context is not None:
+                return self.cohorts[context].summary(top_skills)
+            return {
+                'events': self.events,
+                'cohorts': {context: cohort.summary(top_skills) for context, cohort in self.cohorts.items()}
+            }
+
+
+_aggregator = None
+_aggregator_lock = threading.Lock()
+
+
+def cohort_aggregator():
+    """Process-wide cohort aggregator."""
+    global _aggregator
+    if _aggregator is None:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = CohortAggregator()
+    return _aggregator
+
+
+if __name__ == "__main__":
+    import sys
+
+    command = sys.argv[1] if len(sys.argv) > 1 else "export"
+    if command == "rebuild":
+        print(f"Aggregated {cohort_aggregator().rebuild()} analyses")
+    elif command == "export":
+        context = sys.argv[2] if len(sys.argv) > 2 else None
+        json.dump(cohort_aggregator().export(context), sys.stdout, indent=2)
+        print()
+    else:
+        sys.exit("Usage: python cohort.py [export [context] | rebuild]")
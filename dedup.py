@@ -0,0 +1,136 @@
+import json
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from snapshots import score_settings
+
+#=================================================================================
+# Near-duplicate resume detection
+#
+# Extracted text is reduced to a MinHash signature over word 3-gram shingles.
+# Signatures are split into LSH bands, so finding possible near-duplicates is a
+# few dict lookups instead of a scan; candidates are then checked against the
+# estimated Jaccard similarity. Each entry remembers the analysis it produced and
+# the context (job description, skill catalog and score-affecting settings) it
+# was analysed for, so only re-submissions against the same job with the same
+# settings reuse an earlier analysis.
+#=================================================================================
+DEDUP_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses", "dedup_index.jsonl")
+NUM_PERMUTATIONS = 128
+LSH_BANDS = 16  # 16 bands of 8 rows: pairs above ~0.7 similarity become candidates
+SHINGLE_WORDS = 3
+MIN_SHINGLES = 10
+DUPLICATE_THRESHOLD = 0.9
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_permutations = np.random.RandomState(1).randint(1, 1 << 32, size=(2, NUM_PERMUTATIONS), dtype=np.uint64)
+_WORD = re.compile(r'\w+')
+
+
+def minhash_signature(text):
+    """MinHash signature (uint32 array) of a text's word shingles, or None if the text is too short."""
+    words = _WORD.findall(text.lower())
+    shingles = {' '.join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                         dtype=np.uint64, count=len(shingles))
+    a, b = _permutations
+    permuted = ((hashes[:, None] * a + b) % _MERSENNE_PRIME) & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def signature_similarity(first, second):
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    return float(np.mean(first == second))
+
+
+def context_key(job_description, taxonomy, settings):
+    """Identifies what a resume was analysed against, and with which score-affecting settings."""
+    digest = zlib.crc32(job_description.encode('utf-8'))
+    settings_digest = zlib.crc32(score_settings(settings).encode('utf-8'))
+    return f"{taxonomy.fingerprint()}:{digest:08x}:{settings_digest:08x}"
+
+
+class DuplicateIndex:
+    """LSH index of MinHash signatures for analysed resumes, persisted as an append-only log."""
+
+    def __init__(self, path=DEDUP_INDEX_PATH):
+        self.path = path
+        self.entries = []  # (key, context, signature)
+        self.keys = set()
+        self.bands = {}  # (context, band, band bytes) -> entry ids
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        signature = np.frombuffer(bytes.fromhex(entry['signature']), dtype='<u4')
+                        self._insert(entry['key'], entry['context'], signature)
+        except OSError:
+            pass
+
+    def _band_keys(self, context, signature):
+        rows = NUM_PERMUTATIONS // LSH_BANDS
+        return [(context, band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(LSH_BANDS)]
+
+    def _insert(self, key, context, signature):
+        """Index an entry; False if the key is already indexed."""
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        entry_id = len(self.entries)
+        self.entries.append((key, context, signature))
+        for band_key in self._band_keys(context, signature):
+            self.bands.setdefault(band_key, []).append(entry_id)
+        return True
+
+    def find(self, signature, context, threshold=DUPLICATE_THRESHOLD):
+        """(key, similarity) of the closest earlier resume in the same context, or None."""
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = {entry_id for band_key in self._band_keys(context, signature)
+                          for entry_id in self.bands.get(band_key, ())}
+            best = None
+            for entry_id in candidates:
+                key, _, other = self.entries[entry_id]
+                similarity = signature_similarity(signature, other)
+                if similarity >= threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity)
+            return best
+
+    def add(self, key, signature, context):
+        """Remember the analysis a resume produced; keys already indexed are skipped."""
+        if signature is None:
+            return
+        with self._lock:
+            if not self._insert(key, context, signature):
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({
+                    'key': key,
+                    'context': context,
+                    'signature': signature.astype('<u4').tobytes().hex()
+                }) + '\n')
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def duplicate_index():
+    """Process-wide near-duplicate index."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = DuplicateIndex()
+    return _index
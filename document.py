@@ -0,0 +1,215 @@
+import re
+
+from layout import layout_key
+from text_features import scan_document
+
+#=================================================================================
+# Resume document model
+#
+# ResumeDocument wraps the extracted text once. Derived views (lowercased text,
+# lines, tokens, sentences, section index, bullets, date spans, scanned features)
+# are computed on first access and cached on the instance, so pipeline stages
+# sharing a document never re-split or re-lowercase the text.
+#=================================================================================
+BULLET_PATTERN = re.compile(r'^(?:[-•*]|\d+[\.\)])\s+')
+SENTENCE_SPLIT_PATTERN = re.compile(r'[.!?]+')
+
+# Sections every resume is expected to have (checked by the ATS report)
+STANDARD_SECTIONS = ('experience', 'education', 'skills')
+
+#=================================================================================
+# Section segmentation
+#
+# Header lines are recognised in one pass over the lines: a short line (or the
+# part before a colon) whose words are a known header phrase. Lines in capitals
+# or, for PDFs, in a heading font may also carry extra words ("TECHNICAL SKILLS
+# & TOOLS"). Each section runs from its header to the next one.
+#=================================================================================
+SECTION_HEADERS = {
+    'summary': ('summary', 'professional summary', 'career summary', 'profile',
+                'professional profile', 'objective', 'career objective', 'about me'),
+    'experience': ('experience', 'work experience', 'professional experience', 'relevant experience',
+                   'employment', 'employment history', 'work history', 'career history'),
+    'education': ('education', 'academic background', 'education and training', 'academics'),
+    'skills': ('skills', 'technical skills', 'core skills', 'key skills', 'skills and tools',
+               'core competencies', 'competencies', 'technologies', 'tech stack'),
+    'projects': ('projects', 'personal projects', 'academic projects', 'key projects', 'selected projects'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications',
+                       'courses and certifications', 'certifications and courses')
+}
+MAX_HEADER_CHARS = 40
+MAX_HEADER_WORDS = 5
+_HEADER_WORD = re.compile(r'[a-z]+')
+
+
+def _header_words(text):
+    return [word for word in _HEADER_WORD.findall(text.lower()) if word != 'and']
+
+
+_HEADER_LOOKUP = {
+    ' '.join(_header_words(phrase)): section
+    for section, phrases in SECTION_HEADERS.items()
+    for phrase in phrases
+}
+
+
+def header_section(line, emphasized=False):
+    """Section named by a header line, with the offset its content starts at, or None."""
+    head, colon, rest = line.partition(':')
+    stripped = head.strip()
+    if not stripped or len(stripped) > MAX_HEADER_CHARS or stripped[-1] in '.,;':
+        return None
+    words = _header_words(stripped)
+    if not words or len(words) > MAX_HEADER_WORDS:
+        return None
+    content_start = len(head) + 1 if colon and rest.strip() else len(line)
+
+    section = _HEADER_LOOKUP.get(' '.join(words))
+    if section is not None:
+        # Plain-case headers must start with a capital; wrapped sentence lines rarely do
+        if emphasized or colon or stripped[0].isupper():
+            return section, content_start
+        return None
+    if emphasized and len(words) > 1:
+        # Leading header phrase followed by extra words
+        section = _HEADER_LOOKUP.get(' '.join(words[:2])) or _HEADER_LOOKUP.get(words[0])
+        if section is not None:
+            return section, content_start
+    return None
+
+
+class ResumeDocument:
+    """Resume text with lazily computed, cached views."""
+
+    __slots__ = ('text', 'layout', '_lower', '_lines', '_tokens', '_sentences', '_sections',
+                 '_bullets', '_features')
+
+    def __init__(self, text, layout=None):
+        self.text = text
+        self.layout = layout  # PdfLayout when the text came from a PDF
+        self._lower = None
+        self._lines = None
+        self._tokens = None
+        self._sentences = None
+        self._sections = None
+        self._bullets = None
+        self._features = None
+
+    def __len__(self):
+        return len(self.text)
+
+    def __repr__(self):
+        return f"ResumeDocument({len(self.text)} chars)"
+
+    @property
+    def lower(self):
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def lines(self):
+        if self._lines is None:
+            self._lines = self.text.split('\n')
+        return self._lines
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+
+    @property
+    def sentences(self):
+        if self._sentences is None:
+            self._sentences = [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(self.text) if s.strip()]
+        return self._sentences
+
+    @property
+    def features(self):
+        """DocumentFeatures from a single scan of the text."""
+        if self._features is None:
+            self._features = scan_document(self.text)
+        return self._features
+
+    @property
+    def sections(self):
+        """Section index: section name -> list of (start, end) content spans."""
+        if self._sections is None:
+            self._sections = self._segment()
+        return self._sections
+
+    def _is_emphasized(self, line):
+        if any(c.isalpha() for c in line) and line.isupper():
+            return True
+        return self.layout is not None and layout_key(line) in self.layout.heading_lines
+
+    def _segment(self):
+        headers = []  # (section, header_start, content_start)
+        offset = 0
+        for line in self.lines:
+            stripped = line.strip()
+            if stripped:
+                found = header_section(line, self._is_emphasized(stripped))
+                if found is not None:
+                    headers.append((found[0], offset, offset + found[1]))
+            offset += len(line) + 1
+
+        sections = {}
+        for i, (section, _, content_start) in enumerate(headers):
+            end = headers[i + 1][1] if i + 1 < len(headers) else len(self.text)
+            sections.setdefault(section, []).append((min(content_start, end), end))
+        return sections
+
+    def section(self, name):
+        """Text of a section (all of its spans), or "" if the resume has no such header."""
+        return '\n'.join(self.text[start:end] for start, end in self.sections.get(name, ()))
+
+    @property
+    def bullets(self):
+        """Every bullet line with its marker removed, in document order."""
+        if self._bullets is None:
+            bullets = []
+            for line in self.lines:
+                line = line.strip()
+                marker = BULLET_PATTERN.match(line)
+                if marker:
+                    bullets.append(line[marker.end():])
+            self._bullets = bullets
+        return self._bullets
+
+    @property
+    def date_spans(self):
+        """(start, end) offsets of every date range in the text."""
+        return [(start, end) for _, _, start, end in self.features.date_ranges]
+
+    def date_ranges_in(self, name):
+        """Scanned date ranges inside a section; all of them if the section has no header."""
+        spans = self.sections.get(name)
+        if not spans:
+            return list(self.features.date_ranges)
+        return [date_range for date_range in self.features.date_ranges
+                if any(start <= date_range[2] < end for start, end in spans)]
+
+    def section_text(self, start_keyword, end_keyword, fallback_length=500):
+        """Text of the section headed by start_keyword.
+
+        Unrecognised keywords, or text without any detected headers, fall back to
+        the span between the first occurrences of the two keywords.
+        """
+        if start_keyword in self.sections:
+            return self.section(start_keyword)
+        if start_keyword in SECTION_HEADERS and self.sections:
+            return ""
+        start_idx = self.lower.find(start_keyword)
+        if start_idx == -1:
+            return ""
+        end_idx = self.lower.find(end_keyword, start_idx)
+        if end_idx != -1:
+            return self.text[start_idx:end_idx]
+        return self.text[start_idx:start_idx + fallback_length]
+
+
+def as_document(resume):
+    """Wrap raw text in a ResumeDocument; documents are returned unchanged."""
+    return resume if isinstance(resume, ResumeDocument) else ResumeDocument(resume)
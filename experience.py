@@ -0,0 +1,174 @@
+import re
+from datetime import date
+from functools import lru_cache
+
+#=================================================================================
+# Experience timeline
+#
+# Date ranges ("Jan 2019 - Present", "03/2017 – 06/2019", "2015 to 2018") are
+# found by the feature scanner with DATE_RANGE_REGEX. Each end point goes
+# through precompiled fast-path parsers first; only full dates ("15 Jan 2019")
+# reach dateparser, whose results are memoized. Ranges become month intervals,
+# overlapping intervals are merged into a timeline, and total tenure is the
+# length of the merged timeline, so concurrent roles are not double counted.
+#=================================================================================
+PRESENT_WORDS = ('present', 'current', 'now', 'today')
+MIN_YEAR = 1950
+
+MONTH_REGEX = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+# One end point. The month/year forms ("Jan 2019", "Sept. '19", "01/2019",
+# "2019-01", "2019") have fast paths; full dates ("15 Jan 2019", "2019-01-15")
+# are rare and go to dateparser.
+DATE_TOKEN_REGEX = (
+    r"(?:\d{1,2}\s+" + MONTH_REGEX + r",?\s+\d{4}"
+    r"|" + MONTH_REGEX + r"\s+\d{1,2},\s+\d{4}"
+    r"|" + MONTH_REGEX + r",?\s+(?:\d{4}|'\d{2})"
+    r"|\d{4}-\d{1,2}-\d{1,2}"
+    r"|\d{1,2}[./]\d{1,2}[./]\d{4}"
+    r"|\d{1,2}/\d{4}"
+    r"|\d{4}[/-]\d{1,2}(?![\d/-])"
+    r"|\d{4})"
+)
+DATE_RANGE_REGEX = (
+    r"(?<![\w/])(?P<range_start>" + DATE_TOKEN_REGEX + r")"
+    r"\s*(?:-|–|—|to|until|till)\s*"
+    r"(?P<range_end>" + '|'.join(PRESENT_WORDS) + r"|" + DATE_TOKEN_REGEX + r")(?![\w/])"
+)
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+_MONTH_YEAR = re.compile(r"([a-z]{3,9})\.?,?\s+(?:(\d{4})|'(\d{2}))$")
+_NUMERIC_MONTH_YEAR = re.compile(r'(\d{1,2})/(\d{4})$')
+_YEAR_MONTH = re.compile(r'(\d{4})[/-](\d{1,2})$')
+_YEAR = re.compile(r'(\d{4})$')
+_TITLE_STRIP = ' \t|,;:-–—@()'
+
+
+@lru_cache(maxsize=1024)
+def _dateparser_fallback(token):
+    """(year, month) from dateparser for tokens the fast paths do not cover."""
+    import dateparser
+
+    parsed = dateparser.parse(token, settings={'REQUIRE_PARTS': ['month', 'year'],
+                                               'PREFER_DATES_FROM': 'past'})
+    if parsed is None:
+        return None
+    return parsed.year, parsed.month
+
+
+def parse_date_token(token):
+    """(year, month) for a date token; month is None when only the year is known."""
+    token = token.strip().lower()
+
+    match = _YEAR.match(token)
+    if match:
+        return int(match.group(1)), None
+    match = _NUMERIC_MONTH_YEAR.match(token)
+    if match:
+        return int(match.group(2)), int(match.group(1))
+    match = _YEAR_MONTH.match(token)
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    match = _MONTH_YEAR.match(token)
+    if match and match.group(1)[:3] in MONTHS:
+        if match.group(2):
+            year = int(match.group(2))
+        else:
+            # Two-digit years: '98 is 1998, '19 is 2019
+            short = int(match.group(3))
+            year = 2000 + short if short <= date.today().year % 100 else 1900 + short
+        return year, MONTHS[match.group(1)[:3]]
+    return _dateparser_fallback(token)
+
+
+def _month_index(year, month):
+    return year * 12 + month - 1
+
+
+def _format_month(index):
+    return date(index // 12, index % 12 + 1, 1).strftime('%b %Y')
+
+
+def date_range_months(start_token, end_token, today=None):
+    """Inclusive (start, end) month indexes for a date range, or None if invalid.
+
+    Year-only starts count from January and year-only ends run to December
+    (capped at the current month).
+    """
+    today = today or date.today()
+    now = _month_index(today.year, today.month)
+
+    start = parse_date_token(start_token)
+    if start is None or start[0] < MIN_YEAR or not 1 <= (start[1] or 1) <= 12:
+        return None
+    if end_token.strip().lower() in PRESENT_WORDS:
+        end_index = now
+    else:
+        end = parse_date_token(end_token)
+        if end is None or not 1 <= (end[1] or 12) <= 12:
+            return None
+        end_index = min(_month_index(end[0], end[1] or 12), now)
+    start_index = _month_index(start[0], start[1] or 1)
+
+    if start_index > end_index:
+        return None
+    return start_index, end_index
+
+
+def merge_intervals(intervals):
+    """Merge overlapping or adjacent inclusive (start, end) intervals."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _role_title(text, span_start, span_end):
+    """The line holding a date range without the dates, or the line above it."""
+    line_start = text.rfind('\n', 0, span_start) + 1
+    line_end = text.find('\n', span_end)
+    line_end = len(text) if line_end == -1 else line_end
+    title = (text[line_start:span_start] + ' ' + text[span_end:line_end]).strip(_TITLE_STRIP)
+    title = ' '.join(title.split())
+    if title or line_start == 0:
+        return title
+    previous = text[:line_start - 1].rstrip().rsplit('\n', 1)[-1]
+    return ' '.join(previous.split()).strip(_TITLE_STRIP)
+
+
+def build_timeline(text, date_ranges, today=None):
+    """Roles and merged timeline from scanned date ranges.
+
+    date_ranges holds (start_text, end_text, span_start, span_end) tuples as
+    collected by the feature scanner.
+    """
+    roles = []
+    for start_text, end_text, span_start, span_end in date_ranges:
+        months = date_range_months(start_text, end_text, today)
+        if months is None:
+            continue
+        start, end = months
+        current = end_text.strip().lower() in PRESENT_WORDS
+        roles.append({
+            'title': _role_title(text, span_start, span_end),
+            'start': _format_month(start),
+            'end': 'Present' if current else _format_month(end),
+            'months': end - start + 1,
+            'current': current,
+            'interval': months
+        })
+
+    timeline = merge_intervals(role['interval'] for role in roles)
+    return {
+        'roles': roles,
+        'timeline': timeline,
+        'total_months': sum(end - start + 1 for start, end in timeline)
+    }
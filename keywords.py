@@ -0,0 +1,256 @@
+import json
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from taxonomy import normalize_term
+
+#=================================================================================
+# Job description keywords
+#
+# Distinctive JD terms (words and two-word phrases) are ranked by TF-IDF. The IDF
+# side is a table of document frequencies over our JD corpus, indexed by a hash
+# of the term rather than by a vocabulary, so it is one fixed-size uint32 array
+# that new JDs update in place. Terms that are catalog skills are left to skill
+# matching; the rest surface requirements the catalog does not know about.
+#
+# Each new JD is appended to a log as its digest and bucket list, and every
+# process replays the lines it has not seen yet, so the app and batch runs add
+# to the same table. The .npz snapshot is rewritten every COMPACT_EVERY new
+# JDs; it records how far into the log it reaches.
+#=================================================================================
+IDF_FORMAT_VERSION = 1
+IDF_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses", "jd_idf.npz")
+IDF_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses", "jd_idf.jsonl")
+COMPACT_EVERY = 100
+HASH_BUCKETS = 1 << 18
+MAX_KEYWORDS = 15
+MIN_TERM_CHARS = 3
+
+_CLAUSE_SPLIT = re.compile(r'[\n,;:!?()\[\]•|]|\.(?:\s|$)')
+_TERM_TOKEN = re.compile(r'[a-z][a-z0-9\+\#]*(?:[\.\-/][a-z0-9\+\#]+)*')
+
+
+# NLTK's English list, used when its stopwords corpus is not installed
+FALLBACK_STOPWORDS = frozenset("""
+i me my myself we our ours ourselves you you're you've you'll you'd your yours yourself yourselves
+he him his himself she she's her hers herself it it's its itself they them their theirs themselves
+what which who whom this that that'll these those am is are was were be been being have has had
+having do does did doing a an the and but if or because as until while of at by for with about
+against between into through during before after above below to from up down in out on off over
+under again further then once here there when where why how all any both each few more most other
+some such no nor not only own same so than too very s t can will just don don't should should've
+now d ll m o re ve y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn
+hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't shan shan't shouldn
+shouldn't wasn wasn't weren weren't won won't wouldn wouldn't
+""".split())
+
+_stopword_set = None
+_stopword_lock = threading.Lock()
+
+
+def stopword_set():
+    """English stopwords from the NLTK corpus, loaded on first use; the bundled list if it is missing."""
+    global _stopword_set
+    if _stopword_set is None:
+        with _stopword_lock:
+            if _stopword_set is None:
+                try:
+                    from nltk.corpus import stopwords
+                    _stopword_set = frozenset(stopwords.words('english'))
+                except (ImportError, LookupError, OSError):
+                    _stopword_set = FALLBACK_STOPWORDS
+    return _stopword_set
+
+
+def extract_terms(text):
+    """Candidate keywords of a text, in order: content words and two-word phrases."""
+    stopwords = stopword_set()
+    terms = []
+    for clause in _CLAUSE_SPLIT.split(text.lower()):
+        previous = None
+        for word in _TERM_TOKEN.findall(clause):
+            if word in stopwords:
+                previous = None
+                continue
+            # Short words ("ml", "ci") only count inside phrases
+            if len(word) >= MIN_TERM_CHARS:
+                terms.append(word)
+            if previous:
+                terms.append(f"{previous} {word}")
+            previous = word
+    return terms
+
+
+def term_buckets(terms):
+    """Hash buckets of terms in the IDF table."""
+    return np.fromiter((zlib.crc32(term.encode('utf-8')) % HASH_BUCKETS for term in terms),
+                       dtype=np.int64, count=len(terms))
+
+
+def _text_digest(text):
+    return zlib.crc32(' '.join(text.split()).encode('utf-8'))
+
+
+class IdfTable:
+    """Document frequencies of hashed JD terms, updated incrementally through an append-only log."""
+
+    def __init__(self, path=IDF_TABLE_PATH, log_path=IDF_LOG_PATH):
+        self.path = path
+        self.log_path = log_path
+        self.document_frequency = np.zeros(HASH_BUCKETS, dtype=np.uint32)
+        self.documents = 0
+        self.seen = set()  # digests of JDs already counted
+        self._log_offset = 0  # bytes of the log applied
+        self._unsaved = 0  # JDs applied since the snapshot was written
+        self._lock = threading.Lock()
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if meta['format_version'] == IDF_FORMAT_VERSION and meta['buckets'] == HASH_BUCKETS:
+                    self.document_frequency = data['document_frequency'].copy()
+                    self.documents = meta['documents']
+                    self.seen = set(data['seen'].tolist())
+                    self._log_offset = meta.get('log_offset', 0)
+        except (OSError, KeyError, ValueError):
+            pass
+        self._catch_up()
+
+    def _apply(self, digest, buckets):
+        if digest in self.seen:
+            return
+        self.seen.add(digest)
+        self.document_frequency[np.asarray(buckets, dtype=np.int64)] += 1
+        self.documents += 1
+        self._unsaved += 1
+
+    def _catch_up(self):
+        """Apply the complete log lines appended since the last read, by any process."""
+        try:
+            size = os.path.getsize(self.log_path)
+        except OSError:
+            return
+        if size < self._log_offset:
+            # The log was replaced; replaying it again is safe because digests are deduplicated
+            self._log_offset = 0
+        if size == self._log_offset:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            try:
+                entry = json.loads(line)
+                self._apply(entry['digest'], entry['buckets'])
+            except (ValueError, KeyError, IndexError):
+                continue
+        self._log_offset += complete
+
+    def idf(self, buckets):
+        """Smoothed inverse document frequency of hashed terms."""
+        with self._lock:
+            self._catch_up()
+            return np.log((self.documents + 1) / (self.document_frequency[buckets] + 1.0)) + 1.0
+
+    def add_document(self, text):
+        """Count a JD's terms once; JDs already counted are ignored. Returns True if it was new."""
+        digest = _text_digest(text)
+        buckets = np.unique(term_buckets(extract_terms(text)))
+        line = json.dumps({'digest': digest, 'buckets': buckets.tolist()}) + '\n'
+        with self._lock:
+            self._catch_up()
+            if digest in self.seen:
+                return False
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            # One write per line, so concurrent appends from other processes do not interleave
+            fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+            self._catch_up()
+            if self._unsaved >= COMPACT_EVERY:
+                self._save()
+            return True
+
+    def save(self):
+        """Write the snapshot now instead of after COMPACT_EVERY new JDs."""
+        with self._lock:
+            self._catch_up()
+            self._save()
+
+    def _save(self):
+        meta = {'format_version': IDF_FORMAT_VERSION, 'buckets': HASH_BUCKETS, 'documents': self.documents,
+                'log_offset': self._log_offset}
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(
+                f,
+                meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8),
+                document_frequency=self.document_frequency,
+                seen=np.array(sorted(self.seen), dtype=np.uint32)
+            )
+        os.replace(tmp_path, self.path)
+        self._unsaved = 0
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def idf_table():
+    """Process-wide JD IDF table."""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                _table = IdfTable()
+    return _table
+
+
+def extract_jd_keywords(job_description, taxonomy, limit=MAX_KEYWORDS):
+    """Top distinctive JD terms that are not catalog skills: [(term, weight)], best first."""
+    terms = extract_terms(job_description)
+    if not terms:
+        return []
+    vocabulary, first_seen, counts = np.unique(np.array(terms), return_index=True, return_counts=True)
+    weights = (1.0 + np.log(counts)) * idf_table().idf(term_buckets(vocabulary))
+    # Ties go to the term mentioned first
+    order = np.lexsort((first_seen, -weights))
+    keywords = []
+    for index in order:
+        term = str(vocabulary[index])
+        if any(normalize_term(part) in taxonomy.aliases for part in [term] + term.split()):
+            continue
+        # A phrase already listed covers its words, and vice versa
+        if any(term in kept.split() or kept in term.split() for kept, _ in keywords):
+            continue
+        keywords.append((term, round(float(weights[index]), 3)))
+        if len(keywords) == limit:
+            break
+    return keywords
+
+
+def keyword_coverage(jd_keywords, resume_text):
+    """JD keywords with whether the resume mentions them: [{'term', 'weight', 'found'}]."""
+    resume_terms = set(extract_terms(resume_text))
+    return [{'term': term, 'weight': weight, 'found': term in resume_terms} for term, weight in jd_keywords]
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 3 or sys.argv[1] != "build":
+        sys.exit("Usage: python keywords.py build <job description .txt files>")
+    table = idf_table()
+    added = 0
+    for path in sys.argv[2:]:
+        with open(path, encoding='utf-8') as f:
+            added += table.add_document(f.read())
+    table.save()
+    print(f"Added {added} job descriptions; the table now covers {table.documents}")
@@ -0,0 +1,182 @@
+import time
+from collections import Counter
+
+#=================================================================================
+# PDF layout analysis
+#
+# While the text is extracted, PyMuPDF also reports every block, line and span
+# with its position, font size and flags. PdfLayout reads those dictionaries in
+# the same pass: it keeps one small record per line so the section segmenter
+# can tell a heading set in a larger or bold font from the same word used in a
+# sentence, and it counts the layout features ATS parsers handle badly
+# (columns, tables, text in images, headers/footers, non-embedded fonts).
+# Only the first MAX_LAYOUT_PAGES pages are analysed, within a time budget.
+#=================================================================================
+HEADING_SIZE_RATIO = 1.15
+BOLD_FLAG = 16  # PyMuPDF span flag bit 4
+MAX_LAYOUT_PAGES = 5
+LAYOUT_TIME_BUDGET = 2.0  # seconds
+MARGIN_BAND = 0.06  # top/bottom fraction of the page treated as header/footer
+MIN_COLUMN_LINES = 6
+MIN_TABLE_ROWS = 3
+IMAGE_AREA_RATIO = 0.25
+# Standard PDF fonts every reader provides; not embedding them is harmless
+BASE_FONTS = ('courier', 'helvetica', 'times', 'symbol', 'zapfdingbats', 'arial')
+
+
+def layout_key(line):
+    """Lowercased, whitespace-collapsed line used to match PDF lines to extracted text."""
+    return ' '.join(line.lower().split())
+
+
+def _overlaps(a, b):
+    """Whether two (top, bottom) ranges overlap vertically."""
+    return a[0] < b[1] and b[0] < a[1]
+
+
+class PdfLayout:
+    """Line styles and ATS-relevant layout features from PyMuPDF text dictionaries."""
+
+    __slots__ = ('line_styles', 'size_chars', 'pages', 'truncated', 'column_pages', 'table_pages',
+                 'image_text_pages', 'margin_lines', 'contact_in_margins', 'non_embedded_fonts',
+                 'max_pages', 'deadline', '_margin_keys', '_heading_lines')
+
+    def __init__(self, max_pages=MAX_LAYOUT_PAGES, time_budget=LAYOUT_TIME_BUDGET):
+        self.line_styles = []  # (layout_key, font_size, is_bold)
+        self.size_chars = Counter()  # font size -> characters set in it
+        self.pages = 0
+        self.truncated = False  # page cap or time budget reached
+        self.column_pages = 0
+        self.table_pages = 0
+        self.image_text_pages = 0
+        self.margin_lines = 0
+        self.contact_in_margins = False
+        self.non_embedded_fonts = set()
+        self.max_pages = max_pages
+        self.deadline = time.monotonic() + time_budget
+        self._margin_keys = Counter()  # margin line -> pages it appears on
+        self._heading_lines = None
+
+    def wants_page(self):
+        """Whether another page fits in the page cap and time budget."""
+        if self.pages >= self.max_pages or time.monotonic() >= self.deadline:
+            self.truncated = True
+            return False
+        return True
+
+    def add_page(self, page_dict, fonts=()):
+        """Analyse one page from page.get_text("dict") and page.get_fonts()."""
+        width = page_dict.get('width') or 1
+        height = page_dict.get('height') or 1
+        top_band, bottom_band = height * MARGIN_BAND, height * (1 - MARGIN_BAND)
+        left_blocks = []  # (top, bottom) of text blocks in the left half
+        right_blocks = []  # (top, bottom, line count) of text blocks starting in the right half
+        rows = Counter()  # baseline -> text blocks with a line on it
+        image_area = 0
+        chars = 0
+        page_margin_keys = set()
+
+        for block in page_dict.get('blocks', ()):
+            x0, y0, x1, y1 = block.get('bbox', (0, 0, 0, 0))
+            if block.get('type') == 1:
+                image_area += (x1 - x0) * (y1 - y0)
+                continue
+            block_lines = 0
+            baselines = set()
+            for line in block.get('lines', ()):
+                spans = [span for span in line.get('spans', ()) if span['text'].strip()]
+                if not spans:
+                    continue
+                text = ''.join(span['text'] for span in spans)
+                key = layout_key(text)
+                size = max(span['size'] for span in spans)
+                bold = all(span['flags'] & BOLD_FLAG for span in spans)
+                self.line_styles.append((key, size, bold))
+                for span in spans:
+                    self.size_chars[round(span['size'], 1)] += len(span['text'])
+                chars += len(text)
+                block_lines += 1
+                baselines.add(round(line['bbox'][3]))
+
+                line_top, line_bottom = line['bbox'][1], line['bbox'][3]
+                if line_bottom <= top_band or line_top >= bottom_band:
+                    self.margin_lines += 1
+                    page_margin_keys.add(key)
+                    if '@' in key or sum(c.isdigit() for c in key) >= 7:
+                        self.contact_in_margins = True
+
+            if not block_lines:
+                continue
+            for baseline in baselines:
+                rows[baseline] += 1
+            if x0 >= width * 0.45:
+                right_blocks.append((y0, y1, block_lines))
+            elif x1 <= width * 0.55:
+                left_blocks.append((y0, y1))
+
+        # Multi-line blocks on the right running alongside left-hand text; single
+        # right-aligned lines (dates next to a job title) do not count
+        column_lines = sum(
+            lines for top, bottom, lines in right_blocks
+            if lines > 1 and any(_overlaps((top, bottom), left) for left in left_blocks)
+        )
+        if column_lines >= MIN_COLUMN_LINES:
+            self.column_pages += 1
+        if sum(1 for count in rows.values() if count >= 3) >= MIN_TABLE_ROWS:
+            self.table_pages += 1
+        if image_area and (image_area >= width * height * IMAGE_AREA_RATIO or chars < 100):
+            self.image_text_pages += 1
+        self._margin_keys.update(page_margin_keys)
+
+        for font in fonts:
+            # (xref, ext, type, basefont, name, encoding); ext "n/a" means not embedded
+            basefont = font[3].split('+')[-1]
+            if font[1] == 'n/a' and not basefont.lower().startswith(BASE_FONTS):
+                self.non_embedded_fonts.add(basefont)
+
+        self.pages += 1
+        self._heading_lines = None
+
+    @property
+    def repeated_margin_lines(self):
+        """Header/footer lines repeated on more than one page."""
+        return [key for key, pages in self._margin_keys.items() if pages > 1]
+
+    @property
+    def body_font_size(self):
+        """Font size covering the most characters."""
+        if not self.size_chars:
+            return 0
+        return self.size_chars.most_common(1)[0][0]
+
+    @property
+    def heading_lines(self):
+        """Keys of lines set larger than the body text or entirely in bold."""
+        if self._heading_lines is None:
+            threshold = self.body_font_size * HEADING_SIZE_RATIO
+            self._heading_lines = {
+                key for key, size, bold in self.line_styles
+                if bold or (threshold and size >= threshold)
+            }
+        return self._heading_lines
+
+    def ats_issues(self):
+        """(issue, recommendation) pairs for layout features ATS parsers mishandle."""
+        issues = []
+        if self.column_pages:
+            issues.append(("Multi-column layout detected",
+                           "Use a single-column layout so ATS parsers read sections in order"))
+        if self.table_pages:
+            issues.append(("Tables detected",
+                           "Replace tables with plain lines of text"))
+        if self.image_text_pages:
+            issues.append(("Text may be embedded in images",
+                           "Make sure all content is selectable text, not images"))
+        if self.contact_in_margins or self.repeated_margin_lines:
+            issues.append(("Content in page headers/footers",
+                           "Move contact details and other content out of headers and footers"))
+        if self.non_embedded_fonts:
+            fonts = ', '.join(sorted(self.non_embedded_fonts)[:3])
+            issues.append((f"Fonts not embedded ({fonts})",
+                           "Export the PDF with fonts embedded or use a standard font"))
+        return issues
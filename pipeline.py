@@ -0,0 +1,409 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from utils import (
+    extract_pdf_with_layout,
+    advanced_text_cleaning,
+    extract_skills_by_category,
+    extract_skill_matches,
+    skills_from_matches,
+    skill_highlight_spans,
+    calculate_match_score,
+    semantic_similarity_matrix,
+    semantic_matches_at,
+    chunk_vectors,
+    evidence_sentences,
+    sentence_vectors,
+    skill_evidence,
+    calculate_weighted_score,
+    generate_optimization_suggestions,
+    check_ats_compatibility,
+    extract_experience_info,
+    generate_visualization_data,
+    ai_rewrite_bullet_points,
+    generate_interview_questions
+)
+from document import ResumeDocument
+from text_features import normalize_text
+from vector_store import chunk_document
+from keywords import extract_jd_keywords, keyword_coverage
+
+#=================================================================================
+# Stage dependency graph
+#
+# The analysis is a DAG of stages over named values. Every value carries a
+# content key: sources are hashed, and a stage's outputs are keyed by the stage
+# name plus the keys of its inputs. A stage re-runs only when one of those keys
+# changes, so editing one input recomputes just the stages downstream of it.
+#=================================================================================
+MEMO_ENTRIES_PER_STAGE = 4
+DEFAULT_STAGE_TIMEOUT = 60
+MODEL_STAGE_TIMEOUT = 120
+# How often queued stages are checked for having started, so their timeouts run from then
+QUEUE_POLL_SECONDS = 0.05
+# Stages whose failure leaves nothing meaningful to show
+CORE_STAGES = ['extract', 'clean_resume', 'clean_jd', 'resume_skills', 'resume_skill_names',
+               'jd_skills', 'score', 'weighted']
+
+
+def fingerprint(value):
+    """Content key for a source value."""
+    if isinstance(value, bytes):
+        data = value
+    elif isinstance(value, str):
+        data = value.encode('utf-8')
+    elif hasattr(value, 'fingerprint'):
+        data = value.fingerprint().encode('utf-8')
+    else:
+        data = json.dumps(value, sort_keys=True, default=repr).encode('utf-8')
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _combine(*parts):
+    return hashlib.blake2b('\x1f'.join(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class Stage:
+    """A pipeline step: func(*inputs) -> outputs (a tuple when there are several).
+
+    lane selects the executor thread pool ("cpu" or "model"); timeout is in seconds,
+    counted from when the stage starts running, not while it waits for its lane.
+    """
+
+    def __init__(self, name, func, inputs, outputs=None, lane="cpu", timeout=DEFAULT_STAGE_TIMEOUT):
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs) if outputs else (name,)
+        self.lane = lane
+        self.timeout = timeout
+
+
+class StageExecutor:
+    """Thread pools for independent stages, with model-bound stages on their own lane.
+
+    A running stage cannot be interrupted, so when one times out its lane gets a
+    fresh pool (retire_worker) and later stages do not queue behind it; the
+    abandoned thread finishes the stage in the background and is then released.
+    """
+
+    def __init__(self, max_workers=4, model_workers=1):
+        self.workers = {'cpu': max_workers, 'model': model_workers}
+        self.lanes = {lane: self._pool(lane) for lane in self.workers}
+        self._lock = threading.Lock()
+
+    def _pool(self, lane):
+        prefix = "model" if lane == 'model' else "stage"
+        return ThreadPoolExecutor(max_workers=self.workers[lane], thread_name_prefix=prefix)
+
+    def submit(self, stage, args, started=None):
+        """Run a stage; the time it starts running is appended to the started list, if given."""
+        def call():
+            if started is not None:
+                started.append(time.monotonic())
+            return stage.func(*args)
+        return self.lanes[stage.lane].submit(call)
+
+    def submit_task(self, lane, func, *args):
+        """Run func(*args) on a lane outside any pipeline run, e.g. background indexing."""
+        return self.lanes[lane].submit(func, *args)
+
+    def retire_worker(self, lane):
+        """Move a lane to a fresh pool, leaving the old one to its stuck stage and queued work."""
+        with self._lock:
+            retired = self.lanes[lane]
+            self.lanes[lane] = self._pool(lane)
+        retired.shutdown(wait=False)
+
+    def shutdown(self, wait=True):
+        for lane in self.lanes.values():
+            lane.shutdown(wait=wait)
+
+
+class PipelineRun:
+    """Values produced by one Pipeline.run call.
+
+    recomputed lists the stages that actually executed; errors maps failed or
+    skipped stages to their exception.
+    """
+
+    def __init__(self, values, recomputed, errors=None):
+        self.values = values
+        self.recomputed = recomputed
+        self.errors = errors or {}
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+class Pipeline:
+    """A DAG of stages with a content-keyed memo per stage."""
+
+    def __init__(self, stages):
+        self.stages = OrderedDict()
+        self.producers = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage: {stage.name}")
+            self.stages[stage.name] = stage
+            for output in stage.outputs:
+                if output in self.producers:
+                    raise ValueError(f"Value {output} is produced by more than one stage")
+                self.producers[output] = stage
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        order = []
+        state = {}
+
+        def visit(stage):
+            if state.get(stage.name) == 'done':
+                return
+            if state.get(stage.name) == 'visiting':
+                raise ValueError(f"Cycle through stage: {stage.name}")
+            state[stage.name] = 'visiting'
+            for name in stage.inputs:
+                if name in self.producers:
+                    visit(self.producers[name])
+            state[stage.name] = 'done'
+            order.append(stage)
+
+        for stage in self.stages.values():
+            visit(stage)
+        return order
+
+    def required_stages(self, targets=None):
+        """Stages needed to produce the target values, in execution order."""
+        if targets is None:
+            return list(self.order)
+        needed = set()
+        pending = list(targets)
+        while pending:
+            name = pending.pop()
+            stage = self.producers.get(name)
+            if stage is not None and stage.name not in needed:
+                needed.add(stage.name)
+                pending.extend(stage.inputs)
+        return [stage for stage in self.order if stage.name in needed]
+
+    def stage_key(self, stage, keys):
+        return _combine(stage.name, *(keys[name] for name in stage.inputs))
+
+    def run(self, sources, memo=None, targets=None, executor=None, on_stage=None):
+        """Compute the target values (all values by default), reusing memoized stages.
+
+        memo is a dict owned by the caller (e.g. per user session) and is updated in
+        place. With an executor, stages whose inputs are ready run concurrently. A
+        failing or timed-out stage is recorded in run.errors and only the stages
+        that depend on it are skipped. on_stage(stage, values, errors) is called on
+        the calling thread each time a stage finishes, fails or is skipped, so
+        results can be shown while later stages are still running.
+        """
+        memo = {} if memo is None else memo
+        values = dict(sources)
+        keys = {name: fingerprint(value) for name, value in sources.items()}
+        recomputed = []
+        errors = {}
+
+        pending = self.required_stages(targets)
+        for stage in pending:
+            missing = [name for name in stage.inputs if name not in keys and name not in self.producers]
+            if missing:
+                raise KeyError(f"Stage {stage.name} is missing inputs: {', '.join(missing)}")
+
+        running = {}  # future -> (stage, key, start times: empty until it runs)
+        finished = set()
+
+        def notify(stage):
+            if on_stage is not None:
+                on_stage(stage, values, errors)
+
+        def fail(stage, error):
+            errors[stage.name] = error
+            notify(stage)
+
+        def complete(stage, key, outputs):
+            for name, value in zip(stage.outputs, outputs):
+                values[name] = value
+                keys[name] = _combine(key, name)
+            finished.add(stage.name)
+            notify(stage)
+
+        def store(stage, key, result):
+            outputs = result if len(stage.outputs) > 1 else (result,)
+            stage_memo = memo.setdefault(stage.name, OrderedDict())
+            stage_memo[key] = outputs
+            while len(stage_memo) > MEMO_ENTRIES_PER_STAGE:
+                stage_memo.popitem(last=False)
+            recomputed.append(stage.name)
+            complete(stage, key, outputs)
+
+        while pending or running:
+            progressed = False
+            for stage in list(pending):
+                upstream = [self.producers[name].name for name in stage.inputs if name in self.producers]
+                failed = [name for name in upstream if name in errors]
+                if failed:
+                    pending.remove(stage)
+                    fail(stage, RuntimeError(f"Skipped because {failed[0]} failed"))
+                    progressed = True
+                    continue
+                if not all(name in finished for name in upstream):
+                    continue
+
+                pending.remove(stage)
+                progressed = True
+                key = self.stage_key(stage, keys)
+                stage_memo = memo.get(stage.name)
+                if stage_memo is not None and key in stage_memo:
+                    stage_memo.move_to_end(key)
+                    complete(stage, key, stage_memo[key])
+                    continue
+
+                args = [values[name] for name in stage.inputs]
+                if executor is None:
+                    try:
+                        result = stage.func(*args)
+                    except Exception as e:
+                        fail(stage, e)
+                    else:
+                        store(stage, key, result)
+                else:
+                    started = []
+                    running[executor.submit(stage, args, started)] = (stage, key, started)
+
+            if progressed:
+                continue
+            if not running:
+                raise RuntimeError(f"Stages cannot be scheduled: {', '.join(s.name for s in pending)}")
+
+            timed = [(stage, started) for stage, _, started in running.values() if stage.timeout]
+            deadlines = [started[0] + stage.timeout for stage, started in timed if started]
+            timeout = max(0, min(deadlines) - time.monotonic()) if deadlines else None
+            if len(deadlines) < len(timed):
+                timeout = QUEUE_POLL_SECONDS if timeout is None else min(timeout, QUEUE_POLL_SECONDS)
+            done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                stage, key, _ = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    fail(stage, e)
+                else:
+                    store(stage, key, result)
+
+            now = time.monotonic()
+            for future, (stage, key, started) in list(running.items()):
+                if stage.timeout and started and now >= started[0] + stage.timeout and not future.done():
+                    del running[future]
+                    fail(stage, TimeoutError(f"{stage.name} exceeded {stage.timeout}s"))
+                    # The stage keeps running; later stages of its lane get a fresh worker
+                    executor.retire_worker(stage.lane)
+                    for queued, (other, other_key, other_started) in list(running.items()):
+                        if other.lane == stage.lane and queued.cancel():
+                            del running[queued]
+                            running[executor.submit(other, [values[name] for name in other.inputs],
+                                                    other_started)] = (other, other_key, other_started)
+
+        return PipelineRun(values, recomputed, errors)
+
+#=================================================================================
+# Resume analysis stages
+#=================================================================================
+def extract_pdf_bytes(pdf_bytes):
+    """Extract resume text and layout cues from an uploaded PDF held in memory."""
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(pdf_bytes)
+        return extract_pdf_with_layout(pdf_path)
+    finally:
+        os.remove(pdf_path)
+
+
+def select_weighted_score(details, job_title, taxonomy, basic_score, enable_weighted):
+    """Smart score when enabled, otherwise the basic score."""
+    if enable_weighted:
+        return calculate_weighted_score(details, job_title, taxonomy)
+    return basic_score
+
+
+def embed_sentences(resume_sentences, enable_semantic):
+    """Sentence embeddings for skill evidence, or None when AI matching is turned off."""
+    return sentence_vectors(resume_sentences) if enable_semantic else None
+
+
+def select_skill_evidence(jd_skills, resume_sentences, vectors, taxonomy):
+    """Skill evidence, or None without sentence embeddings."""
+    if vectors is None:
+        return None
+    return skill_evidence(jd_skills, resume_sentences, vectors, taxonomy)
+
+
+def top_missing_skills(details):
+    """Missing skills to target in rewrites: top 3 per category, 5 overall."""
+    missing_skills = []
+    for cat in details.values():
+        missing_skills.extend(cat['missing'][:3])
+    return missing_skills[:5]
+
+
+def build_analysis_pipeline():
+    """Resume analysis DAG.
+
+    Sources: pdf_bytes, job_description, taxonomy, job_title, semantic_threshold,
+    enable_weighted, enable_semantic.
+    """
+    return Pipeline([
+        Stage('extract', extract_pdf_bytes, ['pdf_bytes'], ['resume_text', 'pdf_layout']),
+        Stage('document', ResumeDocument, ['resume_text', 'pdf_layout'], ['resume_document']),
+        Stage('clean_resume', normalize_text, ['resume_text'], ['resume_text_cleaned', 'resume_offsets']),
+        Stage('clean_jd', advanced_text_cleaning, ['job_description'], ['jd_text_cleaned']),
+        Stage('resume_skills', extract_skill_matches, ['resume_text_cleaned', 'taxonomy'], ['resume_matches']),
+        Stage('resume_skill_names', skills_from_matches, ['resume_matches'], ['resume_skills']),
+        Stage('skill_highlights', skill_highlight_spans, ['resume_matches', 'resume_offsets'], ['skill_highlights']),
+        Stage('jd_skills', extract_skills_by_category, ['jd_text_cleaned', 'taxonomy'], ['jd_skills']),
+        Stage('score', calculate_match_score, ['resume_skills', 'jd_skills'], ['basic_score', 'details']),
+        Stage('semantic_similarity', semantic_similarity_matrix,
+              ['resume_skills', 'jd_skills', 'taxonomy'], ['skill_similarity'],
+              lane='model', timeout=MODEL_STAGE_TIMEOUT),
+        Stage('semantic', semantic_matches_at, ['skill_similarity', 'semantic_threshold'], ['semantic_matches']),
+        Stage('weighted', select_weighted_score,
+              ['details', 'job_title', 'taxonomy', 'basic_score', 'enable_weighted'], ['weighted_score']),
+        Stage('jd_keywords', extract_jd_keywords, ['job_description', 'taxonomy'], ['jd_keywords']),
+        Stage('keyword_coverage', keyword_coverage, ['jd_keywords', 'resume_text'], ['keyword_coverage']),
+        Stage('suggestions', generate_optimization_suggestions,
+              ['details', 'weighted_score', 'resume_document', 'keyword_coverage', 'skill_evidence'],
+              ['suggestions']),
+        Stage('ats', lambda resume_document: check_ats_compatibility(resume_document, None),
+              ['resume_document'], ['ats_results']),
+        Stage('experience', extract_experience_info, ['resume_document'], ['experience_info']),
+        Stage('visualization', generate_visualization_data,
+              ['resume_skills', 'jd_skills', 'details'], ['viz_data']),
+        Stage('missing_skills', top_missing_skills, ['details'], ['missing_skills']),
+        Stage('rewriter', ai_rewrite_bullet_points,
+              ['resume_document', 'job_description', 'missing_skills'], ['rewritten_bullets']),
+        Stage('chunks', chunk_document, ['resume_document'], ['resume_chunks']),
+        Stage('chunk_vectors', chunk_vectors, ['resume_chunks'], ['chunk_vectors'],
+              lane='model', timeout=MODEL_STAGE_TIMEOUT),
+        Stage('sentences', evidence_sentences, ['resume_document'], ['resume_sentences']),
+        Stage('sentence_vectors', embed_sentences, ['resume_sentences', 'enable_semantic'], ['sentence_vectors'],
+              lane='model', timeout=MODEL_STAGE_TIMEOUT),
+        Stage('evidence', select_skill_evidence,
+              ['jd_skills', 'resume_sentences', 'sentence_vectors', 'taxonomy'],
+              ['skill_evidence'], lane='model', timeout=MODEL_STAGE_TIMEOUT),
+        Stage('interview', generate_interview_questions,
+              ['resume_document', 'resume_skills', 'jd_skills', 'details', 'experience_info', 'skill_evidence',
+               'taxonomy'],
+              ['interview_questions'])
+    ])
@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import threading
+
+from taxonomy import DEFAULT_TAXONOMY, load_taxonomy
+
+#=================================================================================
+# Interview question bank
+#
+# question_bank_data.py is the source definition. `python question_bank.py build`
+# renders it against the default skill catalog into question_bank.json: the
+# technical and gap questions of every catalog skill, indexed by skill id, plus
+# the behavioral set. At request time questions are only looked up and
+# personalised. Tenants add questions in question_banks/<tenant>.json
+# ({"skill_questions", "category_questions", "behavioral_questions"}); their
+# banks are compiled in memory on first use and whenever the file changes.
+#=================================================================================
+QUESTION_BANK_FORMAT_VERSION = 1
+QUESTION_BANK_ARTIFACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_bank.json")
+QUESTION_BANK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "question_banks")
+
+_banks = {}  # taxonomy name -> (QuestionBank, tenant source mtime)
+_banks_lock = threading.Lock()
+
+
+def _render(template, skill, star_template):
+    """Question dict for one skill from a source template."""
+    star = template.get('star_template', star_template)
+    return {
+        'question': template['question'].replace('{skill}', skill),
+        'star_template': {part: text.replace('{skill}', skill) for part, text in star.items()},
+        'tips': [tip.replace('{skill}', skill) for tip in template.get('tips', [])]
+    }
+
+
+def default_source():
+    """The built-in question bank source definition."""
+    import question_bank_data as data
+
+    return {
+        'technical_question': data.technical_question,
+        'gap_question': data.gap_question,
+        'category_questions': data.category_questions,
+        'skill_questions': data.skill_questions,
+        'behavioral_questions': data.behavioral_questions,
+        'behavioral_star_template': data.behavioral_star_template,
+        'behavioral_tips': data.behavioral_tips
+    }
+
+
+def extend_source(source, extension):
+    """Source with a tenant's questions placed before the built-in ones."""
+    merged = dict(source)
+    for key in ('category_questions', 'skill_questions'):
+        merged[key] = dict(source[key])
+        for name, questions in extension.get(key, {}).items():
+            merged[key][name] = questions + source[key].get(name, [])
+    merged['behavioral_questions'] = extension.get('behavioral_questions', []) + source['behavioral_questions']
+    return merged
+
+
+def source_hash(source, taxonomy):
+    payload = json.dumps([source, taxonomy.fingerprint()], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class QuestionBank:
+    """Rendered interview questions indexed by catalog skill id."""
+
+    def __init__(self, technical, gap, behavioral, source_hash=""):
+        self.technical = technical  # skill id -> [question dicts], most specific first
+        self.gap = gap  # skill id -> question dict
+        self.behavioral = behavioral
+        self.source_hash = source_hash
+
+    def technical_for(self, skill_id):
+        return self.technical[skill_id]
+
+    def gap_for(self, skill_id):
+        return self.gap[skill_id]
+
+    def to_artifact(self):
+        return {
+            'format_version': QUESTION_BANK_FORMAT_VERSION,
+            'source_hash': self.source_hash,
+            'technical': self.technical,
+            'gap': self.gap,
+            'behavioral': self.behavioral
+        }
+
+    @classmethod
+    def from_artifact(cls, data):
+        if data.get('format_version') != QUESTION_BANK_FORMAT_VERSION:
+            raise ValueError(f"Unsupported question bank format version: {data.get('format_version')}")
+        return cls(data['technical'], data['gap'], data['behavioral'], data.get('source_hash', ""))
+
+
+def compile_question_bank(taxonomy, source=None):
+    """Render a question bank source for every skill in a taxonomy."""
+    if source is None:
+        source = default_source()
+    technical_star = source['technical_question']['star_template']
+    technical = []
+    gap = []
+    for skill_id, skill in enumerate(taxonomy.skills):
+        category = taxonomy.category_of(skill_id)
+        templates = (source['skill_questions'].get(skill, []) + source['category_questions'].get(category, [])
+                     + [source['technical_question']])
+        technical.append([_render(template, skill, technical_star) for template in templates])
+        gap.append(_render(source['gap_question'], skill, technical_star))
+    behavioral = [
+        {
+            'question': template['question'],
+            'star_template': dict(template.get('star_template', source['behavioral_star_template'])),
+            'tips': list(template.get('tips', source['behavioral_tips']))
+        }
+        for template in source['behavioral_questions']
+    ]
+    return QuestionBank(technical, gap, behavioral, source_hash(source, taxonomy))
+
+
+def _tenant_source_path(name):
+    return os.path.join(QUESTION_BANK_DIR, f"{name}.json")
+
+
+def _load(taxonomy, mtime):
+    source = default_source()
+    if mtime is not None:
+        with open(_tenant_source_path(taxonomy.name), encoding='utf-8') as f:
+            source = extend_source(source, json.load(f))
+    elif taxonomy.name == DEFAULT_TAXONOMY:
+        try:
+            with open(QUESTION_BANK_ARTIFACT, encoding='utf-8') as f:
+                bank = QuestionBank.from_artifact(json.load(f))
+            if bank.source_hash == source_hash(source, taxonomy):
+                return bank
+        except (OSError, ValueError, KeyError):
+            pass
+    return compile_question_bank(taxonomy, source)
+
+
+def question_bank(taxonomy=None):
+    """Question bank for a taxonomy (tenant), rebuilt when its catalog or question source changes."""
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    try:
+        mtime = os.stat(_tenant_source_path(taxonomy.name)).st_mtime_ns
+    except OSError:
+        mtime = None
+    with _banks_lock:
+        entry = _banks.get(taxonomy.name)
+        if entry is not None and entry[1] == (taxonomy.fingerprint(), mtime):
+            return entry[0]
+    bank = _load(taxonomy, mtime)
+    with _banks_lock:
+        _banks[taxonomy.name] = (bank, (taxonomy.fingerprint(), mtime))
+    return bank
+
+
+def build(output=QUESTION_BANK_ARTIFACT):
+    """Compile question_bank_data.py against the default skill catalog."""
+    bank = compile_question_bank(load_taxonomy())
+    tmp_path = f"{output}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(bank.to_artifact(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, output)
+    questions = sum(len(questions) for questions in bank.technical)
+    print(f"Compiled {questions} technical questions for {len(bank.technical)} skills to {output}")
+    return bank
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Interview question bank tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Compile question_bank_data.py into the question bank artifact")
+    build_parser.add_argument("--output", default=QUESTION_BANK_ARTIFACT)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.output)
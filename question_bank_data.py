@@ -0,0 +1,152 @@
+# Source definition for the interview question bank. Run `python question_bank.py build`
+# after editing to recompile question_bank.json. "{skill}" is replaced with the
+# catalog skill name; tenants add questions in question_banks/<tenant>.json.
+
+# Asked for every catalog skill the job description requires
+technical_question = {
+    "question": "Can you describe your experience with {skill}?",
+    "star_template": {
+        "situation": "In my previous role working with {skill}...",
+        "task": "I was tasked with implementing/optimizing...",
+        "action": "I used {skill} to develop/create...",
+        "result": "Which resulted in [quantifiable outcome like 30% improvement]"
+    },
+    "tips": [
+        "Mention specific projects where you used {skill}",
+        "Quantify your impact with numbers and percentages",
+        "Discuss challenges you overcame"
+    ]
+}
+
+# Asked about required skills the resume does not mention
+gap_question = {
+    "question": "I notice you don't mention {skill} on your resume. Do you have any experience with it?",
+    "star_template": {
+        "situation": "While I haven't used {skill} extensively in a professional setting...",
+        "task": "I've been learning it through [courses/projects/self-study]...",
+        "action": "I recently completed [specific example using {skill}]...",
+        "result": "I'm confident I can quickly apply this knowledge to your projects"
+    },
+    "tips": [
+        "Be honest about your experience level",
+        "Mention any related skills or learning efforts",
+        "Show enthusiasm for learning new technologies",
+        "Provide concrete examples of quick learning in the past"
+    ]
+}
+
+# Asked before the generic technical question for every skill in the category;
+# entries without a star_template use the technical one
+category_questions = {
+    "Programming and Development": [
+        {"question": "Walk me through a {skill} project you are proud of. What design decisions did you make?",
+         "tips": ["Explain the trade-offs you considered", "Mention testing and code review practices"]}
+    ],
+    "Web Frameworks and Technologies": [
+        {"question": "How have you structured a production application built with {skill}?",
+         "tips": ["Cover state, routing or data flow", "Mention performance or accessibility work"]}
+    ],
+    "Data Science and Analytics": [
+        {"question": "Tell me about an analysis or model where you applied {skill}. How did you validate the results?",
+         "tips": ["Describe the data and how you cleaned it", "Explain the metric you optimised and why"]}
+    ],
+    "Database Management": [
+        {"question": "How have you designed or tuned a {skill} schema for performance?",
+         "tips": ["Mention indexing and query plans", "Discuss how you handled growth in data volume"]}
+    ],
+    "Cloud and Infrastructure": [
+        {"question": "Describe infrastructure you built or operated with {skill}. How did you keep it reliable?",
+         "tips": ["Mention monitoring and incident handling", "Discuss cost and security considerations"]}
+    ],
+    "Cybersecurity": [
+        {"question": "Tell me about a security risk you identified or mitigated using {skill}.",
+         "tips": ["Explain how the risk was discovered", "Describe how you verified the fix"]}
+    ],
+    "Artificial Intelligence and Automation": [
+        {"question": "Describe a problem you solved with {skill}. How did you measure whether it worked?",
+         "tips": ["Discuss evaluation and failure cases", "Mention how the solution was deployed"]}
+    ],
+    "Business and Management": [
+        {"question": "Give an example of how you applied {skill} to move a team or project forward.",
+         "tips": ["Name the stakeholders involved", "Quantify the business outcome"]}
+    ],
+    "Marketing and Sales": [
+        {"question": "Tell me about a campaign or deal where {skill} made the difference.",
+         "tips": ["Share the target and the result", "Explain what you would repeat or change"]}
+    ],
+    "Design and Creative": [
+        {"question": "Walk me through a piece of work where you used {skill}, from brief to final result.",
+         "tips": ["Describe how feedback shaped the design", "Have a portfolio example ready"]}
+    ],
+    "Office and Productivity Tools": [
+        {"question": "How have you used {skill} to save time or improve the quality of your work?",
+         "tips": ["Give a concrete example such as a template or automation", "Estimate the time saved"]}
+    ],
+    "Soft Skills": [
+        {"question": "Give an example of when your {skill} changed the outcome of a project.",
+         "star_template": {
+             "situation": "On a project where {skill} mattered...",
+             "task": "I needed to [describe the challenge or goal]...",
+             "action": "I took the following steps: [list specific actions]...",
+             "result": "This led to [positive outcome with metrics]"
+         },
+         "tips": ["Use the STAR method to structure your answer", "Focus on your individual contribution"]}
+    ],
+    "Industry-Specific Skills": [
+        {"question": "How has your knowledge of {skill} shaped decisions in your previous roles?",
+         "tips": ["Mention regulations or domain constraints you worked within"]}
+    ],
+    "Languages": [
+        {"question": "Could you describe a situation where you used {skill} at work?",
+         "tips": ["Be specific about your level of proficiency", "Mention written and spoken use"]}
+    ],
+    "Certifications": [
+        {"question": "What did earning your {skill} teach you that you apply day to day?",
+         "tips": ["Connect the certification to a real project"]}
+    ]
+}
+
+# Asked before the category questions for specific catalog skills
+skill_questions = {
+    "Python": [
+        {"question": "How do you structure and test a larger Python codebase?",
+         "tips": ["Mention packaging, typing and test tooling", "Discuss how you profiled slow code"]}
+    ],
+    "SQL": [
+        {"question": "Tell me about a complex SQL query you wrote. How did you make sure it was correct and fast?",
+         "tips": ["Mention joins, window functions or query plans", "Explain how you validated the results"]}
+    ],
+    "DevOps (Docker, Kubernetes, CI/CD)": [
+        {"question": "Describe a deployment pipeline you built. How did you make releases safe?",
+         "tips": ["Mention rollbacks, testing stages and monitoring"]}
+    ],
+    "Machine Learning": [
+        {"question": "Walk me through a model you took to production. How did you monitor it afterwards?",
+         "tips": ["Discuss data drift and retraining", "Quantify the model's business impact"]}
+    ],
+    "Project Management (Agile, Scrum, Waterfall)": [
+        {"question": "Tell me about a project that went off track. How did you bring it back?",
+         "tips": ["Explain how you re-planned scope, time or budget", "Describe how you communicated the change"]}
+    ]
+}
+
+behavioral_questions = [
+    {"question": "Tell me about a time when you had to work with a difficult team member."},
+    {"question": "Describe a situation where you had to meet a tight deadline."},
+    {"question": "Give an example of a project where you demonstrated leadership."},
+    {"question": "Tell me about a time you failed and what you learned from it."},
+    {"question": "Describe how you handle conflicting priorities."}
+]
+
+behavioral_star_template = {
+    "situation": "In my recent role...",
+    "task": "I needed to [describe the challenge or goal]...",
+    "action": "I took the following steps: [list specific actions]...",
+    "result": "This led to [positive outcome with metrics]"
+}
+
+behavioral_tips = [
+    "Use the STAR method to structure your answer",
+    "Be specific with examples from your experience",
+    "Focus on your individual contribution"
+]
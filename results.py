@@ -0,0 +1,218 @@
+from array import array
+
+#=================================================================================
+# Compact analysis results
+#
+# Result dicts repeat every skill and category name as a string in nested dicts
+# and lists. These slotted classes hold the same data as catalog ids in typed
+# arrays instead, for keeping many results in memory (batch ranking). Each
+# converts losslessly to and from the dict shape the display code uses, given
+# the taxonomy the analysis ran with.
+#=================================================================================
+SKILL_ID_TYPECODE = 'I'
+CATEGORY_ID_TYPECODE = 'H'
+PRIORITIES = ('High', 'Medium', 'Low')
+DETAIL_LISTS = ('required', 'matched', 'missing')
+
+
+def _category_id(taxonomy, category):
+    try:
+        return taxonomy.categories.index(category)
+    except ValueError:
+        raise ValueError(f"Category not in the {taxonomy.name} catalog: {category}")
+
+
+def _skill_ids(taxonomy, category, skills):
+    ids = array(SKILL_ID_TYPECODE)
+    for skill in skills:
+        skill_id = taxonomy.skill_id(category, skill)
+        if skill_id is None:
+            raise ValueError(f"Skill not in the {taxonomy.name} catalog: {category} / {skill}")
+        ids.append(skill_id)
+    return ids
+
+
+def _skill_names(taxonomy, ids):
+    return [taxonomy.skills[skill_id] for skill_id in ids]
+
+
+class MatchDetails:
+    """Compact form of calculate_match_score's detailed_result.
+
+    Per category, in order: its id, then the counts of required, matched and
+    missing skills; the skill ids of all categories are concatenated in skills.
+    """
+
+    __slots__ = ('categories', 'counts', 'skills')
+
+    def __init__(self, categories, counts, skills):
+        self.categories = categories
+        self.counts = counts
+        self.skills = skills
+
+    @classmethod
+    def from_dict(cls, details, taxonomy):
+        result = cls(array(CATEGORY_ID_TYPECODE), array(SKILL_ID_TYPECODE), array(SKILL_ID_TYPECODE))
+        for category, lists in details.items():
+            result.categories.append(_category_id(taxonomy, category))
+            for key in DETAIL_LISTS:
+                result.counts.append(len(lists[key]))
+                result.skills.extend(_skill_ids(taxonomy, category, lists[key]))
+        return result
+
+    def to_dict(self, taxonomy):
+        details = {}
+        position = 0
+        for index, category_id in enumerate(self.categories):
+            lists = {}
+            for offset, key in enumerate(DETAIL_LISTS):
+                count = self.counts[3 * index + offset]
+                lists[key] = _skill_names(taxonomy, self.skills[position:position + count])
+                position += count
+            details[taxonomy.categories[category_id]] = lists
+        return details
+
+
+class SemanticMatches:
+    """Compact form of semantic_matches: parallel arrays, one entry per match."""
+
+    __slots__ = ('categories', 'jd_skills', 'resume_skills', 'similarities')
+
+    def __init__(self, categories, jd_skills, resume_skills, similarities):
+        self.categories = categories
+        self.jd_skills = jd_skills
+        self.resume_skills = resume_skills
+        self.similarities = similarities
+
+    @classmethod
+    def from_dict(cls, semantic_matches, taxonomy):
+        result = cls(array(CATEGORY_ID_TYPECODE), array(SKILL_ID_TYPECODE), array(SKILL_ID_TYPECODE), array('d'))
+        for category, matches in semantic_matches.items():
+            category_id = _category_id(taxonomy, category)
+            for match in matches:
+                result.categories.append(category_id)
+                result.jd_skills.extend(_skill_ids(taxonomy, category, [match['jd_skill']]))
+                result.resume_skills.extend(_skill_ids(taxonomy, category, [match['resume_skill']]))
+                result.similarities.append(match['similarity'])
+        return result
+
+    def to_dict(self, taxonomy):
+        semantic_matches = {}
+        for category_id, jd_skill, resume_skill, similarity in zip(
+                self.categories, self.jd_skills, self.resume_skills, self.similarities):
+            semantic_matches.setdefault(taxonomy.categories[category_id], []).append({
+                'jd_skill': taxonomy.skills[jd_skill],
+                'resume_skill': taxonomy.skills[resume_skill],
+                'similarity': similarity
+            })
+        return semantic_matches
+
+
+class SkillGap:
+    """One bubble of the skill gap chart."""
+
+    __slots__ = ('category', 'count', 'importance', 'priority', 'skills')
+
+    def __init__(self, category, count, importance, priority, skills):
+        self.category = category
+        self.count = count
+        self.importance = importance
+        self.priority = priority  # index into PRIORITIES
+        self.skills = skills
+
+
+class VisualizationData:
+    """Compact form of generate_visualization_data's viz_data."""
+
+    __slots__ = ('radar_categories', 'radar_required', 'radar_resume', 'score_categories', 'scores', 'gaps')
+
+    def __init__(self, radar_categories, radar_required, radar_resume, score_categories, scores, gaps):
+        self.radar_categories = radar_categories
+        self.radar_required = radar_required
+        self.radar_resume = radar_resume
+        self.score_categories = score_categories
+        self.scores = scores
+        self.gaps = gaps
+
+    @classmethod
+    def from_dict(cls, viz_data, taxonomy):
+        radar = viz_data.get('radar_data', {})
+        scores = viz_data.get('category_scores', {})
+        return cls(
+            array(CATEGORY_ID_TYPECODE, [_category_id(taxonomy, category) for category in radar]),
+            array('d', [values['required'] for values in radar.values()]),
+            array('d', [values['resume'] for values in radar.values()]),
+            array(CATEGORY_ID_TYPECODE, [_category_id(taxonomy, category) for category in scores]),
+            array('d', scores.values()),
+            tuple(
+                SkillGap(_category_id(taxonomy, gap['category']), gap['count'], gap['importance'],
+                         PRIORITIES.index(gap['priority']), gap['skills'])
+                for gap in viz_data.get('bubble_data', [])
+            )
+        )
+
+    def to_dict(self, taxonomy):
+        categories = taxonomy.categories
+        return {
+            'radar_data': {
+                categories[category_id]: {'required': _number(required), 'resume': resume}
+                for category_id, required, resume in zip(self.radar_categories, self.radar_required, self.radar_resume)
+            },
+            'category_scores': {
+                categories[category_id]: score for category_id, score in zip(self.score_categories, self.scores)
+            },
+            'bubble_data': [
+                {
+                    'category': categories[gap.category],
+                    'count': gap.count,
+                    'importance': gap.importance,
+                    'priority': PRIORITIES[gap.priority],
+                    'skills': gap.skills
+                }
+                for gap in self.gaps
+            ]
+        }
+
+
+def _number(value):
+    """Whole floats back to ints, as the dict shape stores them."""
+    return int(value) if value.is_integer() else value
+
+
+class AnalysisResult:
+    """Scores and skill results of one analysis, without repeated strings."""
+
+    __slots__ = ('basic_score', 'weighted_score', 'details', 'semantic_matches', 'viz_data')
+
+    def __init__(self, basic_score, weighted_score, details, semantic_matches=None, viz_data=None):
+        self.basic_score = basic_score
+        self.weighted_score = weighted_score
+        self.details = details  # MatchDetails
+        self.semantic_matches = semantic_matches  # SemanticMatches or None
+        self.viz_data = viz_data  # VisualizationData or None
+
+    @classmethod
+    def from_values(cls, values, taxonomy):
+        """Build from pipeline result values (basic_score, weighted_score, details, ...)."""
+        semantic_matches = values.get('semantic_matches')
+        viz_data = values.get('viz_data')
+        return cls(
+            values['basic_score'],
+            values['weighted_score'],
+            MatchDetails.from_dict(values['details'], taxonomy),
+            SemanticMatches.from_dict(semantic_matches, taxonomy) if semantic_matches is not None else None,
+            VisualizationData.from_dict(viz_data, taxonomy) if viz_data is not None else None
+        )
+
+    def to_values(self, taxonomy):
+        """The result values as the dicts the display functions take."""
+        values = {
+            'basic_score': self.basic_score,
+            'weighted_score': self.weighted_score,
+            'details': self.details.to_dict(taxonomy)
+        }
+        if self.semantic_matches is not None:
+            values['semantic_matches'] = self.semantic_matches.to_dict(taxonomy)
+        if self.viz_data is not None:
+            values['viz_data'] = self.viz_data.to_dict(taxonomy)
+        return values
@@ -0,0 +1,344 @@
+import hashlib
+import http.client
+import json
+import os
+import queue
+import re
+import socket
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+#=================================================================================
+# Bullet rewrite backend
+#
+# Bullets are rewritten by an OpenAI-compatible chat completions endpoint when
+# one is configured (REWRITE_API_URL, REWRITE_API_KEY, REWRITE_MODEL). All of a
+# resume's bullets go out in one request over pooled keep-alive connections,
+# with a cap on requests in flight and one deadline per batch covering the
+# wait for a slot, the retry and every socket read; answers are cached by
+# (bullet, missing skills as sent, prompt version), so unchanged bullets never
+# go out twice. Callers fall back to the heuristic rewrite when the backend is missing,
+# slow or wrong. StubRewriteServer stands in for the endpoint locally.
+#=================================================================================
+PROMPT_VERSION = 1
+DEFAULT_REWRITE_MODEL = "gpt-4o-mini"
+REWRITE_TIMEOUT = 8.0  # seconds for a whole batch, from the call to the last byte, before falling back
+MAX_CONCURRENT_REQUESTS = 4
+CONNECTION_POOL_SIZE = 4
+REWRITE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses", "rewrite_cache.jsonl")
+MAX_CACHE_ENTRIES = 10000
+
+REWRITE_PROMPT = (
+    "You improve resume bullet points. Rewrite each bullet to start with a strong action verb and "
+    "state its impact. Keep every fact; never invent employers, tools or numbers. Where a metric "
+    "would help and none is given, add a placeholder such as [X%]. Mention a missing skill only if "
+    "the bullet already implies it. Reply with a JSON object {\"bullets\": [...]} holding exactly "
+    "one rewritten bullet per input bullet, in the same order."
+)
+
+_JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
+
+class RewriteError(Exception):
+    """The backend did not return a usable rewrite for the batch."""
+
+
+class RewriteCache:
+    """LRU cache of rewrites, persisted as an append-only log."""
+
+    def __init__(self, path=REWRITE_CACHE_PATH, max_entries=MAX_CACHE_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._put(entry['key'], entry['text'])
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(bullet, missing_skills):
+        # In order: the prompt lists the skills as given and the first one can shape the rewrite
+        payload = json.dumps([PROMPT_VERSION, bullet, list(missing_skills)], ensure_ascii=False)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+    def _put(self, key, text):
+        self.entries[key] = text
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            text = self.entries.get(key)
+            if text is not None:
+                self.entries.move_to_end(key)
+            return text
+
+    def put_many(self, items):
+        """Store (key, text) pairs."""
+        with self._lock:
+            for key, text in items:
+                self._put(key, text)
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    for key, text in items:
+                        f.write(json.dumps({'key': key, 'text': text}, ensure_ascii=False) + '\n')
+            except OSError:
+                pass
+
+
+class OpenAICompatibleBackend:
+    """Batched rewrites from an OpenAI-compatible /chat/completions endpoint."""
+
+    def __init__(self, base_url, api_key=None, model=DEFAULT_REWRITE_MODEL, timeout=REWRITE_TIMEOUT,
+                 max_concurrent=MAX_CONCURRENT_REQUESTS, pool_size=CONNECTION_POOL_SIZE):
+        parts = urlsplit(base_url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"Invalid rewrite API URL: {base_url!r}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = parts.path.rstrip('/') + '/chat/completions'
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def _connection(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            connection_class = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+            return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    @staticmethod
+    def _abort(connection):
+        """Unblock a request that has reached its deadline."""
+        sock = connection.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _post(self, payload, deadline):
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f"Bearer {self.api_key}"
+        body = json.dumps(payload).encode('utf-8')
+        for attempt in range(2):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise RewriteError(f"Rewrite API did not answer within {self.timeout}s")
+            connection = self._connection()
+            connection.timeout = remaining
+            if connection.sock is not None:
+                connection.sock.settimeout(remaining)
+            # Socket timeouts only bound each read; the watchdog bounds the whole exchange
+            watchdog = threading.Timer(remaining, self._abort, [connection])
+            watchdog.daemon = True
+            watchdog.start()
+            try:
+                connection.request('POST', self.path, body=body, headers=headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (OSError, http.client.HTTPException) as e:
+                connection.close()
+                if time.monotonic() >= deadline:
+                    raise RewriteError(f"Rewrite API did not answer within {self.timeout}s") from e
+                # A pooled keep-alive connection the server has since closed is retried once
+                if attempt or not isinstance(e, (ConnectionError, http.client.RemoteDisconnected)):
+                    if isinstance(e, http.client.HTTPException):
+                        raise RewriteError(f"Rewrite API connection failed: {e!r}") from e
+                    raise
+            finally:
+                watchdog.cancel()
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(connection)
+        if response.status != 200:
+            raise RewriteError(f"Rewrite API returned HTTP {response.status}")
+        return json.loads(data)
+
+    def rewrite_batch(self, bullets, missing_skills):
+        """One rewritten bullet per input bullet, in order; raises on timeouts and bad answers.
+
+        The whole call, including waiting for a free slot, ends within self.timeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        if not self._slots.acquire(timeout=self.timeout):
+            raise RewriteError("Too many rewrite requests in flight")
+        try:
+            result = self._post({
+                'model': self.model,
+                'temperature': 0,
+                'response_format': {'type': 'json_object'},
+                'messages': [
+                    {'role': 'system', 'content': REWRITE_PROMPT},
+                    {'role': 'user', 'content': json.dumps(
+                        {'missing_skills': list(missing_skills), 'bullets': list(bullets)}, ensure_ascii=False
+                    )}
+                ]
+            }, deadline)
+        finally:
+            self._slots.release()
+        try:
+            content = result['choices'][0]['message']['content']
+            rewritten = json.loads(_JSON_OBJECT.search(content).group())['bullets']
+        except (KeyError, IndexError, TypeError, AttributeError, ValueError):
+            raise RewriteError("Rewrite API returned an unexpected response")
+        if len(rewritten) != len(bullets) or not all(isinstance(text, str) and text.strip() for text in rewritten):
+            raise RewriteError("Rewrite API returned the wrong number of bullets")
+        return [text.strip() for text in rewritten]
+
+
+def rewrite_bullets(backend, bullets, missing_skills, cache=None):
+    """Rewrites from the backend, using the cache for bullets seen before.
+
+    Returns one rewrite per bullet; raises if the uncached bullets could not be rewritten.
+    """
+    keys = [RewriteCache.key(bullet, missing_skills) for bullet in bullets]
+    rewritten = [cache.get(key) if cache else None for key in keys]
+    pending = [index for index, text in enumerate(rewritten) if text is None]
+    if pending:
+        answers = backend.rewrite_batch([bullets[index] for index in pending], missing_skills)
+        for index, text in zip(pending, answers):
+            rewritten[index] = text
+        if cache:
+            cache.put_many([(keys[index], rewritten[index]) for index in pending])
+    return rewritten
+
+
+_backend = None
+_cache = None
+_backend_lock = threading.Lock()
+
+
+def rewrite_backend():
+    """Process-wide (backend, cache) from REWRITE_API_* settings, or (None, None) when not configured."""
+    global _backend, _cache
+    if _backend is None and os.environ.get('REWRITE_API_URL'):
+        with _backend_lock:
+            if _backend is None:
+                _cache = RewriteCache()
+                _backend = OpenAICompatibleBackend(
+                    os.environ['REWRITE_API_URL'],
+                    api_key=os.environ.get('REWRITE_API_KEY'),
+                    model=os.environ.get('REWRITE_MODEL', DEFAULT_REWRITE_MODEL),
+                    timeout=float(os.environ.get('REWRITE_TIMEOUT', REWRITE_TIMEOUT))
+                )
+    return _backend, _cache
+
+
+#=================================================================================
+# Local stand-in server
+#
+# Answers /chat/completions deterministically (same bullets in, same rewrites
+# out), so the client, batching and cache can be exercised without a model.
+#=================================================================================
+def stub_rewrite(bullet, missing_skills):
+    """The stand-in server's rewrite of one bullet."""
+    text = bullet.strip().rstrip('.')
+    text = text[:1].upper() + text[1:]
+    if missing_skills and missing_skills[0].lower() not in text.lower():
+        text += f" using {missing_skills[0]}"
+    return f"{text}, improving results by [X%]"
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length))
+        if not self.path.endswith('/chat/completions'):
+            self.send_error(404)
+            return
+        self.server.requests += 1
+        if self.server.delay:
+            threading.Event().wait(self.server.delay)
+        batch = json.loads(request['messages'][-1]['content'])
+        rewritten = [stub_rewrite(bullet, batch['missing_skills']) for bullet in batch['bullets']]
+        body = json.dumps({
+            'model': request.get('model'),
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': json.dumps({'bullets': rewritten})}}]
+        }).encode('utf-8')
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if self.server.trickle:
+                for index in range(len(body)):
+                    threading.Event().wait(self.server.trickle)
+                    self.wfile.write(body[index:index + 1])
+                    self.wfile.flush()
+            else:
+                self.wfile.write(body)
+        except ConnectionError:
+            # The client gave up (timeouts are part of what this server is for)
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubRewriteServer:
+    """Deterministic OpenAI-compatible rewrite server on localhost.
+
+    Use as a context manager; url is the base URL for OpenAICompatibleBackend.
+    delay (seconds) simulates a slow backend, trickle (seconds per byte) one
+    that keeps the connection busy without ever timing out a read. requests
+    counts the requests answered.
+    """
+
+    def __init__(self, port=0, delay=0.0, trickle=0.0):
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), _StubHandler)
+        self.server.delay = delay
+        self.server.trickle = trickle
+        self.server.requests = 0
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        self._thread = None
+
+    @property
+    def requests(self):
+        return self.server.requests
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the deterministic stand-in rewrite server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before answering")
+    args = parser.parse_args()
+    with StubRewriteServer(args.port, args.delay) as stub:
+        print(f"Set REWRITE_API_URL={stub.url}")
+        threading.Event().wait()
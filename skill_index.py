@@ -0,0 +1,283 @@
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from file_lock import file_lock
+from taxonomy import normalize_term
+
+#=================================================================================
+# Inverted skill index
+#
+# Every analyzed resume becomes a candidate whose id is its line number in an
+# append-only candidate log. The index maps each catalog skill id to the sorted
+# array of candidates that have the skill: all posting lists are concatenated
+# into one uint32 array with an offsets array, both memory-mapped from disk.
+# New candidates are appended to the log and kept in an in-memory delta; once
+# the delta is large enough it is merged into new base arrays. The app and
+# batch runs share the log: writers hold the index lock and replay lines other
+# processes appended before adding their own, so ids always follow log order.
+# Boolean queries ("Python AND Kubernetes AND NOT Java") are evaluated with
+# sorted-array set operations.
+#=================================================================================
+INDEX_FORMAT_VERSION = 1
+SKILL_INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_index")
+DELTA_COMPACT_SIZE = 2048  # candidates kept in the delta before compaction
+POSTING_DTYPE = np.uint32
+
+_QUERY_TOKEN = re.compile(r'\(|\)|"[^"]*"|[^\s()"]+')
+QUERY_OPERATORS = ('AND', 'OR', 'NOT')
+
+
+def parse_query(query):
+    """Parse a boolean skill query into a tree of ('and'|'or', a, b), ('not', a), ('skill', name).
+
+    Operators are upper-case AND, OR, NOT with parentheses; NOT binds tightest,
+    then AND, then OR. Consecutive words form one skill name ("Machine Learning")
+    and quotes keep operator words inside a name.
+    """
+    tokens = _QUERY_TOKEN.findall(query)
+    position = 0
+
+    def peek():
+        return tokens[position] if position < len(tokens) else None
+
+    def take():
+        nonlocal position
+        position += 1
+        return tokens[position - 1]
+
+    def parse_or():
+        node = parse_and()
+        while peek() == 'OR':
+            take()
+            node = ('or', node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == 'AND':
+            take()
+            node = ('and', node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == 'NOT':
+            take()
+            return ('not', parse_not())
+        if peek() == '(':
+            take()
+            node = parse_or()
+            if peek() != ')':
+                raise ValueError("Unbalanced parentheses in query")
+            take()
+            return node
+        words = []
+        while peek() is not None and peek() not in QUERY_OPERATORS and peek() not in ('(', ')'):
+            word = take()
+            words.append(word[1:-1] if word.startswith('"') else word)
+        if not words:
+            raise ValueError(f"Expected a skill at position {position + 1} of the query")
+        return ('skill', ' '.join(words))
+
+    if not tokens:
+        raise ValueError("Empty query")
+    tree = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected '{peek()}' in query")
+    return tree
+
+
+class SkillIndex:
+    """Disk-backed inverted index from catalog skill id to candidate ids, for one taxonomy."""
+
+    def __init__(self, taxonomy, directory=SKILL_INDEX_DIR):
+        self.taxonomy = taxonomy
+        self.directory = os.path.join(directory, taxonomy.name)
+        os.makedirs(self.directory, exist_ok=True)
+        self.candidates = []  # candidate id -> key (e.g. analysis snapshot id)
+        self._positions = {}  # key -> candidate id
+        self._delta = {}  # skill id -> candidate ids added since the last compaction
+        self._base_candidates = 0
+        self._log_offset = 0  # bytes of the candidate log replayed
+        self.offsets = np.zeros(len(taxonomy.skills) + 1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=POSTING_DTYPE)
+        self._lock = threading.Lock()
+        with file_lock(self._path('index.lock')):
+            self._open()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _open(self):
+        try:
+            with open(self._path('meta.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            meta = {}
+
+        current = (meta.get('format_version') == INDEX_FORMAT_VERSION
+                   and meta.get('taxonomy') == self.taxonomy.fingerprint())
+        if current:
+            self._base_candidates = meta['base_candidates']
+            self.offsets = np.load(self._path('offsets.npy'), mmap_mode='r')
+            self.postings = np.load(self._path('postings.npy'), mmap_mode='r')
+            self._catch_up()
+        else:
+            # New index, or skill ids changed with the catalog: rebuild from the log
+            self._catch_up()
+            self._compact()
+
+    def _catch_up(self):
+        """Replay the complete log lines appended since the last read, by any process."""
+        try:
+            size = os.path.getsize(self._path('candidates.jsonl'))
+        except OSError:
+            return
+        if size <= self._log_offset:
+            return
+        with open(self._path('candidates.jsonl'), 'rb') as f:
+            f.seek(self._log_offset)
+            data = f.read(size - self._log_offset)
+        complete = data.rfind(b'\n') + 1
+        for line in data[:complete].splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            candidate_id = len(self.candidates)
+            self._positions.setdefault(entry['key'], candidate_id)
+            self.candidates.append(entry['key'])
+            # Candidates below the base count are already in the memory-mapped postings
+            if candidate_id >= self._base_candidates:
+                self._add_postings(candidate_id, entry['skills'])
+        self._log_offset += complete
+
+    def _skill_ids(self, skills_by_category):
+        ids = set()
+        for category, skills in skills_by_category.items():
+            for skill in skills:
+                skill_id = self.taxonomy.skill_id(category, skill)
+                if skill_id is not None:
+                    ids.add(skill_id)
+        return ids
+
+    def _add_postings(self, candidate_id, skills_by_category):
+        for skill_id in self._skill_ids(skills_by_category):
+            self._delta.setdefault(skill_id, []).append(candidate_id)
+
+    def _compact(self):
+        """Merge the delta into new base arrays and memory-map them."""
+        skill_count = len(self.taxonomy.skills)
+        lists = []
+        offsets = np.zeros(skill_count + 1, dtype=np.int64)
+        for skill_id in range(skill_count):
+            base = self.postings[self.offsets[skill_id]:self.offsets[skill_id + 1]]
+            delta = self._delta.get(skill_id)
+            # Delta ids are all newer than base ids, so concatenation stays sorted
+            merged = np.concatenate([base, np.asarray(delta, dtype=POSTING_DTYPE)]) if delta else base
+            lists.append(merged)
+            offsets[skill_id + 1] = offsets[skill_id] + len(merged)
+        postings = np.concatenate(lists).astype(POSTING_DTYPE) if lists else np.zeros(0, dtype=POSTING_DTYPE)
+
+        for name, array in (('offsets.npy', offsets), ('postings.npy', postings)):
+            tmp_path = self._path(f"{name}.tmp{os.getpid()}")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, self._path(name))
+        meta = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'taxonomy': self.taxonomy.fingerprint(),
+            'base_candidates': len(self.candidates)
+        }
+        tmp_path = self._path(f"meta.json.tmp{os.getpid()}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._path('meta.json'))
+
+        self.offsets = np.load(self._path('offsets.npy'), mmap_mode='r')
+        self.postings = np.load(self._path('postings.npy'), mmap_mode='r')
+        self._base_candidates = len(self.candidates)
+        self._delta = {}
+
+    def add(self, key, skills_by_category):
+        """Index a candidate's {category: [skills]}; keys already indexed, by any process, are left as they are."""
+        line = json.dumps({'key': key, 'skills': skills_by_category}, separators=(',', ':')) + '\n'
+        with self._lock, file_lock(self._path('index.lock')):
+            self._catch_up()
+            if key in self._positions:
+                return self._positions[key]
+            fd = os.open(self._path('candidates.jsonl'), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line.encode('utf-8'))
+            finally:
+                os.close(fd)
+            self._catch_up()
+            if len(self.candidates) - self._base_candidates >= DELTA_COMPACT_SIZE:
+                self._compact()
+            return self._positions[key]
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def postings_for(self, skill_id):
+        """Sorted candidate ids that have a skill."""
+        base = self.postings[self.offsets[skill_id]:self.offsets[skill_id + 1]]
+        delta = self._delta.get(skill_id)
+        if delta:
+            return np.concatenate([base, np.asarray(delta, dtype=POSTING_DTYPE)])
+        return np.asarray(base)
+
+    def _resolve(self, name):
+        skill_ids = self.taxonomy.aliases.get(normalize_term(name))
+        if not skill_ids:
+            raise ValueError(f"Unknown skill: {name}")
+        result = self.postings_for(skill_ids[0])
+        for skill_id in skill_ids[1:]:
+            result = np.union1d(result, self.postings_for(skill_id))
+        return result
+
+    def _evaluate(self, node, universe):
+        kind = node[0]
+        if kind == 'skill':
+            return self._resolve(node[1])
+        if kind == 'not':
+            return np.setdiff1d(universe(), self._evaluate(node[1], universe), assume_unique=True)
+        left = self._evaluate(node[1], universe)
+        if kind == 'and':
+            right = node[2]
+            # "A AND NOT B" subtracts B without materialising NOT B
+            if right[0] == 'not':
+                return np.setdiff1d(left, self._evaluate(right[1], universe), assume_unique=True)
+            return np.intersect1d(left, self._evaluate(right, universe), assume_unique=True)
+        return np.union1d(left, self._evaluate(node[2], universe))
+
+    def query_ids(self, query):
+        """Candidate ids matching a boolean skill query, ascending."""
+        tree = parse_query(query)
+        with self._lock:
+            self._catch_up()
+            count = len(self.candidates)
+            return self._evaluate(tree, lambda: np.arange(count, dtype=POSTING_DTYPE))
+
+    def search(self, query, limit=None):
+        """Keys of the candidates matching a boolean skill query, newest first."""
+        ids = self.query_ids(query)[::-1]
+        if limit is not None:
+            ids = ids[:limit]
+        return [self.candidates[candidate_id] for candidate_id in ids]
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def skill_index(taxonomy):
+    """Process-wide SkillIndex for a taxonomy, reopened when the catalog changes."""
+    with _indexes_lock:
+        index = _indexes.get(taxonomy.name)
+        if index is None or index.taxonomy.fingerprint() != taxonomy.fingerprint():
+            index = SkillIndex(taxonomy)
+            _indexes[taxonomy.name] = index
+        return index
@@ -1,4 +1,5 @@
-import json
+# Source definition for the skill taxonomy. Run `python taxonomy.py build` after
+# editing to recompile skills_taxonomy.json.
 skills_data = {
     "Programming and Development": [
         "Python", "Java", "SQL", "C++", "JavaScript", "TypeScript", "PHP", "Ruby", "Go", "Rust",
@@ -90,12 +91,28 @@ skills_data = {
     ]
 }
 
-SKILLS_FILE = "skills_list.txt"
-
-def save_skills_to_file():
-    """Save the skills list to a text file in JSON format."""
-    with open(SKILLS_FILE, 'w', encoding='utf-8') as f:
-        json.dump(skills_data, f, indent=4)
-    print(f"Skills saved to {SKILLS_FILE}")
-    
-save_skills_to_file()
\ No newline at end of file
+# Extra spellings for catalog terms. Keys are canonical skills or the sub-terms
+# derived from them (e.g. "Kubernetes" from "DevOps (Docker, Kubernetes, CI/CD)").
+skill_synonyms = {
+    "JavaScript": ["JS", "ECMAScript"],
+    "C++": ["CPP"],
+    "Go": ["Golang"],
+    "PostgreSQL": ["Postgres"],
+    "MongoDB": ["Mongo"],
+    "Microsoft SQL Server": ["SQL Server", "MSSQL"],
+    "Kubernetes": ["K8s"],
+    "CI/CD": ["Continuous Integration", "Continuous Delivery", "Continuous Deployment"],
+    "Microsoft Azure": ["Azure"],
+    "Google Cloud Platform (GCP)": ["Google Cloud"],
+    "React": ["React.js", "ReactJS"],
+    "Vue.js": ["VueJS"],
+    "Node.js": ["NodeJS"],
+    "Machine Learning": ["ML"],
+    "Scikit-learn": ["sklearn"],
+    "Generative AI": ["GenAI"],
+    "UI/UX Design": ["UI Design", "UX Design", "User Experience Design"],
+    "Adobe Photoshop": ["Photoshop"],
+    "Adobe Illustrator": ["Illustrator"],
+    "Microsoft Excel": ["Excel"],
+    "Microsoft PowerPoint": ["PowerPoint"]
+}
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import re
+import zipfile
+
+import numpy as np
+
+#=================================================================================
+# Analysis snapshots
+#
+# A finished analysis is stored as one compressed .npz file: a JSON document
+# with the result values and display settings, plus every numpy array (e.g. the
+# skill similarity matrix) as a binary entry referenced from the JSON. Loading
+# needs no pickle and no pipeline run. Snapshots are addressed by an id derived
+# from the resume, job description, skill catalog and the settings that change
+# result values, so re-analysing the same inputs with the same settings updates
+# the same snapshot and other settings get their own.
+#=================================================================================
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analyses")
+SNAPSHOT_ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+
+# Pipeline values needed to redraw every results view
+SNAPSHOT_VALUES = (
+    'resume_text', 'resume_matches', 'skill_highlights', 'resume_skills', 'jd_skills',
+    'basic_score', 'details', 'weighted_score', 'experience_info', 'skill_similarity',
+    'semantic_matches', 'suggestions', 'ats_results', 'viz_data', 'rewritten_bullets',
+    'interview_questions', 'keyword_coverage', 'skill_evidence'
+)
+
+# Settings that change result values; the other settings only choose which views are shown
+SCORE_SETTINGS = ('job_title', 'semantic_threshold', 'enable_weighted', 'enable_semantic')
+
+
+def score_settings(settings):
+    """Canonical string of the score-affecting settings."""
+    return json.dumps({name: settings.get(name) for name in SCORE_SETTINGS}, sort_keys=True)
+
+
+def analysis_id(pdf_bytes, job_description, taxonomy, settings):
+    """Snapshot id for an analysis of one resume against one job description with given settings."""
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(pdf_bytes)
+    digest.update(b'\x1f')
+    digest.update(job_description.encode('utf-8'))
+    digest.update(b'\x1f')
+    digest.update(taxonomy.fingerprint().encode('utf-8'))
+    digest.update(b'\x1f')
+    digest.update(score_settings(settings).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _encode(value, arrays):
+    """JSON-safe form of a result value; arrays are moved into the arrays dict."""
+    if isinstance(value, np.ndarray):
+        name = f"array_{len(arrays)}"
+        arrays[name] = value
+        return {'__ndarray__': name}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item, arrays) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item, arrays) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode(item, arrays) for key, item in value.items()}
+    return value
+
+
+def _decode(value, arrays):
+    if isinstance(value, list):
+        return [_decode(item, arrays) for item in value]
+    if isinstance(value, dict):
+        if '__ndarray__' in value:
+            return arrays[value['__ndarray__']]
+        if '__tuple__' in value:
+            return tuple(_decode(item, arrays) for item in value['__tuple__'])
+        return {key: _decode(item, arrays) for key, item in value.items()}
+    return value
+
+
+def snapshot_path(snapshot_id, directory=SNAPSHOT_DIR):
+    """Path of a snapshot file; raises ValueError for malformed ids."""
+    if not SNAPSHOT_ID_PATTERN.match(snapshot_id or ''):
+        raise ValueError(f"Invalid analysis id: {snapshot_id!r}")
+    return os.path.join(directory, f"{snapshot_id}.npz")
+
+
+def load_snapshot(snapshot_id, directory=SNAPSHOT_DIR):
+    """(values, settings) of a saved analysis, or None if it is missing, outdated or unreadable."""
+    try:
+        path = snapshot_path(snapshot_id, directory)
+    except ValueError:
+        return None
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            document = json.loads(data['snapshot'].tobytes().decode('utf-8'))
+            if document.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+                return None
+            arrays = {name: data[name] for name in data.files if name != 'snapshot'}
+        return _decode(document['values'], arrays), document['settings']
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        # Truncated or corrupt file
+        return None
+
+
+def save_snapshot(snapshot_id, values, settings, directory=SNAPSHOT_DIR):
+    """Atomically write an analysis snapshot, keeping values from earlier saves.
+
+    Views that were not computed in this run keep the values saved before, as
+    long as those were computed with the same score-affecting settings.
+    """
+    path = snapshot_path(snapshot_id, directory)
+    previous = load_snapshot(snapshot_id, directory)
+    same_settings = previous is not None and score_settings(previous[1]) == score_settings(settings)
+    merged = dict(previous[0]) if same_settings else {}
+    merged.update((name, values[name]) for name in SNAPSHOT_VALUES if name in values)
+
+    arrays = {}
+    document = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'values': _encode(merged, arrays),
+        'settings': settings
+    }
+    header = np.frombuffer(json.dumps(document, separators=(',', ':')).encode('utf-8'), dtype=np.uint8)
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        np.savez_compressed(f, snapshot=header, **arrays)
+    os.replace(tmp_path, path)
+    return snapshot_id
@@ -0,0 +1,518 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+
+#=================================================================================
+# Compiled skill taxonomy
+#
+# skills_data.py is the source definition. `python taxonomy.py build` compiles it
+# into skills_taxonomy.json, a versioned artifact holding canonical names,
+# categories, aliases, catalog ids and a single-pass matcher. Runtime code only
+# reads that artifact (lazily, on first use) and never writes to disk.
+#=================================================================================
+TAXONOMY_FORMAT_VERSION = 2
+TAXONOMY_ARTIFACT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skills_taxonomy.json")
+# Per-tenant source definitions: taxonomies/<name>.json
+TAXONOMY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "taxonomies")
+DEFAULT_TAXONOMY = "default"
+# Tenant taxonomies kept loaded at once (MAX_RESIDENT_TAXONOMIES overrides)
+MAX_RESIDENT_TAXONOMIES = 32
+
+_NON_TERM_CHARS = re.compile(r'[^\w\s\+\#\.\-]')
+_WHITESPACE = re.compile(r'\s+')
+_PARENTHETICAL = re.compile(r'\(([^)]*)\)')
+_DOMAIN_PREFIX = re.compile(r'^[A-Z][\w ]*:\s+')
+# Parenthetical sub-terms that are qualifiers or everyday words rather than skills.
+_QUALIFIER_TERMS = {'fluent', 'rest', 'docs', 'sheets', 'slides'}
+_MIN_DERIVED_LENGTH = 3
+# Characters that continue a skill token, used as match boundaries instead of \b
+# so that terms such as "C++" and "C#" can match at all.
+_TERM_CHARS = r'\w\+\#'
+
+_default_taxonomy = None
+_default_lock = threading.Lock()
+_registry = None
+
+
+def normalize_term(term):
+    """Normalize a skill term the same way advanced_text_cleaning normalizes text."""
+    term = _NON_TERM_CHARS.sub(' ', term.lower())
+    return _WHITESPACE.sub(' ', term).strip()
+
+
+def source_hash(skills_data, synonyms=None, weights=None, title_weights=None):
+    """Stable content hash of a taxonomy source definition."""
+    payload = json.dumps(
+        [skills_data, synonyms or {}, weights or {}, title_weights or []],
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def derive_aliases(name):
+    """Derive alias terms from a canonical skill name.
+
+    "Version Control (Git, GitHub, GitLab)" yields "version control", "git",
+    "github" and "gitlab"; "Healthcare: HIPAA Compliance" yields "hipaa compliance".
+    """
+    body = _DOMAIN_PREFIX.sub('', name)
+    head = _PARENTHETICAL.sub(' ', body)
+    parts = [body, head]
+    for inner in _PARENTHETICAL.findall(body):
+        parts.extend(inner.split(','))
+
+    slash_parts = head.strip().split('/')
+    if len(slash_parts) > 1 and all(len(part) > 3 and ' ' not in part for part in slash_parts):
+        parts.extend(slash_parts)
+
+    aliases = []
+    for part in parts:
+        term = normalize_term(part)
+        if len(term) >= _MIN_DERIVED_LENGTH and term not in _QUALIFIER_TERMS and term not in aliases:
+            aliases.append(term)
+    return aliases
+
+
+def _skill_terms(name, synonyms):
+    """Terms that should match a canonical skill: its name, derived aliases and synonyms."""
+    terms = []
+    for term in [normalize_term(name)] + derive_aliases(name):
+        if term and term not in terms:
+            terms.append(term)
+    for term in list(terms):
+        for synonym in synonyms.get(term, ()):
+            if synonym not in terms:
+                terms.append(synonym)
+    return terms
+
+
+def _trie_pattern(terms):
+    """Build a regex alternation shaped as a character trie over all terms."""
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = []
+        for char in sorted(key for key in node if key):
+            atom = r'\s+' if char == ' ' else re.escape(char)
+            branches.append(atom + emit(node[char]))
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            if len(branches) == 1:
+                body = '(?:' + body + ')'
+            body += '?'
+        return body
+
+    return emit(trie)
+
+
+def _nested_terms(terms):
+    """Map each term to the other terms that occur inside it as whole words."""
+    term_set = set(terms)
+    nested = {}
+    for term in terms:
+        words = term.split(' ')
+        found = []
+        for start in range(len(words)):
+            for end in range(start + 1, len(words) + 1):
+                if end - start == len(words):
+                    continue
+                candidate = ' '.join(words[start:end])
+                if candidate in term_set and candidate not in found:
+                    found.append(candidate)
+        if found:
+            nested[term] = found
+    return nested
+
+
+class Taxonomy:
+    """Compiled, read-only skill catalog with a single-pass matcher."""
+
+    def __init__(self, categories, skills, skill_categories, aliases, nested, pattern,
+                 source_hash="", name=DEFAULT_TAXONOMY, weights=None, title_weights=None):
+        self.name = name
+        self.categories = categories
+        self.skills = skills
+        self.skill_categories = skill_categories
+        self.aliases = aliases
+        self.nested = nested
+        self.pattern = pattern
+        self.source_hash = source_hash
+        # Category weights for smart scoring; None means the built-in defaults.
+        self.weights = weights
+        self.title_weights = title_weights or []
+        self._matcher = None
+        self._ids = None
+        self._embeddings = None
+        self._encoder = None
+        self._embedding_lock = threading.Lock()
+
+    @property
+    def matcher(self):
+        """Compiled matcher, built on first use."""
+        if self._matcher is None:
+            self._matcher = re.compile(
+                rf'(?<![{_TERM_CHARS}])({self.pattern})(?![{_TERM_CHARS}])', re.IGNORECASE
+            )
+        return self._matcher
+
+    def skill_id(self, category, skill):
+        """Catalog id for a canonical skill within a category, or None."""
+        if self._ids is None:
+            self._ids = {
+                (self.categories[cat], name): skill_id
+                for skill_id, (name, cat) in enumerate(zip(self.skills, self.skill_categories))
+            }
+        return self._ids.get((category, skill))
+
+    def fingerprint(self):
+        """Content key used by the analysis pipeline memo."""
+        return f"{self.name}:{self.source_hash}"
+
+    def category_of(self, skill_id):
+        return self.categories[self.skill_categories[skill_id]]
+
+    def embedding_index(self, encode):
+        """Unit-normalized embeddings for every catalog skill, indexed by skill id.
+
+        Computed once per taxonomy with the given encoder (e.g. SentenceTransformer.encode).
+        """
+        if self._embeddings is None:
+            with self._embedding_lock:
+                if self._embeddings is None:
+                    import numpy as np
+
+                    vectors = np.asarray(encode(self.skills), dtype=np.float32)
+                    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+                    self._encoder = encode
+                    self._embeddings = vectors / np.maximum(norms, 1e-12)
+        return self._embeddings
+
+    def memory_bytes(self):
+        """Approximate resident size of this taxonomy, including its embedding index."""
+        size = _deep_sizeof([self.categories, self.skills, self.skill_categories,
+                             self.aliases, self.nested, self.pattern, self.weights, self.title_weights])
+        if self._ids is not None:
+            size += _deep_sizeof(self._ids)
+        if self._embeddings is not None:
+            size += self._embeddings.nbytes
+        return size
+
+    def _hits(self, match):
+        """(skill_id, term, start, end) for a matched term and the terms nested in it."""
+        term = _WHITESPACE.sub(' ', match.group(1).lower())
+        for skill_id in self.aliases.get(term, ()):
+            yield skill_id, term, match.start(1), match.end(1)
+        for inner in self.nested.get(term, ()):
+            for skill_id in self.aliases[inner]:
+                yield skill_id, inner, match.start(1), match.end(1)
+
+    def find(self, text):
+        """Yield (skill_id, term, start, end) for every catalog term found in text.
+
+        The matcher consumes the longest term at each position, so terms that
+        overlap its end ("data analysis" in "big data analysis") are found by
+        matching again from each word start inside the match.
+        """
+        if not self.pattern:
+            return
+        matcher = self.matcher
+        for match in matcher.finditer(text):
+            yield from self._hits(match)
+            end = match.end(1)
+            for gap in _WHITESPACE.finditer(text, match.start(1), end):
+                overlap = matcher.match(text, gap.end())
+                # Shorter terms are nested in the match and were already reported
+                if overlap is not None and overlap.end(1) > end:
+                    yield from self._hits(overlap)
+
+    def match(self, text):
+        """Return {category: [canonical skills]} found in text, in catalog order."""
+        found = sorted({skill_id for skill_id, _, _, _ in self.find(text)})
+        matched_skills = {}
+        for skill_id in found:
+            matched_skills.setdefault(self.category_of(skill_id), []).append(self.skills[skill_id])
+        return matched_skills
+
+    def to_artifact(self):
+        return {
+            'format_version': TAXONOMY_FORMAT_VERSION,
+            'name': self.name,
+            'source_hash': self.source_hash,
+            'categories': self.categories,
+            'skills': [[name, cat] for name, cat in zip(self.skills, self.skill_categories)],
+            'aliases': self.aliases,
+            'nested': self.nested,
+            'matcher': self.pattern,
+            'weights': self.weights,
+            'title_weights': self.title_weights
+        }
+
+    @classmethod
+    def from_artifact(cls, data):
+        if data.get('format_version') != TAXONOMY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported taxonomy format version: {data.get('format_version')}")
+        return cls(
+            categories=data['categories'],
+            skills=[name for name, _ in data['skills']],
+            skill_categories=[cat for _, cat in data['skills']],
+            aliases=data['aliases'],
+            nested=data['nested'],
+            pattern=data['matcher'],
+            source_hash=data.get('source_hash', ""),
+            name=data.get('name', DEFAULT_TAXONOMY),
+            weights=data.get('weights'),
+            title_weights=data.get('title_weights')
+        )
+
+
+def compile_taxonomy(skills_data, synonyms=None, name=DEFAULT_TAXONOMY, weights=None, title_weights=None):
+    """Compile a {category: [skills]} source definition into a Taxonomy.
+
+    synonyms maps a canonical skill or derived sub-term to extra spellings; they
+    are compiled into the same matcher as the canonical names. weights maps
+    categories to smart-scoring weights and title_weights is a list of
+    {"keywords": [...], "weights": {...}} overrides applied by job title.
+    """
+    normalized_synonyms = {}
+    for term, spellings in (synonyms or {}).items():
+        normalized_synonyms.setdefault(normalize_term(term), []).extend(
+            normalize_term(spelling) for spelling in spellings
+        )
+
+    categories = list(skills_data)
+    skills = []
+    skill_categories = []
+    aliases = {}
+
+    for cat_index, category in enumerate(categories):
+        for skill in skills_data[category]:
+            skill_id = len(skills)
+            skills.append(skill)
+            skill_categories.append(cat_index)
+            for term in _skill_terms(skill, normalized_synonyms):
+                ids = aliases.setdefault(term, [])
+                if skill_id not in ids:
+                    ids.append(skill_id)
+
+    terms = sorted(aliases)
+    return Taxonomy(
+        categories=categories,
+        skills=skills,
+        skill_categories=skill_categories,
+        aliases=aliases,
+        nested=_nested_terms(terms),
+        pattern=_trie_pattern(terms),
+        source_hash=source_hash(skills_data, synonyms, weights, title_weights),
+        name=name,
+        weights=weights,
+        title_weights=title_weights
+    )
+
+
+def read_taxonomy(path):
+    """Load a compiled taxonomy artifact from disk."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return Taxonomy.from_artifact(json.load(f))
+
+
+def write_taxonomy(taxonomy, path):
+    """Atomically write a compiled taxonomy artifact."""
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(taxonomy.to_artifact(), f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def load_taxonomy():
+    """Return the default taxonomy, loading the compiled artifact on first use.
+
+    Falls back to compiling skills_data in memory when the artifact is missing or
+    was built from a different source, without writing anything to disk.
+    """
+    global _default_taxonomy
+    if _default_taxonomy is not None:
+        return _default_taxonomy
+
+    with _default_lock:
+        if _default_taxonomy is None:
+            from skills_data import skills_data, skill_synonyms
+
+            taxonomy = None
+            try:
+                taxonomy = read_taxonomy(TAXONOMY_ARTIFACT)
+            except (OSError, ValueError, KeyError):
+                pass
+            if taxonomy is None or taxonomy.source_hash != source_hash(skills_data, skill_synonyms):
+                taxonomy = compile_taxonomy(skills_data, skill_synonyms)
+            _default_taxonomy = taxonomy
+    return _default_taxonomy
+
+
+def compile_taxonomy_source(path, name=None):
+    """Compile a tenant source file: {"skills": ..., "synonyms": ..., "weights": ..., "title_weights": ...}."""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = json.load(f)
+    return compile_taxonomy(
+        source['skills'],
+        source.get('synonyms'),
+        name=name or os.path.splitext(os.path.basename(path))[0],
+        weights=source.get('weights'),
+        title_weights=source.get('title_weights')
+    )
+
+
+class TaxonomyRegistry:
+    """Named taxonomies that load, compile and hot-reload independently.
+
+    Each tenant source lives at <directory>/<name>.json. get() never blocks on a
+    rebuild: when a source file changes, the current taxonomy keeps serving while
+    a background thread compiles the new one and swaps it in; a version that
+    fails to compile is not retried until the file changes again. In-flight
+    requests keep the Taxonomy object they already hold. At most max_resident
+    tenant taxonomies stay loaded (None for no limit); the least recently used
+    one is evicted first.
+    """
+
+    def __init__(self, directory=TAXONOMY_DIR, max_resident=MAX_RESIDENT_TAXONOMIES):
+        self.directory = directory
+        self.max_resident = max_resident
+        self._entries = OrderedDict()  # name -> (taxonomy, source mtime)
+        self._rebuilding = set()
+        self._failed = {}  # name -> source mtime that failed to compile, retried once the file changes
+        self._lock = threading.Lock()
+
+    def _source_path(self, name):
+        return os.path.join(self.directory, f"{name}.json")
+
+    def names(self):
+        """All selectable taxonomy names, default first."""
+        try:
+            tenants = sorted(
+                os.path.splitext(filename)[0] for filename in os.listdir(self.directory)
+                if filename.endswith('.json')
+            )
+        except OSError:
+            tenants = []
+        return [DEFAULT_TAXONOMY] + [name for name in tenants if name != DEFAULT_TAXONOMY]
+
+    def get(self, name=None):
+        """Return the current taxonomy for a tenant, loading it on first use."""
+        if not name or name == DEFAULT_TAXONOMY:
+            return load_taxonomy()
+
+        path = self._source_path(name)
+        mtime = os.stat(path).st_mtime_ns
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                self._entries.move_to_end(name)
+                taxonomy, loaded_mtime = entry
+                if loaded_mtime != mtime and self._failed.get(name) != mtime and name not in self._rebuilding:
+                    self._rebuilding.add(name)
+                    threading.Thread(
+                        target=self._rebuild, args=(name, path, mtime, taxonomy), daemon=True
+                    ).start()
+                return taxonomy
+
+        taxonomy = compile_taxonomy_source(path, name)
+        with self._lock:
+            taxonomy = self._entries.setdefault(name, (taxonomy, mtime))[0]
+            self._entries.move_to_end(name)
+            self._evict()
+        return taxonomy
+
+    def _rebuild(self, name, path, mtime, previous):
+        try:
+            taxonomy = compile_taxonomy_source(path, name)
+            if previous._encoder is not None:
+                taxonomy.embedding_index(previous._encoder)
+            with self._lock:
+                self._failed.pop(name, None)
+                if name in self._entries:
+                    self._entries[name] = (taxonomy, mtime)
+        except (OSError, ValueError, KeyError) as e:
+            with self._lock:
+                self._failed[name] = mtime
+            print(f"Failed to reload taxonomy {name}: {e}", file=sys.stderr)
+        finally:
+            with self._lock:
+                self._rebuilding.discard(name)
+
+    def _evict(self):
+        if self.max_resident is None:
+            return
+        while len(self._entries) > self.max_resident:
+            self._entries.popitem(last=False)
+
+    def memory_report(self):
+        """Approximate bytes held by each resident taxonomy."""
+        with self._lock:
+            resident = {name: taxonomy for name, (taxonomy, _) in self._entries.items()}
+        if _default_taxonomy is not None:
+            resident[DEFAULT_TAXONOMY] = _default_taxonomy
+        return {name: taxonomy.memory_bytes() for name, taxonomy in resident.items()}
+
+
+def taxonomy_registry():
+    """Process-wide registry of tenant taxonomies."""
+    global _registry
+    if _registry is None:
+        with _default_lock:
+            if _registry is None:
+                _registry = TaxonomyRegistry(
+                    max_resident=int(os.environ.get('MAX_RESIDENT_TAXONOMIES', MAX_RESIDENT_TAXONOMIES))
+                )
+    return _registry
+
+
+def get_taxonomy(name=None):
+    """Return the taxonomy selected for a request, by tenant name."""
+    return taxonomy_registry().get(name)
+
+
+def _deep_sizeof(obj, seen=None):
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(key, seen) + _deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def build(output=TAXONOMY_ARTIFACT):
+    """Compile skills_data.py into the taxonomy artifact."""
+    from skills_data import skills_data, skill_synonyms
+
+    taxonomy = compile_taxonomy(skills_data, skill_synonyms)
+    write_taxonomy(taxonomy, output)
+    print(f"Compiled {len(taxonomy.skills)} skills ({len(taxonomy.aliases)} terms) to {output}")
+    return taxonomy
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Skill taxonomy tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Compile skills_data.py into the taxonomy artifact")
+    build_parser.add_argument("--output", default=TAXONOMY_ARTIFACT)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build(args.output)
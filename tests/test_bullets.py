@@ -0,0 +1,57 @@
+import re
+
+from bullets import BASE_IMPACT_SCORE, MAX_IMPACT_SCORE, STRONG_VERBS, extract_bullets, score_bullets, weakest_bullets
+
+
+def reference_score(bullet):
+    """Per-bullet scoring the vectorized version replaced (verbs as whole words)."""
+    score = BASE_IMPACT_SCORE
+    if re.search(r'\d+%', bullet):
+        score += 2
+    if re.search(r'\$\d+', bullet):
+        score += 2
+    if re.search(r'\d+', bullet):
+        score += 1
+    if re.search(r'\b(?:' + '|'.join(STRONG_VERBS) + r')\b', bullet, re.IGNORECASE):
+        score += 1
+    if 10 <= len(bullet.split()) <= 25:
+        score += 1
+    return min(score, MAX_IMPACT_SCORE)
+
+
+BULLETS = [
+    "Responsible for the weekly report",
+    "Led a team of 6 engineers to cut cloud spend by 30% ($120K a year) across three regions",
+    "Enabled other teams to ship features faster with shared tooling",
+    "Improved checkout conversion by 12% through A/B testing of the payment flow",
+    "Worked on various internal projects with different stakeholders in the company during 2021",
+    "Built dashboards",
+]
+
+
+def test_scores_match_per_bullet_reference():
+    assert score_bullets(BULLETS).tolist() == [reference_score(bullet) for bullet in BULLETS]
+
+
+def test_verbs_match_whole_words_only():
+    # "Enabled" contains "led" but is not a strong verb
+    assert score_bullets(["Enabled other teams to ship features"]).tolist() == [BASE_IMPACT_SCORE]
+
+
+def test_no_bullets():
+    assert score_bullets([]).tolist() == []
+
+
+def test_weakest_bullets_come_first_in_document_order():
+    resume = "EXPERIENCE\n" + "\n".join(f"• {bullet}" for bullet in BULLETS) + "\nEDUCATION\nBSc"
+    bullets = extract_bullets(resume)
+    weakest = weakest_bullets(resume, limit=3)
+    scores = [score for _, score in weakest]
+    assert scores == sorted(scores)
+    assert all(score <= min(reference_score(bullet) for bullet in bullets if bullet not in dict(weakest))
+               for score in scores)
+
+
+def test_long_resume_scores_match_per_bullet_reference():
+    bullets = [f"{bullet} in project {index}" for index in range(20) for bullet in BULLETS]  # 120 bullets
+    assert score_bullets(bullets).tolist() == [reference_score(bullet) for bullet in bullets]
@@ -0,0 +1,62 @@
+import json
+
+import cohort
+from cohort import CohortAggregator, cohort_event
+
+DETAILS = {
+    'Languages': {'required': ['Python', 'Go'], 'matched': ['Python'], 'missing': ['Go']},
+    'Cloud': {'required': ['AWS'], 'matched': ['AWS'], 'missing': []},
+}
+
+
+def aggregator(tmp_path):
+    return CohortAggregator(str(tmp_path / "cohorts.json"), str(tmp_path / "events.jsonl"))
+
+
+def event(score, context="job-a"):
+    return cohort_event(context, "Backend Engineer\nWe need Go", score, score + 5, DETAILS)
+
+
+def test_events_are_aggregated_per_context(tmp_path):
+    cohorts = aggregator(tmp_path)
+    for score in (40, 60, 80):
+        cohorts.record(event(score))
+    cohorts.record(event(10, context="job-b"))
+    report = cohorts.export("job-a")
+    assert report['label'] == "Backend Engineer"
+    assert report['candidates'] == 3
+    assert report['basic_score']['p50'] == 60
+    assert report['blocking_skills'] == [{'category': 'Languages', 'skill': 'Go', 'candidates': 3}]
+    assert [context for context, _ in cohorts.ranked_cohorts()] == ["job-b", "job-a"]
+
+
+def test_state_is_saved_periodically_not_per_event(tmp_path, monkeypatch):
+    monkeypatch.setattr(cohort, 'SAVE_EVERY', 3)
+    cohorts = aggregator(tmp_path)
+    cohorts.record(event(40))
+    cohorts.record(event(50))
+    assert not (tmp_path / "cohorts.json").exists()
+    cohorts.record(event(60))
+    assert json.loads((tmp_path / "cohorts.json").read_text())['events'] == 3
+
+
+def test_processes_share_the_log(tmp_path):
+    first, second = aggregator(tmp_path), aggregator(tmp_path)
+    first.record(event(40))
+    second.record(event(60))
+    first.save()
+    assert first.export()['events'] == second.export()['events'] == 2
+    # A saved aggregate behind the log is caught up on load
+    second.record(event(80))
+    reloaded = aggregator(tmp_path)
+    assert reloaded.export("job-a")['candidates'] == 3
+    assert reloaded.export() == second.export()
+
+
+def test_rebuild_matches_incremental_aggregate(tmp_path):
+    cohorts = aggregator(tmp_path)
+    for score in (20, 45, 70, 95):
+        cohorts.record(event(score, context=f"job-{score % 2}"))
+    incremental = cohorts.export()
+    assert cohorts.rebuild() == 4
+    assert cohorts.export() == incremental
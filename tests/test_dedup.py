@@ -0,0 +1,41 @@
+import random
+
+from dedup import DuplicateIndex, minhash_signature
+
+WORDS = ("python sql docker kubernetes led built designed reduced latency pipelines team platform "
+         "revenue customers dashboards services engineer senior data api cloud").split()
+
+
+def resume(seed, words=300):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_near_duplicate_is_found_in_the_same_context(tmp_path):
+    index = DuplicateIndex(str(tmp_path / "index.jsonl"))
+    text = resume(1)
+    index.add('first', minhash_signature(text), 'job-a')
+
+    near_duplicate = text + " Updated phone number."
+    match = index.find(minhash_signature(near_duplicate), 'job-a')
+    assert match is not None and match[0] == 'first' and match[1] >= 0.9
+    assert index.find(minhash_signature(near_duplicate), 'job-b') is None
+    assert index.find(minhash_signature(resume(2)), 'job-a') is None
+
+
+def test_short_text_has_no_signature():
+    assert minhash_signature("Python developer") is None
+
+
+def test_add_is_idempotent_and_persisted(tmp_path):
+    path = tmp_path / "index.jsonl"
+    index = DuplicateIndex(str(path))
+    signature = minhash_signature(resume(1))
+    index.add('first', signature, 'job-a')
+    index.add('first', signature, 'job-a')
+    assert len(path.read_text().splitlines()) == 1
+    assert len(index.entries) == 1
+
+    reloaded = DuplicateIndex(str(path))
+    assert reloaded.keys == {'first'}
+    assert reloaded.find(signature, 'job-a') == ('first', 1.0)
@@ -0,0 +1,40 @@
+from datetime import date
+
+from experience import build_timeline, date_range_months, merge_intervals, parse_date_token
+from text_features import scan_document
+
+TODAY = date(2024, 6, 15)
+
+
+def test_merge_intervals():
+    assert merge_intervals([]) == []
+    assert merge_intervals([(10, 20), (0, 5), (15, 30)]) == [(0, 5), (10, 30)]
+    # Adjacent months join; a one-month gap does not
+    assert merge_intervals([(0, 5), (6, 8), (10, 12)]) == [(0, 8), (10, 12)]
+    assert merge_intervals([(0, 20), (3, 4)]) == [(0, 20)]
+
+
+def test_parse_date_token():
+    assert parse_date_token('Jan 2019') == (2019, 1)
+    assert parse_date_token('september, 2018') == (2018, 9)
+    assert parse_date_token('03/2017') == (2017, 3)
+    assert parse_date_token('2017-11') == (2017, 11)
+    assert parse_date_token('2015') == (2015, None)
+
+
+def test_date_range_months():
+    assert date_range_months('2015', '2016', TODAY) == (2015 * 12, 2016 * 12 + 11)
+    assert date_range_months('Jan 2024', 'Present', TODAY) == (2024 * 12, 2024 * 12 + 5)
+    # Year-only ends are capped at the current month
+    assert date_range_months('Jan 2024', '2024', TODAY) == (2024 * 12, 2024 * 12 + 5)
+    assert date_range_months('Jun 2020', 'Jan 2020', TODAY) is None
+    assert date_range_months('13/2020', '2021', TODAY) is None
+
+
+def test_concurrent_roles_are_not_double_counted():
+    text = "Engineer, Acme  Jan 2020 - Dec 2021\nAdvisor, Beta  Jun 2021 - Present\n"
+    timeline = build_timeline(text, scan_document(text).date_ranges, TODAY)
+    assert [role['title'] for role in timeline['roles']] == ['Engineer, Acme', 'Advisor, Beta']
+    assert [role['months'] for role in timeline['roles']] == [24, 37]
+    assert timeline['roles'][1]['current'] and timeline['roles'][1]['end'] == 'Present'
+    assert timeline['total_months'] == 54
@@ -0,0 +1,54 @@
+import nltk
+
+import keywords
+from keywords import FALLBACK_STOPWORDS, IdfTable, extract_terms, term_buckets
+
+JD = "We need a Senior Data Engineer with CI/CD experience; Node.js and C++ are a plus."
+
+
+def tables(tmp_path):
+    return [IdfTable(str(tmp_path / "idf.npz"), str(tmp_path / "idf.jsonl")) for _ in range(2)]
+
+
+def test_extract_terms_keeps_technical_tokens():
+    terms = extract_terms(JD)
+    assert {'ci/cd', 'node.js', 'c++', 'senior data', 'data engineer'} <= set(terms)
+    # Stopwords break phrases and never appear on their own
+    assert 'with' not in terms and 'engineer ci/cd' not in terms
+
+
+class MissingCorpus:
+    def words(self, *args):
+        raise LookupError("stopwords")
+
+
+def test_missing_corpus_falls_back_without_downloading(monkeypatch):
+    def download(*args, **kwargs):
+        raise AssertionError("stopwords must not be downloaded")
+
+    monkeypatch.setattr(nltk, 'download', download)
+    monkeypatch.setattr(nltk.corpus, 'stopwords', MissingCorpus())
+    monkeypatch.setattr(keywords, '_stopword_set', None)
+    assert keywords.stopword_set() is FALLBACK_STOPWORDS
+    assert 'with' not in extract_terms(JD)
+
+
+def test_documents_are_counted_once_across_tables(tmp_path):
+    first, second = tables(tmp_path)
+    assert first.add_document(JD)
+    assert not second.add_document(JD)
+    assert second.add_document("Frontend developer, React and TypeScript")
+    buckets = term_buckets(['ci/cd'])
+    assert first.idf(buckets) == second.idf(buckets)
+    assert first.documents == second.documents == 2
+
+
+def test_snapshot_resumes_from_the_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(keywords, 'COMPACT_EVERY', 2)
+    first, _ = tables(tmp_path)
+    for index in range(3):
+        first.add_document(f"{JD} Team {index}.")
+    assert (tmp_path / "idf.npz").exists()
+    reloaded, _ = tables(tmp_path)
+    assert reloaded.documents == 3
+    assert (reloaded.document_frequency == first.document_frequency).all()
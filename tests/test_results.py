@@ -0,0 +1,89 @@
+import sys
+
+import pytest
+
+from results import AnalysisResult
+from taxonomy import load_taxonomy
+
+
+def category_skills(taxonomy, category_id):
+    return [skill for skill, category in zip(taxonomy.skills, taxonomy.skill_categories) if category == category_id]
+
+
+def sample_values(taxonomy, category_count=6):
+    """Pipeline values in the shape calculate_match_score and friends produce."""
+    details, semantic_matches, radar, scores, bubbles = {}, {}, {}, {}, []
+    for category_id in range(category_count):
+        category = taxonomy.categories[category_id]
+        skills = category_skills(taxonomy, category_id)[:8]
+        required, resume = skills[:6], skills[2:8]
+        matched = [skill for skill in required if skill in resume]
+        missing = [skill for skill in required if skill not in resume]
+        details[category] = {'required': required, 'matched': matched, 'missing': missing}
+        semantic_matches[category] = [
+            {'jd_skill': jd_skill, 'resume_skill': resume[-1], 'similarity': 0.71 + 0.01 * index}
+            for index, jd_skill in enumerate(missing)
+        ]
+        score = round(len(matched) / len(required) * 100, 1)
+        radar[category] = {'required': 100, 'resume': score}
+        scores[category] = score
+        bubbles.append({
+            'category': category,
+            'count': len(missing),
+            'importance': 10 - len(missing),
+            'priority': 'Medium',
+            'skills': ', '.join(missing[:3])
+        })
+    return {
+        'basic_score': 66.67,
+        'weighted_score': 71.2,
+        'details': details,
+        'semantic_matches': semantic_matches,
+        'viz_data': {'radar_data': radar, 'category_scores': scores, 'bubble_data': bubbles}
+    }
+
+
+def deep_size(value, seen=None):
+    """Bytes held by value and everything it references."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(key, seen) + deep_size(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, '__slots__'):
+        size += sum(deep_size(getattr(value, slot), seen) for slot in value.__slots__)
+    return size
+
+
+def test_round_trip_is_lossless():
+    taxonomy = load_taxonomy()
+    values = sample_values(taxonomy)
+    restored = AnalysisResult.from_values(values, taxonomy).to_values(taxonomy)
+    assert restored == values
+    radar = next(iter(restored['viz_data']['radar_data'].values()))
+    assert type(radar['required']) is int
+
+
+def test_optional_parts_stay_absent():
+    taxonomy = load_taxonomy()
+    values = sample_values(taxonomy)
+    del values['semantic_matches'], values['viz_data']
+    assert AnalysisResult.from_values(values, taxonomy).to_values(taxonomy) == values
+
+
+def test_unknown_skill_is_rejected():
+    taxonomy = load_taxonomy()
+    values = sample_values(taxonomy)
+    next(iter(values['details'].values()))['missing'].append('Not A Real Skill')
+    with pytest.raises(ValueError):
+        AnalysisResult.from_values(values, taxonomy)
+
+
+def test_compact_result_is_several_times_smaller():
+    taxonomy = load_taxonomy()
+    values = sample_values(taxonomy)
+    assert deep_size(AnalysisResult.from_values(values, taxonomy)) * 3 <= deep_size(values)
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from rewriter import OpenAICompatibleBackend, RewriteCache, RewriteError, StubRewriteServer, rewrite_bullets, stub_rewrite
+
+BULLETS = [
+    "built a reporting dashboard for the sales team",
+    "migrated nightly jobs to a new scheduler",
+    "reviewed pull requests for the payments service",
+]
+MISSING = ["Docker", "Kubernetes"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return RewriteCache(path=str(tmp_path / "rewrite_cache.jsonl"))
+
+
+def test_batch_is_rewritten_in_one_request_in_order(cache):
+    with StubRewriteServer() as stub:
+        backend = OpenAICompatibleBackend(stub.url, timeout=5)
+        rewritten = rewrite_bullets(backend, BULLETS, MISSING, cache)
+        assert stub.requests == 1
+    assert rewritten == [stub_rewrite(bullet, MISSING) for bullet in BULLETS]
+
+
+def test_cached_bullets_are_not_sent_again(cache, tmp_path):
+    with StubRewriteServer() as stub:
+        backend = OpenAICompatibleBackend(stub.url, timeout=5)
+        first = rewrite_bullets(backend, BULLETS[:2], MISSING, cache)
+        rewritten = rewrite_bullets(backend, BULLETS, MISSING, cache)
+        assert stub.requests == 2  # the second request only carried the new bullet
+        assert rewritten[:2] == first
+
+        # The cache survives a restart
+        reloaded = RewriteCache(path=cache.path)
+        rewrite_bullets(backend, BULLETS, MISSING, reloaded)
+        assert stub.requests == 2
+
+
+def test_cache_key_keeps_missing_skill_order():
+    bullet = BULLETS[0]
+    assert RewriteCache.key(bullet, ["Docker", "Kubernetes"]) != RewriteCache.key(bullet, ["Kubernetes", "Docker"])
+    assert stub_rewrite(bullet, ["Docker", "Kubernetes"]) != stub_rewrite(bullet, ["Kubernetes", "Docker"])
+
+
+def test_slow_backend_fails_within_the_timeout(cache):
+    with StubRewriteServer(delay=2.0) as stub:
+        backend = OpenAICompatibleBackend(stub.url, timeout=0.5)
+        start = time.monotonic()
+        with pytest.raises((RewriteError, OSError)):
+            rewrite_bullets(backend, BULLETS, MISSING, cache)
+        assert time.monotonic() - start < 1.5
+    assert all(cache.get(RewriteCache.key(bullet, MISSING)) is None for bullet in BULLETS)
+
+
+def test_trickling_backend_hits_the_batch_deadline(cache):
+    # Every byte arrives well within the socket timeout, the whole answer does not
+    with StubRewriteServer(trickle=0.05) as stub:
+        backend = OpenAICompatibleBackend(stub.url, timeout=0.5)
+        start = time.monotonic()
+        with pytest.raises(RewriteError):
+            rewrite_bullets(backend, BULLETS, MISSING, cache)
+        assert time.monotonic() - start < 1.5
@@ -0,0 +1,80 @@
+import pytest
+
+import skill_index as skill_index_module
+from skill_index import SkillIndex, parse_query
+from taxonomy import load_taxonomy
+
+CANDIDATES = {
+    'python-java': ['Python', 'Java'],
+    'python-sql': ['Python', 'SQL'],
+    'java': ['Java'],
+    'cpp-sql': ['C++', 'SQL'],
+}
+
+
+def filled_index(directory):
+    taxonomy = load_taxonomy()
+    index = SkillIndex(taxonomy, str(directory))
+    category = taxonomy.categories[0]
+    for key, skills in CANDIDATES.items():
+        index.add(key, {category: skills})
+    return index
+
+
+def test_parse_query_precedence():
+    assert parse_query("Python") == ('skill', 'Python')
+    assert parse_query("A OR B AND NOT C") == ('or', ('skill', 'A'), ('and', ('skill', 'B'), ('not', ('skill', 'C'))))
+    assert parse_query("(A OR B) AND C") == ('and', ('or', ('skill', 'A'), ('skill', 'B')), ('skill', 'C'))
+    assert parse_query("NOT NOT A") == ('not', ('not', ('skill', 'A')))
+
+
+def test_parse_query_names():
+    assert parse_query("Machine Learning AND SQL") == ('and', ('skill', 'Machine Learning'), ('skill', 'SQL'))
+    assert parse_query('"Research AND Development" OR R') == (
+        'or', ('skill', 'Research AND Development'), ('skill', 'R'))
+    # Operators are upper-case only
+    assert parse_query("Python and SQL") == ('skill', 'Python and SQL')
+
+
+@pytest.mark.parametrize("query", ["", "(Python", "Python)", "Python AND", "AND Python", "NOT"])
+def test_parse_query_rejects_malformed_queries(query):
+    with pytest.raises(ValueError):
+        parse_query(query)
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Python", ['python-java', 'python-sql']),
+    ("Python AND SQL", ['python-sql']),
+    ("Python OR SQL", ['python-java', 'python-sql', 'cpp-sql']),
+    ("Java AND NOT Python", ['java']),
+    ("NOT Java", ['python-sql', 'cpp-sql']),
+    ("(Java OR C++) AND NOT (Python AND Java)", ['java', 'cpp-sql']),
+    ("python AND sql", ['python-sql']),
+])
+def test_boolean_queries(tmp_path, query, expected):
+    index = filled_index(tmp_path)
+    assert sorted(index.search(query)) == sorted(expected)
+
+
+def test_unknown_skill_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        filled_index(tmp_path).search("Underwater Basket Weaving")
+
+
+def test_search_is_newest_first_and_limited(tmp_path):
+    assert filled_index(tmp_path).search("SQL", limit=1) == ['cpp-sql']
+
+
+def test_two_writers_share_ids_and_compactions(tmp_path, monkeypatch):
+    monkeypatch.setattr(skill_index_module, 'DELTA_COMPACT_SIZE', 3)
+    taxonomy = load_taxonomy()
+    category = taxonomy.categories[0]
+    first, second = SkillIndex(taxonomy, str(tmp_path)), SkillIndex(taxonomy, str(tmp_path))
+    ids = [index.add(key, {category: skills})
+           for index, (key, skills) in zip([first, second, first, second], CANDIDATES.items())]
+    assert ids == [0, 1, 2, 3]
+    assert second.add('python-java', {category: ['Python']}) == 0
+    for index in (first, second, SkillIndex(taxonomy, str(tmp_path))):
+        assert sorted(index.search("SQL")) == ['cpp-sql', 'python-sql']
+        assert index.search("Java AND NOT Python") == ['java']
+        assert index.candidates == list(CANDIDATES)
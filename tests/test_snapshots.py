@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from dedup import context_key
+from snapshots import analysis_id, load_snapshot, save_snapshot, snapshot_path
+from taxonomy import load_taxonomy
+
+SNAPSHOT_ID = "0123456789abcdef"
+
+
+def test_values_round_trip(tmp_path):
+    values = {'basic_score': 42.5, 'skill_similarity': np.eye(3), 'details': {'Languages': {'missing': ['French']}}}
+    save_snapshot(SNAPSHOT_ID, values, {'tenant': 'default'}, str(tmp_path))
+    loaded, settings = load_snapshot(SNAPSHOT_ID, str(tmp_path))
+    assert loaded['basic_score'] == 42.5
+    assert loaded['details'] == values['details']
+    np.testing.assert_array_equal(loaded['skill_similarity'], np.eye(3))
+    assert settings == {'tenant': 'default'}
+
+
+@pytest.mark.parametrize("keep", [0, 0.1, 0.5, 0.95])
+def test_truncated_snapshot_loads_as_missing(tmp_path, keep):
+    save_snapshot(SNAPSHOT_ID, {'basic_score': 1.0, 'skill_similarity': np.eye(2)}, {}, str(tmp_path))
+    path = snapshot_path(SNAPSHOT_ID, str(tmp_path))
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:int(len(data) * keep)])
+    assert load_snapshot(SNAPSHOT_ID, str(tmp_path)) is None
+    # A corrupt snapshot is replaced by the next save
+    save_snapshot(SNAPSHOT_ID, {'basic_score': 2.0}, {}, str(tmp_path))
+    assert load_snapshot(SNAPSHOT_ID, str(tmp_path))[0] == {'basic_score': 2.0}
+
+
+SETTINGS = {'job_title': '', 'semantic_threshold': 0.7, 'enable_weighted': True, 'enable_semantic': True,
+            'enable_ats': True}
+
+
+@pytest.mark.parametrize("change", [{'job_title': 'Data Engineer'}, {'semantic_threshold': 0.8},
+                                    {'enable_weighted': False}, {'enable_semantic': False}])
+def test_score_settings_change_the_id_and_context(change):
+    taxonomy = load_taxonomy()
+    changed = dict(SETTINGS, **change)
+    assert analysis_id(b"%PDF", "Data engineer", taxonomy, changed) != analysis_id(
+        b"%PDF", "Data engineer", taxonomy, SETTINGS)
+    assert context_key("Data engineer", taxonomy, changed) != context_key("Data engineer", taxonomy, SETTINGS)
+
+
+def test_display_settings_keep_the_id():
+    taxonomy = load_taxonomy()
+    assert (analysis_id(b"%PDF", "Data engineer", taxonomy, dict(SETTINGS, enable_ats=False))
+            == analysis_id(b"%PDF", "Data engineer", taxonomy, SETTINGS))
+
+
+def test_values_from_other_score_settings_are_not_merged(tmp_path):
+    save_snapshot(SNAPSHOT_ID, {'weighted_score': 50.0, 'suggestions': ['a']}, SETTINGS, str(tmp_path))
+    save_snapshot(SNAPSHOT_ID, {'basic_score': 40.0}, dict(SETTINGS, enable_ats=False), str(tmp_path))
+    merged = {'weighted_score': 50.0, 'suggestions': ['a'], 'basic_score': 40.0}
+    assert load_snapshot(SNAPSHOT_ID, str(tmp_path))[0] == merged
+    save_snapshot(SNAPSHOT_ID, {'weighted_score': 60.0}, dict(SETTINGS, job_title='Data Engineer'), str(tmp_path))
+    assert load_snapshot(SNAPSHOT_ID, str(tmp_path))[0] == {'weighted_score': 60.0}
@@ -0,0 +1,86 @@
+import json
+import os
+import random
+import re
+import time
+
+import taxonomy as taxonomy_module
+from skills_data import skills_data
+from taxonomy import TaxonomyRegistry, compile_taxonomy_source, load_taxonomy, normalize_term
+
+
+def baseline_match(text):
+    """The per-skill regex matching the compiled matcher replaced: {(category, skill)}."""
+    return {(category, skill) for category, skills in skills_data.items() for skill in skills
+            if re.search(r'\b' + re.escape(skill.lower()) + r'\b', text)}
+
+
+def compiled_match(text):
+    return {(category, skill) for category, skills in load_taxonomy().match(text).items() for skill in skills}
+
+
+def overlapping_texts():
+    """Pairs of catalog names where the end of one is the start of the other, e.g. "big data analysis"."""
+    terms = [normalize_term(skill) for skills in skills_data.values() for skill in skills]
+    texts = ["big data analysis"]
+    for first in terms:
+        first_words = first.split()
+        for second in terms:
+            second_words = second.split()
+            for shared in range(1, min(len(first_words), len(second_words))):
+                if first != second and first_words[-shared:] == second_words[:shared]:
+                    texts.append(' '.join(first_words + second_words[shared:]))
+    return texts
+
+
+def test_overlapping_terms_are_all_found():
+    found = compiled_match("big data analysis")
+    assert {skill for _, skill in found} >= {'Data Analysis', 'Big Data (Hadoop, Spark)'}
+
+
+def test_finds_everything_the_baseline_matcher_found():
+    texts = overlapping_texts()
+    words = [word for skills in skills_data.values() for skill in skills for word in normalize_term(skill).split()]
+    rng = random.Random(0)
+    texts += [' '.join(rng.choice(words) for _ in range(rng.randint(2, 12))) for _ in range(500)]
+    for text in texts:
+        assert baseline_match(text) <= compiled_match(text), text
+
+
+def test_reported_spans_cover_the_term():
+    text = "experience with big data analysis and c++"
+    for skill_id, term, start, end in load_taxonomy().find(text):
+        assert normalize_term(text[start:end]) == term or term in normalize_term(text[start:end])
+
+
+def write_tenant(directory, content, mtime_ns):
+    path = directory / "acme.json"
+    path.write_text(content)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def wait_for_rebuild(registry):
+    deadline = time.monotonic() + 5
+    while registry._rebuilding and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_broken_tenant_file_is_retried_only_when_it_changes(tmp_path, monkeypatch):
+    compiles = []
+    monkeypatch.setattr(taxonomy_module, 'compile_taxonomy_source',
+                        lambda path, name=None: compiles.append(path) or compile_taxonomy_source(path, name))
+    registry = TaxonomyRegistry(str(tmp_path))
+    write_tenant(tmp_path, json.dumps({'skills': {'Languages': ['Python']}}), 1_000_000_000)
+    assert registry.get('acme').skills == ['Python']
+
+    write_tenant(tmp_path, "{not json", 2_000_000_000)
+    for _ in range(3):
+        assert registry.get('acme').skills == ['Python']
+        wait_for_rebuild(registry)
+    assert len(compiles) == 2
+
+    write_tenant(tmp_path, json.dumps({'skills': {'Languages': ['Python', 'Go']}}), 3_000_000_000)
+    registry.get('acme')
+    wait_for_rebuild(registry)
+    assert registry.get('acme').skills == ['Python', 'Go']
+    assert len(compiles) == 3
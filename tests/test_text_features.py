@@ -0,0 +1,57 @@
+import random
+import re
+
+from text_features import normalize_text
+
+_WHITESPACE = re.compile(r'\s+')
+_EMAIL_TOKEN = re.compile(r'\S+@\S+')
+_PHONE = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+_NON_SKILL_CHARS = re.compile(r'[^\w\s\+\#\.\-]')
+
+WORDS = ("developed implemented led managed designed built improved reduced data pipeline service "
+         "platform team latency revenue using Python SQL Docker AWS React Node.js C++ C# APIs for the").split()
+
+SAMPLE = "  Jane Doe\n jane.doe@example.com | 555-123-4567\n\n• Built C++ and Node.js services (30%)  \n"
+
+
+def six_pass_cleaning(text):
+    """The cleaning normalize_text replaced."""
+    text = text.lower()
+    text = _WHITESPACE.sub(' ', text)
+    text = text.strip()
+    text = _EMAIL_TOKEN.sub('[EMAIL]', text)
+    text = _PHONE.sub('[PHONE]', text)
+    return _NON_SKILL_CHARS.sub(' ', text)
+
+
+def synthetic_resume(size, rng):
+    lines = []
+    while sum(len(line) + 1 for line in lines) < size:
+        name = ''.join(rng.choice('abcdefgh') for _ in range(6))
+        lines.append(f"{name.title()}  |  {name}@example.com | {rng.randint(200, 999)}-555-{rng.randint(1000, 9999)}")
+        lines.extend(["", rng.choice(["EXPERIENCE", "PROJECTS", "SKILLS"]), ""])
+        for _ in range(rng.randint(3, 6)):
+            words = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(10, 22)))
+            lines.append(f"• {words.capitalize()}, by {rng.randint(5, 60)}% (${rng.randint(1, 900)}K), café. ")
+    return '\n'.join(lines)[:size]
+
+
+def test_matches_six_pass_cleaning():
+    rng = random.Random(7)
+    samples = [SAMPLE, "", "   ", "a@b", "x @ y", "call 555.123.4567 or me@555-123-4567.com"]
+    samples += [synthetic_resume(rng.randint(100, 4000), rng) for _ in range(50)]
+    for text in samples:
+        assert normalize_text(text)[0] == six_pass_cleaning(text)
+
+
+def test_offsets_map_back_to_raw_text():
+    cleaned, offsets = normalize_text(SAMPLE)
+    for clean_token, raw_token in [('c++', 'C++'), ('node.js', 'Node.js'), ('jane doe', 'Jane Doe'),
+                                   ('30', '30')]:
+        start = cleaned.index(clean_token)
+        raw_start, raw_end = offsets.raw_span(start, start + len(clean_token))
+        assert SAMPLE[raw_start:raw_end] == raw_token
+    # Placeholders map onto the start of what they replaced
+    for placeholder, raw_token in [(' EMAIL ', 'jane.doe@example.com'), (' PHONE ', '555-123-4567')]:
+        assert offsets.to_raw(cleaned.index(placeholder)) == SAMPLE.index(raw_token)
+
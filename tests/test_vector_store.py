@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+
+import vector_store
+from vector_store import VectorStore, hamming_distances, sign_codes, size_tier
+
+DIM = 64
+
+
+def unit(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def filled_store(directory, candidates=40, chunks=5, seed=0):
+    rng = np.random.default_rng(seed)
+    store = VectorStore(str(directory))
+    vectors = unit(rng.standard_normal((candidates, chunks, DIM)))
+    for index in range(candidates):
+        texts = [(row * 10, row * 10 + 9, f"candidate {index} passage {row}") for row in range(chunks)]
+        store.add(f"candidate-{index}", texts, vectors[index])
+    return store, vectors
+
+
+def test_sign_codes_count_differing_signs():
+    vectors = np.array([[1.0] * 70, [-1.0] * 70, [1.0] * 35 + [-1.0] * 35])
+    codes = sign_codes(vectors)
+    assert codes.shape == (2, 3)
+    assert hamming_distances(codes, codes[:, 0]).tolist() == [0, 70, 35]
+
+
+def test_search_finds_the_closest_candidate(tmp_path):
+    store, vectors = filled_store(tmp_path)
+    noise = np.random.default_rng(1).standard_normal(DIM) / np.sqrt(DIM)
+    results = store.search(unit(vectors[7, 2] + 0.3 * noise), k=3)
+    assert len(results) == 3
+    assert results[0]['key'] == 'candidate-7'
+    assert results[0]['chunks'][0]['text'] == 'candidate 7 passage 2'
+    assert [result['score'] for result in results] == sorted((result['score'] for result in results), reverse=True)
+
+
+def test_hamming_prefilter_keeps_the_exact_best(tmp_path, monkeypatch):
+    store, vectors = filled_store(tmp_path)
+    query = unit(vectors[12, 0] + vectors[30, 4])
+    exact = store.search(query, k=2)
+    # A factor of 1 rescores only as many chunks as are kept, so every segment is prefiltered
+    monkeypatch.setattr(vector_store, 'RESCORE_FACTOR', 1)
+    monkeypatch.setattr(vector_store, 'MERGE_FACTOR', 2)
+    store.add('extra', [(0, 1, 'extra')], unit(np.ones((1, DIM))))
+    assert len(store.segments) < 8
+    prefiltered = store.search(query, k=2)
+    assert {result['key'] for result in prefiltered} == {result['key'] for result in exact}
+
+
+def test_store_reloads_and_skips_known_keys(tmp_path):
+    store, vectors = filled_store(tmp_path, candidates=3)
+    store.add('candidate-0', [(0, 1, 'again')], vectors[0, :1])
+    reloaded = VectorStore(str(tmp_path))
+    assert len(reloaded) == 15
+    assert reloaded.keys == {'candidate-0', 'candidate-1', 'candidate-2'}
+    assert reloaded.search(vectors[2, 1], k=1)[0]['key'] == 'candidate-2'
+
+
+def test_size_tiers():
+    assert [size_tier(chunks) for chunks in (1, 7, 8, 63, 64, 511, 512)] == [0, 0, 1, 1, 2, 2, 3]
+
+
+def test_merges_rewrite_each_chunk_once_per_tier(tmp_path, monkeypatch):
+    monkeypatch.setattr(vector_store, 'MERGE_FACTOR', 4)
+    store = VectorStore(str(tmp_path))
+    written = []
+    write_segment = store._write_segment
+    monkeypatch.setattr(store, '_write_segment', lambda vectors, *args: written.append(len(vectors))
+                        or write_segment(vectors, *args))
+    vectors = unit(np.random.default_rng(0).standard_normal((64, 1, DIM)))
+    for index in range(64):
+        store.add(f"candidate-{index}", [(0, 1, f"passage {index}")], vectors[index])
+    # 64 single-chunk segments merge 4 at a time: 16 of 4 chunks, 4 of 16, then one of 64
+    assert store.segments and len(store) == 64
+    assert sum(written) == 64 * 4
+    assert len(os.listdir(tmp_path)) == 4 * len(store.segments) + 2
+
+
+def test_writers_in_two_processes_keep_each_others_candidates(tmp_path):
+    vectors = unit(np.random.default_rng(0).standard_normal((2, 3, DIM)))
+    first, second = VectorStore(str(tmp_path)), VectorStore(str(tmp_path))
+    first.add('a', [(0, 1, 'a'), (2, 3, 'a'), (4, 5, 'a')], vectors[0])
+    second.add('b', [(0, 1, 'b'), (2, 3, 'b'), (4, 5, 'b')], vectors[1])
+    first.add('b', [(0, 1, 'b')], vectors[1, :1])
+    assert first.keys == second.keys == {'a', 'b'}
+    assert first.search(vectors[1, 0], k=1)[0]['key'] == 'b'
+    reloaded = VectorStore(str(tmp_path))
+    assert len(reloaded) == 6
+    assert reloaded.search(vectors[0, 0], k=1)[0]['key'] == 'a'
@@ -0,0 +1,261 @@
+import re
+from array import array
+from bisect import bisect_right
+
+from experience import DATE_RANGE_REGEX
+
+#=================================================================================
+# Single-pass document feature scanner
+#
+# One precompiled alternation walks the resume text once and collects the
+# sparse features (emails, phones, date ranges, years-of-experience mentions).
+# The dense counts (tokens, special characters) are taken in the same scan. ATS
+# checks, experience extraction and suggestions all read the resulting
+# DocumentFeatures instead of running their own regexes.
+#=================================================================================
+_FEATURE_PATTERN = re.compile(
+    r'(?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)'
+    r'|(?P<years>\b(?P<years_count>\d+)\+?\s*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp))'
+    r'|(?P<range>' + DATE_RANGE_REGEX + r')'
+    r'|(?P<phone>\b\d{3}[-.]?\d{3}[-.]?\d{4}\b)',
+    re.IGNORECASE
+)
+_SPECIAL_CHARS = re.compile(r'[^\w\s]')
+
+
+class DocumentFeatures:
+    """Features collected from one scan of a document."""
+
+    __slots__ = ('emails', 'phones', 'date_ranges', 'years_of_experience', 'word_count',
+                 'char_count', 'special_char_count')
+
+    def __init__(self):
+        self.emails = []
+        self.phones = []
+        self.date_ranges = []  # (start, end, span_start, span_end), e.g. ("Jan 2019", "present", 120, 137)
+        self.years_of_experience = []  # explicit "N years of experience" mentions
+        self.word_count = 0
+        self.char_count = 0
+        self.special_char_count = 0
+
+    @property
+    def special_char_ratio(self):
+        return self.special_char_count / self.char_count if self.char_count else 0
+
+
+def scan_document(text):
+    """Scan text once and return its DocumentFeatures."""
+    features = DocumentFeatures()
+
+    for match in _FEATURE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == 'email':
+            features.emails.append(match.group('email'))
+        elif kind == 'phone':
+            features.phones.append(match.group('phone'))
+        elif kind == 'range':
+            features.date_ranges.append(
+                (match.group('range_start'), match.group('range_end').lower(), match.start(), match.end())
+            )
+        else:
+            features.years_of_experience.append(int(match.group('years_count')))
+
+    features.word_count = len(text.split())
+    features.char_count = len(text)
+    features.special_char_count = len(_SPECIAL_CHARS.findall(text))
+    return features
+
+#=================================================================================
+# Offset-preserving normalizer
+#
+# Produces the same cleaned text as the original six-pass cleaning (lowercase,
+# collapsed whitespace, [EMAIL]/[PHONE] placeholders, punctuation other than
+# + # . - blanked) and keeps a run-length map from cleaned offsets back to the
+# raw extracted text. Characters are mapped in one length-preserving pass
+# (whitespace to a space, blanked punctuation to a NUL marker); emails and
+# phone numbers are found once and merged in a single sweep over sorted spans,
+# and whitespace runs are collapsed by str.split/join, so the per-character
+# work happens in C and Python only loops over the edits.
+#=================================================================================
+# The phone pattern starts with \d and checks the word boundary with a
+# lookbehind so the engine can skip other characters
+_PHONE_PATTERN = re.compile(r'\d(?<!\w\d)\d\d[-.]?\d{3}[-.]?\d{4}\b')
+_SPACE_RUN = re.compile(r' {2,}')
+_BLANKED_CHARS = re.compile(r'[^\w\s\+\#\.\-]')
+_OTHER_SPACE = re.compile(r'[^\S ]')
+_KEEP_CHAR = re.compile(r'[\w\+\#\.\-]')
+EMAIL_PLACEHOLDER = '[EMAIL]'
+PHONE_PLACEHOLDER = '[PHONE]'
+# Blanked characters are marked with NUL until whitespace is collapsed, so they
+# do not collapse with it; placeholders read as they do after blanking
+_BLANK = '\x00'
+_EMAIL_REPLACEMENT = _BLANK + 'EMAIL' + _BLANK
+_PHONE_REPLACEMENT = _BLANK + 'PHONE' + _BLANK
+
+
+class _NormalizeTable(dict):
+    """str.translate table: lowercase kept characters, whitespace to a space, blank everything else.
+
+    Entries are filled on first sight of each character, so the table covers any
+    Unicode input while staying small. Characters whose lowercase form is longer
+    than one character are kept as-is so offsets stay one-to-one.
+    """
+
+    def __missing__(self, codepoint):
+        char = chr(codepoint)
+        lowered = char.lower()
+        if len(lowered) != 1:
+            lowered = char
+        if _KEEP_CHAR.match(lowered):
+            mapped = lowered
+        elif lowered.isspace():
+            mapped = ' '
+        else:
+            mapped = _BLANK
+        self[codepoint] = mapped
+        return mapped
+
+
+_NORMALIZE_TABLE = _NormalizeTable()
+
+
+def _map_chars(text):
+    """Length-preserving character mapping of the whole text.
+
+    str.translate is only fast for ASCII text, so non-ASCII characters that map
+    to ASCII (bullets, dashes, quotes) are replaced first. Text that is still
+    not ASCII goes through lower() and two regex substitutions instead, unless
+    lowercasing changes its length.
+    """
+    if not text.isascii():
+        for char in set(text):
+            if char > '\x7f':
+                mapped = _NORMALIZE_TABLE[ord(char)]
+                if mapped != char:
+                    text = text.replace(char, mapped)
+    if text.isascii():
+        return text.translate(_NORMALIZE_TABLE)
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        return text.translate(_NORMALIZE_TABLE)
+    return _OTHER_SPACE.sub(' ', _BLANKED_CHARS.sub(_BLANK, lowered))
+
+
+class OffsetMap:
+    """Run-length map from normalized-text offsets to raw-text offsets.
+
+    Run i covers normalized offsets from clean_starts[i] and maps them linearly
+    onto raw_starts[i]..raw_ends[i] (clamped, for replaced spans).
+    """
+
+    __slots__ = ('clean_starts', 'raw_starts', 'raw_ends')
+
+    def __init__(self):
+        self.clean_starts = array('q')
+        self.raw_starts = array('q')
+        self.raw_ends = array('q')
+
+    def add_run(self, clean_start, raw_start, raw_end):
+        self.clean_starts.append(clean_start)
+        self.raw_starts.append(raw_start)
+        self.raw_ends.append(raw_end)
+
+    def to_raw(self, index):
+        run = bisect_right(self.clean_starts, index) - 1
+        if run < 0:
+            return 0
+        return min(self.raw_starts[run] + index - self.clean_starts[run], self.raw_ends[run])
+
+    def raw_span(self, start, end):
+        """Raw (start, end) span for a normalized span."""
+        if end <= start:
+            raw_start = self.to_raw(start)
+            return raw_start, raw_start
+        return self.to_raw(start), self.to_raw(end - 1) + 1
+
+
+def _email_spans(text, start, end):
+    """Spans of whitespace-delimited tokens that look like emails (\\S+@\\S+)."""
+    spans = []
+    at = text.find('@', start, end)
+    while at != -1:
+        token_start = at
+        while token_start > start and not text[token_start - 1].isspace():
+            token_start -= 1
+        token_end = at + 1
+        while token_end < end and not text[token_end].isspace():
+            token_end += 1
+        # Needs a character before and after some '@' in the token
+        if '@' in text[token_start + 1:token_end - 1]:
+            spans.append((token_start, token_end))
+        at = text.find('@', token_end, end)
+    return spans
+
+
+def _placeholder_spans(text, mapped, start, end):
+    """Sorted (start, end, replacement) spans of emails and of phone numbers outside them."""
+    emails = _email_spans(text, start, end)
+    spans = [(email_start, email_end, _EMAIL_REPLACEMENT) for email_start, email_end in emails]
+    # Emails are replaced first, so phone numbers inside them do not count
+    email = 0
+    for match in _PHONE_PATTERN.finditer(mapped, start, end):
+        phone_start = match.start()
+        while email < len(emails) and emails[email][1] <= phone_start:
+            email += 1
+        if email == len(emails) or phone_start < emails[email][0]:
+            spans.append((phone_start, match.end(), _PHONE_REPLACEMENT))
+    spans.sort()
+    return spans
+
+
+def normalize_text(text):
+    """Normalize text for skill matching and return (cleaned_text, OffsetMap)."""
+    start = len(text) - len(text.lstrip())
+    end = len(text.rstrip())
+    mapped = _map_chars(text)
+    placeholders = _placeholder_spans(text, mapped, start, end)
+
+    parts = []
+    pos = start
+    for span_start, span_end, replacement in placeholders:
+        parts.append(mapped[pos:span_start])
+        parts.append(replacement)
+        pos = span_end
+    parts.append(mapped[pos:end])
+    cleaned = ' '.join(''.join(parts).split()).replace(_BLANK, ' ')
+
+    # Whitespace runs become one space and placeholders keep their length
+    edits = []
+    run = mapped.find('  ', start, end)
+    while run != -1:
+        run_end = _SPACE_RUN.match(mapped, run, end).end()
+        edits.append((run, run_end, 1))
+        run = mapped.find('  ', run_end, end)
+    if placeholders:
+        edits.extend((span_start, span_end, len(replacement))
+                     for span_start, span_end, replacement in placeholders)
+        edits.sort()
+
+    offsets = OffsetMap()
+    add_clean_start = offsets.clean_starts.append
+    add_raw_start = offsets.raw_starts.append
+    add_raw_end = offsets.raw_ends.append
+    length = 0
+    pos = start
+    for edit_start, edit_end, size in edits:
+        if edit_start > pos:
+            add_clean_start(length)
+            add_raw_start(pos)
+            add_raw_end(edit_start)
+            length += edit_start - pos
+        add_clean_start(length)
+        add_raw_start(edit_start)
+        add_raw_end(edit_end)
+        length += size
+        pos = edit_end
+    if end > pos:
+        add_clean_start(length)
+        add_raw_start(pos)
+        add_raw_end(end)
+
+    return cleaned, offsets
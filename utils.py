@@ -4,13 +4,18 @@ import pdfplumber
 import PyPDF2
 import nltk
 import spacy
-from nltk.corpus import stopwords
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
-import dateparser
 from datetime import datetime
 import random
+from taxonomy import load_taxonomy, compile_taxonomy
+from text_features import normalize_text
+from document import BULLET_PATTERN, STANDARD_SECTIONS, as_document
+from layout import PdfLayout
+from experience import build_timeline
+from bullets import WEAK_BULLETS_REWRITTEN, score_bullets, weakest_bullets
+from rewriter import RewriteError, rewrite_backend, rewrite_bullets
+from question_bank import question_bank
 
 #================================================================================= 
 # STEP 0: Load the models
@@ -21,9 +26,10 @@ nlp = spacy.load("en_core_web_sm")
 #================================================================================= 
 # STEP 1: Extract text from the resume PDF
 #=================================================================================
-def enhanced_pdf_extraction(pdf_path):
-    """Extract text from PDF using multiple methods for better accuracy."""
+def extract_pdf_with_layout(pdf_path):
+    """Extract text from PDF using multiple methods, plus PyMuPDF line styles."""
     text_methods = []
+    layout = None
     
     try:
         with pdfplumber.open(pdf_path) as pdf:
@@ -35,44 +41,88 @@ def enhanced_pdf_extraction(pdf_path):
         pass
     
     try:
-        doc = fitz.open(pdf_path)
-        text2 = ""
-        for page_num in range(len(doc)):
-            text2 += doc.load_page(page_num).get_text()
+        text2, layout = extract_pymupdf_text(pdf_path)
         text_methods.append(text2)
     except:
         pass
     
-    return max(text_methods, key=len) if text_methods else ""
+    text = max(text_methods, key=len) if text_methods else ""
+    return text, layout
+
+def extract_pymupdf_text(pdf_path):
+    """Extract text with PyMuPDF, analysing page layout in the same pass."""
+    layout = PdfLayout()
+    text = ""
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(len(doc)):
+            page = doc.load_page(page_num)
+            if not layout.wants_page():
+                text += page.get_text()
+                continue
+            # One text page serves both the plain text and the span dictionary
+            textpage = page.get_textpage()
+            text += page.get_text(textpage=textpage)
+            layout.add_page(page.get_text("dict", textpage=textpage), page.get_fonts())
+    return text, layout
+
+def enhanced_pdf_extraction(pdf_path):
+    """Extract text from PDF using multiple methods for better accuracy."""
+    return extract_pdf_with_layout(pdf_path)[0]
 
 #================================================================================= 
 # STEP 2: Clean the text
 #=================================================================================
 def advanced_text_cleaning(text):
     """Advanced text cleaning that preserves important punctuation."""
-    text = text.lower()
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    text = re.sub(r'\S+@\S+', '[EMAIL]', text)
-    text = re.sub(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', '[PHONE]', text)
-    text = re.sub(r'[^\w\s\+\#\.\-]', ' ', text)
-    return text
+    return normalize_text(text)[0]
 
 #================================================================================= 
 # STEP 4: Extract skills by category
 #=================================================================================
-def extract_skills_by_category(text, skills_data):
-    """Extract skills from text by matching against predefined skill categories."""
-    matched_skills = {}
-    for category, skills in skills_data.items():
-        found = []
-        for skill in skills:
-            skill_lower = skill.lower()
-            if re.search(r'\b' + re.escape(skill_lower) + r'\b', text):
-                found.append(skill)
-        if found:
-            matched_skills[category] = found
-    return matched_skills
+def extract_skills_by_category(text, taxonomy=None):
+    """Extract skills from text by matching against the compiled skill taxonomy."""
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    elif isinstance(taxonomy, dict):
+        taxonomy = compile_taxonomy(taxonomy)
+    return taxonomy.match(text)
+
+def extract_skill_matches(text, taxonomy=None):
+    """Extract skills by category, reporting the alias that fired and where."""
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    elif isinstance(taxonomy, dict):
+        taxonomy = compile_taxonomy(taxonomy)
+
+    first_hits = {}
+    for skill_id, alias, start, end in taxonomy.find(text):
+        if skill_id not in first_hits:
+            first_hits[skill_id] = (alias, start, end)
+
+    skill_matches = {}
+    for skill_id in sorted(first_hits):
+        alias, start, end = first_hits[skill_id]
+        skill_matches.setdefault(taxonomy.category_of(skill_id), []).append({
+            'skill': taxonomy.skills[skill_id],
+            'alias': alias,
+            'start': start,
+            'end': end
+        })
+    return skill_matches
+
+def skill_highlight_spans(skill_matches, offsets):
+    """Map skill matches in cleaned text back to (start, end, skill, alias) spans in the raw text."""
+    spans = []
+    for matches in skill_matches.values():
+        for match in matches:
+            start, end = offsets.raw_span(match['start'], match['end'])
+            spans.append((start, end, match['skill'], match['alias']))
+    spans.sort()
+    return spans
+
+def skills_from_matches(skill_matches):
+    """Reduce extract_skill_matches output to the {category: [skills]} shape."""
+    return {category: [match['skill'] for match in matches] for category, matches in skill_matches.items()}
 
 #================================================================================= 
 # STEP 5: Calculate match score
@@ -103,44 +153,107 @@ def calculate_match_score(resume_skills, jd_skills):
 #================================================================================= 
 # STEP 6: Calculate semantic match
 #=================================================================================
-def semantic_skill_matching(resume_skills, jd_skills, threshold=0.7):
-    """Find semantically similar skills using AI."""
-    semantic_matches = {}
-    
-    for category in jd_skills:
-        jd_category_skills = jd_skills[category]
-        resume_category_skills = resume_skills.get(category, [])
-        semantic_matched = []
-        
-        for jd_skill in jd_category_skills:
-            best_match = None
-            best_score = 0
-            
-            for resume_skill in resume_category_skills:
-                embeddings = semantic_model.encode([jd_skill, resume_skill])
-                similarity = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-                
-                if similarity > threshold and similarity > best_score:
-                    best_match = resume_skill
-                    best_score = similarity
-            
-            if best_match:
-                semantic_matched.append({
-                    'jd_skill': jd_skill,
-                    'resume_skill': best_match,
-                    'similarity': round(best_score, 2)
-                })
-        
-        if semantic_matched:
-            semantic_matches[category] = semantic_matched
+def skill_embeddings(skills, category, taxonomy):
+    """Look up unit-normalized embeddings for skills from the taxonomy's embedding index."""
+    index = taxonomy.embedding_index(semantic_model.encode)
+    ids = [taxonomy.skill_id(category, skill) for skill in skills]
+    if all(skill_id is not None for skill_id in ids):
+        return index[ids]
+    # Skills outside the catalog are encoded on the fly
+    vectors = semantic_model.encode(skills)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+def semantic_similarity_matrix(resume_skills, jd_skills, taxonomy=None):
+    """Compute the full JD x resume skill similarity matrix once.
+
+    The result is kept by the pipeline so that threshold changes only re-mask it
+    (see semantic_matches_at) instead of re-encoding skills.
+    """
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    
+    jd_entries = [(category, skill) for category in jd_skills for skill in jd_skills[category]]
+    resume_entries = [(category, skill) for category in resume_skills for skill in resume_skills[category]]
+    
+    if jd_entries and resume_entries:
+        jd_vectors = np.vstack([skill_embeddings(jd_skills[c], c, taxonomy) for c in jd_skills if jd_skills[c]])
+        resume_vectors = np.vstack([
+            skill_embeddings(resume_skills[c], c, taxonomy) for c in resume_skills if resume_skills[c]
+        ])
+        matrix = (jd_vectors @ resume_vectors.T).astype(np.float32)
+    else:
+        matrix = np.zeros((len(jd_entries), len(resume_entries)), dtype=np.float32)
+    
+    # Skills are only compared within their own category
+    jd_categories = np.array([category for category, _ in jd_entries], dtype=object)
+    resume_categories = np.array([category for category, _ in resume_entries], dtype=object)
+    same_category = jd_categories[:, None] == resume_categories[None, :]
+    masked = np.where(same_category, matrix, -np.inf)
+    
+    if masked.shape[1]:
+        best_index = masked.argmax(axis=1)
+        best_score = masked[np.arange(len(jd_entries)), best_index]
+    else:
+        best_index = np.zeros(len(jd_entries), dtype=np.int64)
+        best_score = np.full(len(jd_entries), -np.inf, dtype=np.float32)
     
+    return {
+        'jd_entries': jd_entries,
+        'resume_entries': resume_entries,
+        'matrix': matrix,
+        'best_index': best_index,
+        'best_score': best_score
+    }
+
+def semantic_matches_at(similarity, threshold=0.7):
+    """Derive semantic matches from a precomputed similarity matrix for a threshold."""
+    semantic_matches = {}
+    for row in np.flatnonzero(similarity['best_score'] > threshold):
+        category, jd_skill = similarity['jd_entries'][row]
+        _, resume_skill = similarity['resume_entries'][similarity['best_index'][row]]
+        semantic_matches.setdefault(category, []).append({
+            'jd_skill': jd_skill,
+            'resume_skill': resume_skill,
+            'similarity': round(float(similarity['best_score'][row]), 2)
+        })
     return semantic_matches
 
+def semantic_match_curve(similarity, thresholds=None):
+    """Number of semantic matches at each threshold, for the threshold slider range."""
+    if thresholds is None:
+        thresholds = np.round(np.arange(0.5, 0.905, 0.01), 2)
+    counts = (similarity['best_score'][None, :] > thresholds[:, None]).sum(axis=1)
+    return thresholds, counts
+
+def embed_passages(texts):
+    """Unit-normalized float16 embeddings of text passages (resume chunks or search queries)."""
+    vectors = np.asarray(semantic_model.encode(list(texts)), dtype=np.float32).reshape(len(texts), -1)
+    vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors.astype(np.float16)
+
+def chunk_vectors(chunks):
+    """Embeddings for (start, end, text) resume chunks."""
+    return embed_passages([text for _, _, text in chunks])
+
+def semantic_skill_matching(resume_skills, jd_skills, threshold=0.7, taxonomy=None):
+    """Find semantically similar skills using AI."""
+    similarity = semantic_similarity_matrix(resume_skills, jd_skills, taxonomy)
+    return semantic_matches_at(similarity, threshold)
+
 #================================================================================= 
 # STEP 7: Calculate weighted score
 #=================================================================================
-def get_skill_weights(job_title=""):
+def get_skill_weights(job_title="", taxonomy=None):
     """Get category weights based on job title."""
+    job_title_lower = job_title.lower()
+    
+    if taxonomy is not None and taxonomy.weights:
+        weights = dict(taxonomy.weights)
+        for rule in taxonomy.title_weights:
+            if any(keyword.lower() in job_title_lower for keyword in rule['keywords']):
+                weights.update(rule['weights'])
+        return weights
+    
     base_weights = {
         'programming': 0.35,
         'technical': 0.30,
@@ -149,8 +262,6 @@ def get_skill_weights(job_title=""):
         'tools': 0.05
     }
     
-    job_title_lower = job_title.lower()
-    
     if 'senior' in job_title_lower or 'lead' in job_title_lower:
         base_weights['soft_skills'] = 0.20
         base_weights['technical'] = 0.25
@@ -161,9 +272,9 @@ def get_skill_weights(job_title=""):
     
     return base_weights
 
-def calculate_weighted_score(detailed_result, job_title=""):
+def calculate_weighted_score(detailed_result, job_title="", taxonomy=None):
     """Calculate weighted match score based on job-specific importance."""
-    weights = get_skill_weights(job_title)
+    weights = get_skill_weights(job_title, taxonomy)
     
     total_weighted_score = 0
     total_weight = 0
@@ -185,8 +296,11 @@ def calculate_weighted_score(detailed_result, job_title=""):
 #================================================================================= 
 # STEP 8: Generate optimization suggestions
 #=================================================================================
-def generate_optimization_suggestions(detailed_result, match_score, resume_text):
+def generate_optimization_suggestions(detailed_result, match_score, resume_text, keyword_coverage=None,
+                                      evidence=None, features=None):
     """Generate actionable suggestions to improve resume."""
+    if features is None:
+        features = as_document(resume_text).features
     suggestions = []
     priority_suggestions = []
     
@@ -209,7 +323,29 @@ def generate_optimization_suggestions(detailed_result, match_score, resume_text)
                 'skills': top_missing
             })
     
-    if len(resume_text.split()) < 200:
+    # Matched skills that are listed but never shown in use
+    if evidence is not None:
+        unsupported = [skill for category, results in detailed_result.items() for skill in results['matched']
+                       if not evidence.get(category, {}).get(skill)]
+        if unsupported:
+            suggestions.append({
+                'type': 'evidence_gap',
+                'message': 'Some matched skills are listed but not backed by your experience',
+                'action': f'Show them in an achievement bullet: {", ".join(unsupported[:5])}',
+                'skills': unsupported[:5]
+            })
+    
+    # Distinctive job description terms outside the skill catalog
+    missing_keywords = [keyword['term'] for keyword in keyword_coverage or [] if not keyword['found']]
+    if missing_keywords:
+        suggestions.append({
+            'type': 'keyword_gap',
+            'message': 'Key job description terms are missing from your resume',
+            'action': f'Where they apply to your experience, mention: {", ".join(missing_keywords[:5])}',
+            'skills': missing_keywords[:5]
+        })
+    
+    if features.word_count < 200:
         suggestions.append({
             'type': 'content',
             'message': 'Resume appears too brief',
@@ -221,31 +357,43 @@ def generate_optimization_suggestions(detailed_result, match_score, resume_text)
 #================================================================================= 
 # STEP 9: Check ATS compatibility
 #=================================================================================
-def check_ats_compatibility(resume_text, pdf_path):
-    """Check resume compatibility with Applicant Tracking Systems."""
+def check_ats_compatibility(resume_text, pdf_path, features=None, layout=None):
+    """Check resume compatibility with Applicant Tracking Systems.
+
+    Layout checks use the PdfLayout gathered during extraction (layout, or the
+    document's own); the PDF is only opened here when neither is available.
+    """
+    document = as_document(resume_text)
+    if features is None:
+        features = document.features
+    if layout is None:
+        layout = document.layout
+    if layout is None and pdf_path:
+        try:
+            layout = extract_pymupdf_text(pdf_path)[1]
+        except:
+            pass
     issues = []
     recommendations = []
     
-    if not re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', resume_text):
+    if not features.emails:
         issues.append("Missing email address")
         recommendations.append("Add a professional email address")
     
-    if not re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', resume_text):
+    if not features.phones:
         issues.append("Missing phone number")
         recommendations.append("Add your phone number")
     
-    standard_sections = ['experience', 'education', 'skills']
-    for section in standard_sections:
-        if not re.search(f'\\b{section}\\b', resume_text.lower()):
+    for section in STANDARD_SECTIONS:
+        if section not in document.sections:
             issues.append(f"Missing {section} section")
             recommendations.append(f"Add a clear {section} section")
     
-    special_char_ratio = len(re.findall(r'[^\w\s]', resume_text)) / len(resume_text)
-    if special_char_ratio > 0.1:
+    if features.special_char_ratio > 0.1:
         issues.append("Too many special characters")
         recommendations.append("Simplify formatting and reduce special characters")
     
-    word_count = len(resume_text.split())
+    word_count = features.word_count
     if word_count < 150:
         issues.append("Resume too short")
         recommendations.append("Add more detailed content (aim for 200-400 words)")
@@ -253,6 +401,11 @@ def check_ats_compatibility(resume_text, pdf_path):
         issues.append("Resume too long")
         recommendations.append("Condense content to essential information")
     
+    if layout is not None:
+        for issue, recommendation in layout.ats_issues():
+            issues.append(issue)
+            recommendations.append(recommendation)
+    
     ats_score = max(0, 100 - len(issues) * 15)
     
     return {
@@ -264,39 +417,112 @@ def check_ats_compatibility(resume_text, pdf_path):
 #================================================================================= 
 # STEP 10: Extract experience info
 #=================================================================================
-def extract_experience_info(resume_text):
-    """Extract years of experience from resume."""
+def extract_experience_info(resume_text, features=None):
+    """Extract years of experience from resume.
+
+    Total years come from the merged timeline of date ranges in the experience
+    section; explicit "N years of experience" statements are used when the
+    resume has no parseable ranges.
+    """
+    document = as_document(resume_text)
+    if features is None:
+        features = document.features
     experience_data = {
         'total_years': 0,
         'experience_entries': [],
         'current_role': None
     }
     
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?(?:experience|exp)',
-        r'(\d+)\+?\s*yrs?\s*(?:of\s*)?(?:experience|exp)',
-        r'(\d{4})\s*[-–]\s*(?:present|current|\d{4})',
-        r'(\d{1,2}/\d{4})\s*[-–]\s*(?:present|current|\d{1,2}/\d{4})'
-    ]
-    
-    years_mentioned = []
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, resume_text.lower())
-        years_mentioned.extend(matches)
-    
-    if years_mentioned:
-        numeric_years = []
-        for year in years_mentioned:
-            try:
-                numeric_years.append(int(year))
-            except:
-                continue
-        
-        if numeric_years:
-            experience_data['total_years'] = max(numeric_years)
+    timeline = build_timeline(document.text, document.date_ranges_in('experience'))
+    roles = timeline['roles']
+    for role in roles:
+        role['years'] = round(role['months'] / 12, 1)
+    experience_data['experience_entries'] = roles
+    
+    if roles:
+        experience_data['total_years'] = round(timeline['total_months'] / 12, 1)
+        current = [role for role in roles if role['current']]
+        if current:
+            experience_data['current_role'] = current[0]['title']
+    elif features.years_of_experience:
+        experience_data['total_years'] = max(features.years_of_experience)
     
     return experience_data
 
+#=================================================================================
+# STEP 11: Retrieve evidence for JD skills
+#=================================================================================
+EVIDENCE_PER_SKILL = 2
+EVIDENCE_MIN_SIMILARITY = 0.35
+MIN_EVIDENCE_WORDS = 4
+_EVIDENCE_SENTENCE = re.compile(r'[^.!?]+(?:[.!?]+|$)')
+
+def evidence_sentences(resume_text):
+    """(start, end, text) of the resume sentences that can back up a skill.
+
+    Skills-section lists and short lines (headers, contact details) are left out.
+    """
+    document = as_document(resume_text)
+    skill_spans = document.sections.get('skills', [])
+    sentences = []
+    offset = 0
+    for line in document.lines:
+        marker = BULLET_PATTERN.match(line.lstrip())
+        line_start = len(line) - len(line.lstrip()) + (marker.end() if marker else 0)
+        for match in _EVIDENCE_SENTENCE.finditer(line, line_start):
+            text = match.group().strip()
+            start = offset + match.start() + len(match.group()) - len(match.group().lstrip())
+            if len(text.split()) < MIN_EVIDENCE_WORDS:
+                continue
+            if any(span_start <= start < span_end for span_start, span_end in skill_spans):
+                continue
+            sentences.append((start, start + len(text), text))
+        offset += len(line) + 1
+    return sentences
+
+def sentence_vectors(sentences):
+    """Embeddings for (start, end, text) resume sentences; computed once per resume."""
+    if not sentences:
+        return np.zeros((0, 0), dtype=np.float16)
+    return embed_passages([text for _, _, text in sentences])
+
+def skill_evidence(jd_skills, sentences, vectors, taxonomy=None):
+    """Best supporting resume sentences for every JD skill.
+
+    JD skills come from the catalog's embedding index, so a new job description
+    needs no sentence re-encoding: one skills x sentences product scores them all.
+    Returns {category: {skill: [{'text', 'start', 'end', 'similarity'}]}}.
+    """
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    entries = [(category, skill) for category in jd_skills for skill in jd_skills[category]]
+    evidence = {category: {skill: [] for skill in jd_skills[category]} for category in jd_skills}
+    if not entries or not sentences:
+        return evidence
+    
+    skill_vectors = np.vstack([skill_embeddings(jd_skills[c], c, taxonomy) for c in jd_skills if jd_skills[c]])
+    scores = skill_vectors.astype(np.float32) @ np.asarray(vectors, dtype=np.float32).T
+    keep = min(EVIDENCE_PER_SKILL, len(sentences))
+    top = np.argpartition(-scores, keep - 1, axis=1)[:, :keep]
+    for row, (category, skill) in enumerate(entries):
+        for column in sorted(top[row], key=lambda column: -scores[row, column]):
+            if scores[row, column] >= EVIDENCE_MIN_SIMILARITY:
+                start, end, text = sentences[column]
+                evidence[category][skill].append({
+                    'text': text,
+                    'start': start,
+                    'end': end,
+                    'similarity': round(float(scores[row, column]), 2)
+                })
+    return evidence
+
+def skill_proof(evidence, skill):
+    """Best supporting sentence for a skill, or None."""
+    for skills in (evidence or {}).values():
+        if skills.get(skill):
+            return skills[skill][0]['text']
+    return None
+
 #=================================================================================
 # NEW FEATURE 1: INTERACTIVE VISUALIZATIONS
 #=================================================================================
@@ -347,68 +573,17 @@ def generate_visualization_data(resume_skills, jd_skills, detailed_result):
 #=================================================================================
 # NEW FEATURE 2: AI RESUME REWRITER
 #=================================================================================
-def identify_weak_bullets(resume_text):
-    """Identify weak bullet points in resume."""
-    # Split into lines and find bullet points
-    lines = resume_text.split('\n')
-    bullets = []
-    
-    bullet_patterns = [r'^\s*[-•*]\s+', r'^\s*\d+[\.\)]\s+']
-    
-    for line in lines:
-        line = line.strip()
-        if any(re.match(pattern, line) for pattern in bullet_patterns):
-            # Remove bullet markers
-            clean_line = re.sub(r'^\s*[-•*\d+\.\)]\s+', '', line)
-            if len(clean_line.split()) >= 5:  # At least 5 words
-                bullets.append(clean_line)
-    
-    # If no bullets found, extract sentences from experience section
-    if not bullets:
-        exp_section = extract_text_between_sections(resume_text, 'experience', 'education')
-        if exp_section:
-            sentences = re.split(r'[.!?]+', exp_section)
-            bullets = [s.strip() for s in sentences if len(s.split()) >= 5][:5]
-    
-    return bullets[:5]  # Return top 5
+def identify_weak_bullets(resume_text, limit=WEAK_BULLETS_REWRITTEN):
+    """Identify the weakest bullet points in resume, weakest first."""
+    return [bullet for bullet, _ in weakest_bullets(resume_text, limit)]
 
 def extract_text_between_sections(text, start_keyword, end_keyword):
     """Extract text between two section headers."""
-    text_lower = text.lower()
-    start_idx = text_lower.find(start_keyword)
-    end_idx = text_lower.find(end_keyword, start_idx) if start_idx != -1 else -1
-    
-    if start_idx != -1:
-        if end_idx != -1:
-            return text[start_idx:end_idx]
-        else:
-            return text[start_idx:start_idx+500]  # Get next 500 chars
-    return ""
+    return as_document(text).section_text(start_keyword, end_keyword)
 
 def calculate_impact_score(bullet_text):
     """Calculate impact score for a bullet point."""
-    score = 5  # Base score
-    
-    # Check for quantifiable metrics
-    if re.search(r'\d+%', bullet_text):
-        score += 2
-    if re.search(r'\$\d+', bullet_text):
-        score += 2
-    if re.search(r'\d+[kmb]?\+?', bullet_text, re.IGNORECASE):
-        score += 1
-    
-    # Check for action verbs
-    strong_verbs = ['achieved', 'developed', 'implemented', 'led', 'managed', 'created', 
-                    'improved', 'increased', 'reduced', 'optimized', 'designed', 'built']
-    if any(verb in bullet_text.lower() for verb in strong_verbs):
-        score += 1
-    
-    # Check length (too short or too long)
-    word_count = len(bullet_text.split())
-    if 10 <= word_count <= 25:
-        score += 1
-    
-    return min(score, 10)  # Cap at 10
+    return int(score_bullets([bullet_text])[0])
 
 def rewrite_with_action_verbs(bullet_text, missing_skills):
     """Rewrite bullet point with stronger action verbs and missing skills."""
@@ -421,7 +596,7 @@ def rewrite_with_action_verbs(bullet_text, missing_skills):
     # Try to inject missing skills naturally
     skill_to_add = missing_skills[0] if missing_skills else None
     
-    # Simple rewriting logic (in production, use GPT/Claude API)
+    # Heuristic rewrite, used when no rewrite backend answers (see rewriter.py)
     improved = bullet_text
     
     # Add quantifiable metric if missing
@@ -438,16 +613,28 @@ def rewrite_with_action_verbs(bullet_text, missing_skills):
     
     return improved
 
-def ai_rewrite_bullet_points(resume_text, jd_text, missing_skills):
-    """Rewrite resume bullet points with AI enhancement."""
-    weak_bullets = identify_weak_bullets(resume_text)
+def ai_rewrite_bullet_points(resume_text, jd_text, missing_skills, limit=WEAK_BULLETS_REWRITTEN):
+    """Rewrite the lowest-scoring resume bullet points with AI enhancement."""
+    weak_bullets = weakest_bullets(resume_text, limit)
+    originals = [bullet for bullet, _ in weak_bullets]
+    
+    # Configured rewrite backend first; the heuristic covers a missing, slow or failing backend
+    source = 'heuristic'
+    backend, cache = rewrite_backend()
+    improved_bullets = None
+    if backend is not None and originals:
+        try:
+            improved_bullets = rewrite_bullets(backend, originals, missing_skills, cache)
+            source = 'model'
+        except (RewriteError, OSError, ValueError):
+            improved_bullets = None
+    if improved_bullets is None:
+        improved_bullets = [rewrite_with_action_verbs(bullet, missing_skills) for bullet in originals]
+    improved_scores = score_bullets(improved_bullets)
     
     rewritten_bullets = []
     
-    for bullet in weak_bullets:
-        impact_score = calculate_impact_score(bullet)
-        improved = rewrite_with_action_verbs(bullet, missing_skills)
-        
+    for (bullet, impact_score), improved, improved_score in zip(weak_bullets, improved_bullets, improved_scores):
         improvements = []
         
         # Identify what was improved
@@ -457,7 +644,8 @@ def ai_rewrite_bullet_points(resume_text, jd_text, missing_skills):
         if not any(verb in bullet.lower() for verb in ['developed', 'led', 'implemented']):
             improvements.append("Stronger action verb")
         
-        if missing_skills and missing_skills[0].lower() not in bullet.lower():
+        if missing_skills and missing_skills[0].lower() not in bullet.lower() \
+                and missing_skills[0].lower() in improved.lower():
             improvements.append(f"Included skill: {missing_skills[0]}")
         
         if len(improvements) == 0:
@@ -466,7 +654,9 @@ def ai_rewrite_bullet_points(resume_text, jd_text, missing_skills):
         rewritten_bullets.append({
             'original': bullet,
             'improved': improved,
-            'impact_score': calculate_impact_score(improved),
+            'original_score': impact_score,
+            'source': source,
+            'impact_score': int(improved_score),
             'improvements': improvements
         })
     
@@ -474,101 +664,86 @@ def ai_rewrite_bullet_points(resume_text, jd_text, missing_skills):
 
 def extract_experience_entries(resume_text):
     """Extract individual experience entries from resume."""
+    document = as_document(resume_text)
     entries = []
     
-    # Look for date patterns indicating job entries
-    date_pattern = r'(\d{4})\s*[-–]\s*(?:present|current|\d{4})'
-    matches = re.finditer(date_pattern, resume_text.lower())
-    
-    positions = [m.start() for m in matches]
+    # Date ranges indicate job entries; only those inside the experience section
+    # count when the resume has one (education dates are not jobs)
+    positions = [start for _, _, start, _ in document.date_ranges_in('experience')]
     
     for i, pos in enumerate(positions):
-        start = pos
         end = positions[i+1] if i+1 < len(positions) else pos + 300
-        entry = resume_text[start:end]
-        entries.append(entry)
+        entries.append(document.text[pos:end])
     
     return entries
 
 #=================================================================================
 # NEW FEATURE 3: INTERVIEW QUESTION GENERATOR
 #=================================================================================
-def generate_interview_questions(resume_text, resume_skills, jd_skills, detailed_result, experience_info):
-    """Generate personalized interview questions based on resume and JD."""
+def generate_interview_questions(resume_text, resume_skills, jd_skills, detailed_result, experience_info,
+                                 evidence=None, taxonomy=None):
+    """Select interview questions from the question bank and personalize them with the resume."""
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    bank = question_bank(taxonomy)
     questions = {
         'technical': [],
         'behavioral': [],
         'gap_based': []
     }
     
-    # Technical questions based on JD skills
-    all_jd_skills = []
+    # Technical questions based on JD skills, most specific question per skill
+    jd_entries = []
     for category in jd_skills:
-        all_jd_skills.extend(jd_skills[category][:3])  # Top 3 per category
-    
-    for skill in all_jd_skills[:5]:
-        questions['technical'].append({
-            'question': f"Can you describe your experience with {skill}?",
-            'star_template': {
-                'situation': f"In my previous role working with {skill}...",
-                'task': f"I was tasked with implementing/optimizing...",
-                'action': f"I used {skill} to develop/create...",
-                'result': "Which resulted in [quantifiable outcome like 30% improvement]"
-            },
-            'tips': [
-                f"Mention specific projects where you used {skill}",
-                "Quantify your impact with numbers and percentages",
-                "Discuss challenges you overcame"
-            ]
-        })
-    
-    # Behavioral questions
-    behavioral_templates = [
-        "Tell me about a time when you had to work with a difficult team member.",
-        "Describe a situation where you had to meet a tight deadline.",
-        "Give an example of a project where you demonstrated leadership.",
-        "Tell me about a time you failed and what you learned from it.",
-        "Describe how you handle conflicting priorities."
-    ]
-    
-    exp_entries = extract_experience_entries(resume_text)
-    sample_experience = exp_entries[0][:100] if exp_entries else "In my recent role"
-    
-    for template in behavioral_templates[:5]:
-        questions['behavioral'].append({
-            'question': template,
-            'star_template': {
-                'situation': f"{sample_experience}...",
-                'task': "I needed to [describe the challenge or goal]...",
-                'action': "I took the following steps: [list specific actions]...",
-                'result': "This led to [positive outcome with metrics]"
-            },
-            'tips': [
-                "Use the STAR method to structure your answer",
-                "Be specific with examples from your experience",
-                "Focus on your individual contribution"
-            ]
-        })
+        jd_entries.extend((category, skill) for skill in jd_skills[category][:3])  # Top 3 per category
+    
+    for category, skill in jd_entries[:5]:
+        skill_id = taxonomy.skill_id(category, skill)
+        if skill_id is None:
+            continue
+        question = _copy_question(bank.technical_for(skill_id)[0])
+        proof = skill_proof(evidence, skill)
+        if proof:
+            question['star_template']['situation'] = f"{proof}..."
+            question['tips'].insert(0, f'Build on this line from your resume: "{proof}"')
+        questions['technical'].append(question)
+    
+    # Each behavioral answer starts from a different piece of evidence, strongest first
+    evidence_texts = sorted(
+        {item['text']: item['similarity'] for skills in (evidence or {}).values()
+         for items in skills.values() for item in items}.items(),
+        key=lambda item: -item[1]
+    )
+    if evidence_texts:
+        situations = [text for text, _ in evidence_texts]
+    else:
+        exp_entries = extract_experience_entries(resume_text)
+        situations = [exp_entries[0][:100]] if exp_entries else []
+    
+    for idx, template in enumerate(bank.behavioral[:5]):
+        question = _copy_question(template)
+        if situations:
+            question['star_template']['situation'] = f"{situations[idx % len(situations)]}..."
+        questions['behavioral'].append(question)
     
     # Gap-based questions (about missing skills)
     for category in detailed_result:
-        missing = detailed_result[category]['missing']
-        if missing:
-            for skill in missing[:2]:  # Top 2 missing per category
-                questions['gap_based'].append({
-                    'question': f"I notice you don't mention {skill} on your resume. Do you have any experience with it?",
-                    'star_template': {
-                        'situation': f"While I haven't used {skill} extensively in a professional setting...",
-                        'task': "I've been learning it through [courses/projects/self-study]...",
-                        'action': f"I recently completed [specific example using {skill}]...",
-                        'result': "I'm confident I can quickly apply this knowledge to your projects"
-                    },
-                    'tips': [
-                        "Be honest about your experience level",
-                        "Mention any related skills or learning efforts",
-                        "Show enthusiasm for learning new technologies",
-                        "Provide concrete examples of quick learning in the past"
-                    ]
-                })
+        for skill in detailed_result[category]['missing'][:2]:  # Top 2 missing per category
+            skill_id = taxonomy.skill_id(category, skill)
+            if skill_id is None:
+                continue
+            question = _copy_question(bank.gap_for(skill_id))
+            related = skill_proof(evidence, skill)
+            if related:
+                question['tips'].append(f'Closest related experience on your resume: "{related}"')
+            questions['gap_based'].append(question)
     
-    return questions
\ No newline at end of file
+    return questions
+
+def _copy_question(question):
+    """Copy of a question bank entry that can be personalized without changing the bank."""
+    return {
+        'question': question['question'],
+        'star_template': dict(question['star_template']),
+        'tips': list(question['tips'])
+    }
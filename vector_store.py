@@ -0,0 +1,318 @@
+import json
+import os
+import threading
+import uuid
+
+import numpy as np
+
+from file_lock import file_lock
+
+#=================================================================================
+# Resume chunk vector store
+#
+# Resumes are split into short passages whose unit-normalized embeddings are
+# stored as float16 in append-only segments: each segment is a vectors .npy
+# (memory-mapped for search), an owners .npy (chunk -> candidate within the
+# segment) and a JSON file with candidate keys and passage text, read only when
+# results are shown. Each segment also keeps the sign bits of its vectors,
+# word-major, as a codes .npy: search ranks every chunk by Hamming distance to
+# the query's sign bits, rescores only the closest with the float16 vectors,
+# and keeps the best chunks per candidate.
+#
+# A manifest lists the live segments. Segments fall into size tiers (powers of
+# MERGE_FACTOR chunks), and MERGE_FACTOR segments of one tier are merged into
+# one of the next, so each chunk is rewritten once per tier rather than on
+# every merge. The app and batch runs share the store: writers hold the store
+# lock, re-read the manifest and add uniquely named segments, and readers pick
+# up a replaced manifest before searching.
+#=================================================================================
+STORE_FORMAT_VERSION = 1
+VECTOR_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "vector_store")
+CHUNK_WORDS = 60
+MERGE_FACTOR = 8
+MAX_MERGE_CHUNKS = 50000  # segments this large are not merged further
+CODE_BLOCK_ROWS = 65536
+CHUNKS_PER_CANDIDATE = 3
+RESCORE_FACTOR = 16  # chunks rescored exactly per chunk kept
+
+
+def chunk_document(document, max_words=CHUNK_WORDS):
+    """Split a ResumeDocument into (start, end, text) passages of whole lines, up to max_words each."""
+    chunks = []
+    start = end = None
+    words = 0
+    offset = 0
+    for line in document.lines:
+        line_words = len(line.split())
+        if line_words:
+            if start is not None and words + line_words > max_words:
+                chunks.append((start, end, document.text[start:end]))
+                start = None
+            if start is None:
+                start, words = offset, 0
+            end = offset + len(line)
+            words += line_words
+        offset += len(line) + 1
+    if start is not None:
+        chunks.append((start, end, document.text[start:end]))
+    return chunks
+
+
+def sign_codes(vectors):
+    """Sign bits of each vector packed into uint64 words, as a (words, rows) array."""
+    rows, dim = vectors.shape
+    words = -(-dim // 64)
+    codes = np.zeros((rows, words * 8), dtype=np.uint8)
+    for start in range(0, rows, CODE_BLOCK_ROWS):
+        block = np.packbits(np.asarray(vectors[start:start + CODE_BLOCK_ROWS]) > 0, axis=1)
+        codes[start:start + len(block), :block.shape[1]] = block
+    return np.ascontiguousarray(codes.view('<u8').T)
+
+
+def size_tier(chunks):
+    """Merge tier of a segment: floor(log base MERGE_FACTOR of its chunk count)."""
+    tier = 0
+    while chunks >= MERGE_FACTOR:
+        chunks //= MERGE_FACTOR
+        tier += 1
+    return tier
+
+
+def hamming_distances(codes, query_code):
+    """Hamming distance from a query's sign bits to every row of a codes array."""
+    distances = np.bitwise_count(codes[0] ^ query_code[0]).astype(np.uint16)
+    for word in range(1, len(codes)):
+        distances += np.bitwise_count(codes[word] ^ query_code[word])
+    return distances
+
+
+class VectorStore:
+    """Append-only, segment-based store of float16 chunk embeddings."""
+
+    def __init__(self, directory=VECTOR_STORE_DIR):
+        self.directory = directory
+        self.segments = []  # names of live segments
+        self.keys = set()  # candidates already stored
+        self.dim = None
+        self._manifest_stamp = None  # identity of the manifest file last read
+        self._vectors = {}  # segment -> memory-mapped float16 vectors
+        self._owners = {}
+        self._codes = {}  # segment -> memory-mapped sign codes
+        self._metadata = {}  # segment -> candidate keys and passages, loaded on demand
+        self._lock = threading.Lock()
+        self._load_manifest()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _current_stamp(self):
+        try:
+            stat = os.stat(self._path('manifest.json'))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load_manifest(self):
+        """Re-read the manifest if it was replaced since it was last read, by any process."""
+        stamp = self._current_stamp()
+        if stamp is None or stamp == self._manifest_stamp:
+            return
+        try:
+            with open(self._path('manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        self._manifest_stamp = stamp
+        if manifest.get('format_version') != STORE_FORMAT_VERSION:
+            return
+        self.segments = manifest['segments']
+        self.keys = set(manifest['keys'])
+        self.dim = manifest['dim']
+        live = set(self.segments)
+        for cache in (self._vectors, self._owners, self._codes, self._metadata):
+            for segment in [segment for segment in cache if segment not in live]:
+                del cache[segment]
+
+    def _write_manifest(self):
+        manifest = {
+            'format_version': STORE_FORMAT_VERSION,
+            'segments': self.segments,
+            'keys': sorted(self.keys),
+            'dim': self.dim
+        }
+        tmp_path = self._path(f"manifest.json.tmp{os.getpid()}")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, self._path('manifest.json'))
+        self._manifest_stamp = self._current_stamp()
+
+    def _segment_arrays(self, segment):
+        if segment not in self._vectors:
+            self._vectors[segment] = np.load(self._path(f"{segment}.vectors.npy"), mmap_mode='r')
+            self._owners[segment] = np.load(self._path(f"{segment}.owners.npy"), mmap_mode='r')
+        return self._vectors[segment], self._owners[segment]
+
+    def _segment_codes(self, segment):
+        if segment not in self._codes:
+            path = self._path(f"{segment}.codes.npy")
+            if not os.path.exists(path):
+                # Segments written before sign codes existed get them on first search
+                self._save_array(path, sign_codes(self._segment_arrays(segment)[0]))
+            self._codes[segment] = np.load(path, mmap_mode='r')
+        return self._codes[segment]
+
+    def _save_array(self, path, array):
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+
+    def _segment_metadata(self, segment):
+        if segment not in self._metadata:
+            with open(self._path(f"{segment}.json"), encoding='utf-8') as f:
+                self._metadata[segment] = json.load(f)
+        return self._metadata[segment]
+
+    def _write_segment(self, vectors, owners, metadata):
+        # Unique across processes, so concurrent writers never overwrite each other's files
+        segment = f"segment_{uuid.uuid4().hex}"
+        for suffix, array in (('vectors', vectors), ('owners', owners), ('codes', sign_codes(vectors))):
+            with open(self._path(f"{segment}.{suffix}.npy"), 'wb') as f:
+                np.save(f, array)
+        with open(self._path(f"{segment}.json"), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, ensure_ascii=False, separators=(',', ':'))
+        return segment
+
+    def add(self, key, chunks, vectors):
+        """Store one candidate's (start, end, text) chunks with their embeddings as a new segment.
+
+        Candidates already in the store, added by any process, are skipped.
+        """
+        if not chunks:
+            return
+        vectors = np.asarray(vectors, dtype=np.float16)
+        with self._lock, file_lock(self._path('store.lock')):
+            self._load_manifest()
+            if key in self.keys:
+                return
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-dimensional vectors, got {vectors.shape[1]}")
+            metadata = {
+                'candidates': [key],
+                'chunks': [[start, end, text] for start, end, text in chunks]
+            }
+            segment = self._write_segment(vectors, np.zeros(len(chunks), dtype=np.int32), metadata)
+            self.segments.append(segment)
+            self.keys.add(key)
+            self._write_manifest()
+            self._merge_segments()
+
+    def _merge_segments(self):
+        """Merge full size tiers, cascading upward."""
+        while True:
+            tiers = {}
+            for segment in self.segments:
+                chunks = len(self._segment_arrays(segment)[0])
+                if chunks < MAX_MERGE_CHUNKS:
+                    tiers.setdefault(size_tier(chunks), []).append(segment)
+            full = [segments for _, segments in sorted(tiers.items()) if len(segments) >= MERGE_FACTOR]
+            if not full:
+                return
+            self._merge(full[0][:MERGE_FACTOR])
+
+    def _merge(self, segments):
+        vectors, owners = [], []
+        metadata = {'candidates': [], 'chunks': []}
+        for segment in segments:
+            segment_vectors, segment_owners = self._segment_arrays(segment)
+            segment_metadata = self._segment_metadata(segment)
+            vectors.append(np.asarray(segment_vectors))
+            owners.append(np.asarray(segment_owners) + len(metadata['candidates']))
+            metadata['candidates'].extend(segment_metadata['candidates'])
+            metadata['chunks'].extend(segment_metadata['chunks'])
+        merged = self._write_segment(np.concatenate(vectors), np.concatenate(owners).astype(np.int32), metadata)
+
+        self.segments = [segment for segment in self.segments if segment not in segments] + [merged]
+        self._write_manifest()
+        for segment in segments:
+            self._vectors.pop(segment, None)
+            self._owners.pop(segment, None)
+            self._codes.pop(segment, None)
+            self._metadata.pop(segment, None)
+            for suffix in ('vectors.npy', 'owners.npy', 'codes.npy', 'json'):
+                try:
+                    os.remove(self._path(f"{segment}.{suffix}"))
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return sum(len(self._segment_arrays(segment)[0]) for segment in self.segments)
+
+    def search(self, query_vector, k=10):
+        """Top-k candidates for a unit-normalized query vector.
+
+        Returns [{'key', 'score', 'chunks': [{'start', 'end', 'text', 'score'}]}],
+        best candidate first; a candidate's score is its best chunk's score.
+        """
+        query = np.asarray(query_vector, dtype=np.float32).ravel()
+        # Enough chunks to fill k candidates even when the best chunks cluster
+        keep = k * CHUNKS_PER_CANDIDATE * 4
+        with self._lock:
+            self._load_manifest()
+            try:
+                return self._search(query, k, keep)
+            except FileNotFoundError:
+                # Another process merged segments away after the manifest was read
+                self._load_manifest()
+                return self._search(query, k, keep)
+
+    def _search(self, query, k, keep):
+        hits = []  # (score, segment, row)
+        query_code = sign_codes(query[None, :])[:, 0]
+        rescored = keep * RESCORE_FACTOR
+        for segment in self.segments:
+            vectors, _ = self._segment_arrays(segment)
+            if len(vectors) > rescored:
+                distances = hamming_distances(self._segment_codes(segment), query_code)
+                rows = np.sort(np.argpartition(distances, rescored)[:rescored])
+                scores = vectors[rows].astype(np.float32) @ query
+            else:
+                rows = np.arange(len(vectors))
+                scores = np.asarray(vectors, dtype=np.float32) @ query
+            if len(scores) > keep:
+                top = np.argpartition(scores, -keep)[-keep:]
+            else:
+                top = np.arange(len(scores))
+            hits.extend((float(scores[index]), segment, int(rows[index])) for index in top)
+            if len(hits) > keep:
+                hits = sorted(hits, reverse=True)[:keep]
+
+        results = {}
+        for score, segment, row in sorted(hits, reverse=True):
+            _, owners = self._segment_arrays(segment)
+            metadata = self._segment_metadata(segment)
+            key = metadata['candidates'][owners[row]]
+            if key not in results:
+                if len(results) >= k:
+                    continue
+                results[key] = {'key': key, 'score': round(score, 3), 'chunks': []}
+            if len(results[key]['chunks']) < CHUNKS_PER_CANDIDATE:
+                start, end, text = metadata['chunks'][row]
+                results[key]['chunks'].append({'start': start, 'end': end, 'text': text, 'score': round(score, 3)})
+        return list(results.values())
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def vector_store():
+    """Process-wide resume chunk vector store."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = VectorStore()
+    return _store